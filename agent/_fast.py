@@ -0,0 +1,58 @@
+"""Small numeric kernels for confidence scoring.
+
+Uses numba when it is installed; otherwise falls back to plain NumPy.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:  # optional dependency
+    numba = None
+    _NUMBA_AVAILABLE = False
+
+
+def _avg_and_count_py(scores: np.ndarray) -> Tuple[float, int]:
+    """Pure NumPy fallback for _avg_and_count."""
+    return float(scores.mean()), int(scores.size)
+
+
+if _NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def _avg_and_count(scores: np.ndarray) -> Tuple[float, int]:
+        total = 0.0
+        for i in range(scores.size):
+            total += scores[i]
+        return total / scores.size, scores.size
+
+    # Warm up the JIT once at import so the first query does not pay for compilation
+    _avg_and_count(np.ones(1, dtype=np.float32))
+else:
+    _avg_and_count = _avg_and_count_py
+
+
+def similarity_scores(evidence: List[Dict[str, Any]], default: float = 0.5) -> np.ndarray:
+    """Extract similarity scores from evidence chunks as a float32 array."""
+    return np.fromiter(
+        (chunk.get('similarity_score', default) for chunk in evidence),
+        dtype=np.float32,
+        count=len(evidence),
+    )
+
+
+def avg_similarity(evidence: List[Dict[str, Any]], default: float = 0.5) -> Tuple[float, int]:
+    """
+    Average similarity score over non-empty evidence.
+
+    Args:
+        evidence: List of evidence chunks
+        default: Score used when a chunk has no similarity_score
+
+    Returns:
+        (average similarity, chunk count)
+    """
+    avg, count = _avg_and_count(similarity_scores(evidence, default))
+    return float(avg), int(count)
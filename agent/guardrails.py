@@ -1,10 +1,32 @@
 """Guardrails for confidence and uncertainty handling."""
 
 import logging
+from bisect import bisect_right
+from types import MappingProxyType
 from typing import Dict, Any, List
 
+from ._fast import avg_similarity as _avg_similarity
+
 logger = logging.getLogger(__name__)
 
+# Fields each query type is expected to draw evidence from
+_EXPECTED_FIELDS: Dict[str, frozenset] = {
+    'actor_profile': frozenset(('name', 'description', 'origins')),
+    'ttp_analysis': frozenset(('ttps', 'description')),
+    'target_analysis': frozenset(('targets', 'description')),
+    'timeline_analysis': frozenset(('first_seen', 'last_seen', 'last_updated')),
+}
+_EMPTY_FS = frozenset()
+
+# Recommendation text per confidence level
+_RECS = MappingProxyType({
+    'high': 'Safe for operational use',
+    'medium': 'Suitable for analysis with caveats',
+    'low': 'Requires additional verification',
+    'very_low': 'Insufficient for actionable intelligence',
+    'none': 'No analysis possible',
+})
+
 
 class ConfidenceGuardrail:
     """Ensure confidence claims are grounded in evidence."""
@@ -13,6 +35,10 @@ class ConfidenceGuardrail:
     HIGH_CONFIDENCE_THRESHOLD = 0.8
     MEDIUM_CONFIDENCE_THRESHOLD = 0.6
     LOW_CONFIDENCE_THRESHOLD = 0.3
+
+    # Sorted thresholds and the level each bucket maps to (bisect index -> label)
+    _THRESHOLDS = (LOW_CONFIDENCE_THRESHOLD, MEDIUM_CONFIDENCE_THRESHOLD, HIGH_CONFIDENCE_THRESHOLD)
+    _LEVELS = ('very_low', 'low', 'medium', 'high')
     
     @staticmethod
     def assess_confidence(evidence: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -34,25 +60,13 @@ class ConfidenceGuardrail:
             }
         
         # Calculate average similarity
-        avg_similarity = sum(
-            chunk.get('similarity_score', 0.5) for chunk in evidence
-        ) / len(evidence)
-        
-        # Consider number of sources
-        source_count = len(evidence)
-        source_bonus = min(source_count / 5.0, 0.2)  # Max +0.2 for multiple sources
+        avg_similarity, source_count = _avg_similarity(evidence)
         
-        final_score = min(avg_similarity + source_bonus, 1.0)
+        # Consider number of sources (max +0.2 for multiple sources)
+        final_score = min(1.0, avg_similarity + min(source_count / 5.0, 0.2))
         
         # Determine confidence level
-        if final_score >= ConfidenceGuardrail.HIGH_CONFIDENCE_THRESHOLD:
-            level = 'high'
-        elif final_score >= ConfidenceGuardrail.MEDIUM_CONFIDENCE_THRESHOLD:
-            level = 'medium'
-        elif final_score >= ConfidenceGuardrail.LOW_CONFIDENCE_THRESHOLD:
-            level = 'low'
-        else:
-            level = 'very_low'
+        level = ConfidenceGuardrail._LEVELS[bisect_right(ConfidenceGuardrail._THRESHOLDS, final_score)]
         
         return {
             'level': level,
@@ -66,14 +80,7 @@ class ConfidenceGuardrail:
     @staticmethod
     def _get_recommendation(level: str) -> str:
         """Get recommendation based on confidence level."""
-        recommendations = {
-            'high': 'Safe for operational use',
-            'medium': 'Suitable for analysis with caveats',
-            'low': 'Requires additional verification',
-            'very_low': 'Insufficient for actionable intelligence',
-            'none': 'No analysis possible',
-        }
-        return recommendations.get(level, 'Unknown')
+        return _RECS.get(level, 'Unknown')
 
 
 class UncertaintyHandler:
@@ -91,27 +98,10 @@ class UncertaintyHandler:
         Returns:
             List of potential information gaps
         """
-        gaps = []
-        
-        source_fields = set(
-            chunk['metadata'].get('source_field', '') for chunk in evidence
-        )
-        
-        # Check for expected fields based on query type
-        expected_fields = {
-            'actor_profile': ['name', 'description', 'origins'],
-            'ttp_analysis': ['ttps', 'description'],
-            'target_analysis': ['targets', 'description'],
-            'timeline_analysis': ['first_seen', 'last_seen', 'last_updated'],
-        }
-        
-        expected = set(expected_fields.get(query_type, []))
-        missing = expected - source_fields
-        
-        for field in missing:
-            gaps.append(f"Missing information about {field}")
+        present = {chunk['metadata'].get('source_field', '') for chunk in evidence}
+        missing = _EXPECTED_FIELDS.get(query_type, _EMPTY_FS) - present
         
-        return gaps
+        return [f"Missing information about {field}" for field in missing]
     
     @staticmethod
     def add_caveats(explanation: Dict[str, Any], gaps: List[str]) -> Dict[str, Any]:
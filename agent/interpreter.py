@@ -1,15 +1,66 @@
 """LLM-based question answering with evidence grounding."""
 
+import asyncio
+import copy
+import hashlib
+import json
 import logging
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
 from .query_classifier import QueryClassifier, QueryIntent
 from .answer_extractor import AnswerExtractor
+from ._fast import avg_similarity as _avg_similarity
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_PROMPT_PATH = 'agent/system_prompt.txt'
+
+# Prompt layouts; filled with str.format_map per call
+_PROMPT_TMPL = """{system_prompt}
+
+{instruction}
+
+EVIDENCE PROVIDED:
+{evidence}
+
+USER QUERY: {query}
+
+RESPONSE:
+"""
+
+_TARGETED_PROMPT_TMPL = """{system_prompt}
+
+INSTRUCTION: {instruction}
+
+EVIDENCE PROVIDED:
+{evidence}
+
+USER QUERY: {query}
+
+RESPONSE (provide detailed, well-formatted answer):
+"""
+
+
+@lru_cache(maxsize=1)
+def _load_system_prompt() -> str:
+    """Read the analyst system prompt once per process."""
+    try:
+        with open(_SYSTEM_PROMPT_PATH, 'r') as f:
+            return f.read()
+    except OSError:
+        return "You are a threat intelligence analyst."
+
 
 class OllamaClient:
     """Client for Ollama local LLM."""
@@ -31,24 +82,46 @@ class OllamaClient:
         self.base_url = base_url
         self.api_endpoint = f"{base_url}/api/generate"
         self.default_timeout = max(30, int(default_timeout or 60))
+
+        # Keep-alive session so /api/generate reuses pooled connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+        # Constant payload fields; per-call fields are merged in generate()
+        self._base_payload = {"model": self.model, "stream": False}
+        self._json_headers = {"Content-Type": "application/json"}
+
         self._verify_connection()
+
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
     
     def _verify_connection(self):
-        """Verify connection to Ollama server."""
+        """Probe the Ollama server without blocking startup.
+
+        Failures are logged only; the first generate() call surfaces real
+        connectivity errors.
+        """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=1)
             if response.status_code == 200:
-                logger.info(f"✓ Connected to Ollama server at {self.base_url}")
+                logger.info("✓ Connected to Ollama server at %s", self.base_url)
                 models = response.json().get("models", [])
                 available_models = [m["name"] for m in models]
-                logger.info(f"  Available models: {available_models}")
+                logger.info("  Available models: %s", available_models)
             else:
-                logger.warning(f"Ollama server returned status {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            logger.error(f"✗ Cannot connect to Ollama at {self.base_url}")
-            logger.error("  Install Ollama: https://ollama.ai")
-            logger.error("  Start Ollama: ollama serve")
-            raise
+                logger.warning("Ollama server returned status %s", response.status_code)
+        except requests.exceptions.RequestException as e:
+            logger.warning("✗ Ollama not reachable at %s yet: %s", self.base_url, e)
+            logger.warning("  Install Ollama: https://ollama.ai")
+            logger.warning("  Start Ollama: ollama serve")
     
     def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 512, timeout: int = None) -> str:
         """
@@ -64,32 +137,33 @@ class OllamaClient:
             Generated text
         """
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                "stream": False
-            }
+            # Copy the template rather than mutating it: generate() runs on several server threads
+            payload = dict(self._base_payload, prompt=prompt, temperature=temperature, num_predict=max_tokens)
             
             # Adjust timeout: ensure enough headroom for CPU inference.
             effective_timeout = self.default_timeout if timeout is None else timeout
             adjusted_timeout = max(int(effective_timeout), max_tokens // 3)
             
-            response = requests.post(self.api_endpoint, json=payload, timeout=adjusted_timeout)
+            body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+            response = self.session.post(
+                self.api_endpoint,
+                data=body,
+                headers=self._json_headers,
+                timeout=adjusted_timeout,
+            )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content) if orjson is not None else response.json()
                 return result.get("response", "")
             else:
-                logger.error(f"Ollama error: {response.status_code}")
+                logger.error("Ollama error: %s", response.status_code)
                 return ""
                 
         except requests.exceptions.Timeout:
-            logger.error(f"Ollama request timed out after {adjusted_timeout} seconds")
+            logger.error("Ollama request timed out after %s seconds", adjusted_timeout)
             return ""
         except Exception as e:
-            logger.error(f"Error calling Ollama: {e}")
+            logger.error("Error calling Ollama: %s", e)
             return ""
 
     def generate_stream(self, prompt: str, temperature: float = 0.3, max_tokens: int = 512, timeout: int = 120):
@@ -117,12 +191,11 @@ class OllamaClient:
             # Adjust timeout based on max_tokens
             adjusted_timeout = max(timeout, max_tokens // 10)
             
-            response = requests.post(self.api_endpoint, json=payload, timeout=adjusted_timeout, stream=True)
+            response = self.session.post(self.api_endpoint, json=payload, timeout=adjusted_timeout, stream=True)
             
             if response.status_code == 200:
                 for line in response.iter_lines():
                     if line:
-                        import json
                         try:
                             data = json.loads(line)
                             token = data.get("response", "")
@@ -131,12 +204,12 @@ class OllamaClient:
                         except json.JSONDecodeError:
                             continue
             else:
-                logger.error(f"Ollama streaming error: {response.status_code}")
+                logger.error("Ollama streaming error: %s", response.status_code)
                 
         except requests.exceptions.Timeout:
-            logger.error(f"Ollama streaming timed out after {adjusted_timeout} seconds")
+            logger.error("Ollama streaming timed out after %s seconds", adjusted_timeout)
         except Exception as e:
-            logger.error(f"Error in Ollama streaming: {e}")
+            logger.error("Error in Ollama streaming: %s", e)
 
 
 class EvidenceBasedInterpreter:
@@ -169,7 +242,7 @@ class EvidenceBasedInterpreter:
             )
             self.use_ollama = True
         except Exception as e:
-            logger.warning(f"Ollama not available, using fallback: {e}")
+            logger.warning("Ollama not available, using fallback: %s", e)
             self.llm = None
             self.use_ollama = False
         
@@ -177,11 +250,40 @@ class EvidenceBasedInterpreter:
         self.query_classifier = QueryClassifier()
         self.answer_extractor = AnswerExtractor()
         logger.info("Initialized query classifier and answer extractor")
+
+        # LRU of explain() results keyed by (model, query, evidence fingerprint)
+        self._cache: "OrderedDict[Tuple[str, str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._cache_max_size = 256
+        self._cache_lock = threading.Lock()
+        # Per-thread flag set when an Ollama call in the current explain() failed;
+        # such degraded answers are returned but not cached
+        self._llm_state = threading.local()
+
+    def clear_cache(self):
+        """Drop all memoized explain() results (e.g. after user feedback)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _explain_cache_key(self, query: str, evidence: List[Dict[str, Any]], response_mode: str) -> Tuple[str, str, str, str]:
+        """Build the memoization key for an explain() call."""
+        # chunk_id and score feed citations and confidence, so they are part of the key
+        evidence_fp = hashlib.blake2b(
+            b"|".join(
+                f"{chunk.get('chunk_id', '')}\x1f{chunk.get('similarity_score', '')}\x1f{chunk.get('text', '')}".encode()
+                for chunk in evidence
+            ),
+            digest_size=8,
+        ).hexdigest()
+        model = self.llm.model if self.use_ollama else 'fallback'
+        return (model, query.strip().lower(), response_mode, evidence_fp)
     
     def explain(self, query: str, evidence: List[Dict[str, Any]], response_mode: str = 'adaptive', retrieval_mode: str = 'hybrid') -> Dict[str, Any]:
         """
         Generate explanation based on evidence using Ollama with adaptive response mode.
         
+        Identical (model, query, evidence) calls are served from an in-memory LRU;
+        answers produced after a failed Ollama call are not cached.
+        
         Args:
             query: User query
             evidence: Retrieved evidence chunks
@@ -191,7 +293,34 @@ class EvidenceBasedInterpreter:
         Returns:
             Explanation response with metadata
         """
-        
+        if not evidence:
+            return self._explain_uncached(query, evidence, response_mode, retrieval_mode)
+
+        key = self._explain_cache_key(query, evidence, response_mode)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            logger.info("Interpreter cache hit")
+            result = copy.deepcopy(cached)
+            result['query'] = query  # the key is case-folded; echo this caller's wording
+            return result
+
+        self._llm_state.failed = False
+        result = self._explain_uncached(query, evidence, response_mode, retrieval_mode)
+        if self._llm_state.failed:
+            logger.info("Not caching explain() result after LLM failure")
+            return result
+        with self._cache_lock:
+            self._cache[key] = copy.deepcopy(result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_max_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _explain_uncached(self, query: str, evidence: List[Dict[str, Any]], response_mode: str, retrieval_mode: str) -> Dict[str, Any]:
+        """Run the full explain() pipeline without consulting the cache."""
         if not evidence:
             return {
                 'query': query,
@@ -207,7 +336,7 @@ class EvidenceBasedInterpreter:
         classification = self.query_classifier.classify(query)
         intent = classification['primary_intent']
         
-        logger.info(f"Query intent: {intent.value}, confidence: {classification['confidence']:.2f}")
+        logger.info("Query intent: %s, confidence: %.2f", intent.value, classification['confidence'])
         
         evidence_for_answer = self._filter_evidence_by_intent(evidence, intent, response_mode, query)
         if not evidence_for_answer:
@@ -230,6 +359,7 @@ class EvidenceBasedInterpreter:
                     strict_mode_used = True
                     if not answer or len(answer.strip()) < 50:
                         logger.warning("LLM report failed or returned short response, using fallback summary")
+                        self._llm_state.failed = True
                         answer = self._generate_summary(query, evidence_for_answer)
                 else:
                     logger.info("Report mode requested, using evidence-only summary")
@@ -246,6 +376,7 @@ class EvidenceBasedInterpreter:
                 # If LLM failed or timed out, use improved fallback
                 if not answer or len(answer.strip()) < 50:
                     logger.warning("LLM generation failed or returned short response, using enhanced fallback")
+                    self._llm_state.failed = True
                     answer = self._generate_summary(query, evidence_for_answer)
             else:
                 logger.warning("Using fallback summary for sparse evidence")
@@ -255,14 +386,14 @@ class EvidenceBasedInterpreter:
         elif extraction_result['summary'] and extraction_result['summary'] != "":
             # For ASSOCIATIONS and ALIASES, use extracted summary directly to prevent hallucination
             if intent in [QueryIntent.ASSOCIATIONS, QueryIntent.ALIASES]:
-                logger.info(f"Using evidence-only extraction for {intent.value} to prevent hallucination")
+                logger.info("Using evidence-only extraction for %s to prevent hallucination", intent.value)
                 answer = extraction_result['summary']
             elif self.use_ollama and response_mode != 'report' and intent in [
                 QueryIntent.TACTICS, QueryIntent.TARGETS,
                 QueryIntent.TOOLS, QueryIntent.CAMPAIGNS, QueryIntent.MOTIVATION,
                 QueryIntent.ORIGIN, QueryIntent.TIMELINE, QueryIntent.COUNTER_OPERATIONS
             ]:
-                logger.info(f"Generating targeted LLM answer for {intent.value}")
+                logger.info("Generating targeted LLM answer for %s", intent.value)
                 answer = self._generate_targeted_answer(query, evidence_text, intent, extraction_result)
                 if not answer:
                     answer = extraction_result['summary']
@@ -321,7 +452,7 @@ class EvidenceBasedInterpreter:
             'query': query,
             'answer': answer,
             'evidence': evidence_for_answer,
-            'evidence_formatted': self._format_evidence_for_llm(evidence_for_answer),
+            'evidence_formatted': evidence_text,
             'confidence': extraction_result['confidence'],
             'confidence_tier': confidence_tier,
             'confidence_rationale': confidence_note,
@@ -334,6 +465,76 @@ class EvidenceBasedInterpreter:
             'extracted_info': extraction_result['extracted_info']
         }
     
+    async def aexplain(self, query: str, evidence: List[Dict[str, Any]], response_mode: str = 'adaptive', retrieval_mode: str = 'hybrid') -> Dict[str, Any]:
+        """
+        Async variant of explain().
+
+        The answer pipeline is CPU-light and blocks only on the Ollama call,
+        so it runs in a worker thread; several awaiting callers can then
+        overlap their Ollama requests (served in parallel when
+        OLLAMA_NUM_PARALLEL > 1).
+
+        Args:
+            query: User query
+            evidence: Retrieved evidence chunks
+            response_mode: 'concise', 'report', 'comparison', or 'adaptive'
+            retrieval_mode: Retrieval mode label
+
+        Returns:
+            Explanation response with metadata
+        """
+        return await asyncio.to_thread(self.explain, query, evidence, response_mode, retrieval_mode)
+
+    def explain_stream(self, query: str, evidence: List[Dict[str, Any]], response_mode: str = 'adaptive'):
+        """
+        Stream an evidence-grounded answer as it is generated.
+
+        Yields the evidence header once, then answer tokens straight from
+        Ollama. Without Ollama the evidence-only summary is yielded as a
+        single token.
+        
+        Args:
+            query: User query
+            evidence: Retrieved evidence chunks
+            response_mode: 'concise', 'report', or 'adaptive'
+            
+        Yields:
+            Event dicts: {'type': 'evidence', ...}, then {'type': 'token', 'token': str}
+        """
+        evidence_text = self._format_evidence_for_llm(evidence) if evidence else ''
+        yield {
+            'type': 'evidence',
+            'query': query,
+            'evidence_formatted': evidence_text,
+            'source_count': len(evidence),
+            'model': self.llm.model if self.use_ollama else 'fallback',
+            'response_mode': response_mode,
+        }
+
+        if not evidence:
+            yield {'type': 'token', 'token': 'No threat intelligence found for this query. Please try a different search.'}
+            return
+
+        if not self.use_ollama:
+            yield {'type': 'token', 'token': self._generate_summary(query, evidence)}
+            return
+
+        prompt = self._build_ollama_prompt(query, evidence_text, response_mode, strict_evidence=True)
+        max_tokens = self._get_max_tokens_for_mode(response_mode)
+        streamed_any = False
+        for token in self.llm.generate_stream(
+            prompt,
+            temperature=self._get_temperature_for_mode(response_mode),
+            max_tokens=min(max_tokens, self.default_max_tokens),
+            timeout=self.default_timeout,
+        ):
+            streamed_any = True
+            yield {'type': 'token', 'token': token}
+
+        if not streamed_any:
+            logger.warning("LLM stream returned no tokens, using fallback summary")
+            yield {'type': 'token', 'token': self._generate_summary(query, evidence)}
+
     def comparison_answer(self, query: str, actors_chunks_dict: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
         """
         Generate comparison answer for multiple actors.
@@ -355,7 +556,7 @@ class EvidenceBasedInterpreter:
                 'comparison_actors': [],
             }
         
-        logger.info(f"Generating comparison answer for {len(actors_chunks_dict)} actors")
+        logger.info("Generating comparison answer for %s actors", len(actors_chunks_dict))
         
         # Flatten evidence from all actors
         all_evidence = []
@@ -499,24 +700,55 @@ Keep the answer factual and grounded in the provided intelligence."""
         
         return "\n".join(lines)
     
-    def _format_evidence_for_llm(self, evidence: List[Dict[str, Any]]) -> str:
-        """Format evidence chunks for LLM input."""
-        formatted = []
-        max_chunks = 3
-        max_chars = 500
-        for i, chunk in enumerate(evidence[:max_chunks], 1):
-            source = chunk['metadata'].get('source_field', 'unknown')
-            source_system = chunk['metadata'].get('source_system', '')
-            score = chunk.get('similarity_score', 0.0)
-            text = chunk['text']
-            if source in ['last_updated', 'last_card_change', 'last-card-change']:
-                text = f"Last Known Activity: {text}"
-            if len(text) > max_chars:
-                text = text[:max_chars].rstrip() + "..."
-            source_label = f"{source} | {source_system}" if source_system else source
-            formatted.append(f"[{i}] ({source_label}, score: {score:.2f}): {text}")
-        
-        return "\n".join(formatted)
+    _LAST_ACTIVITY_FIELDS = frozenset(('last_updated', 'last_card_change', 'last-card-change'))
+
+    def _format_evidence_for_llm(
+        self,
+        evidence: List[Dict[str, Any]],
+        max_chars: int = 500,
+        max_total_chars: int = 1800,
+    ) -> str:
+        """Format evidence chunks for LLM input.
+
+        Lines are kept in retrieval order; if they exceed max_total_chars the
+        lowest-scored lines are dropped first (at least one line is always
+        kept) and a note saying how many were omitted is appended.
+        """
+        lines = [
+            self._format_evidence_line(i, chunk, max_chars)
+            for i, chunk in enumerate(evidence, 1)
+        ]
+        lengths = [len(line) + 1 for line in lines]
+        total = sum(lengths)
+        if total <= max_total_chars:
+            return "\n".join(lines)
+
+        keep = [True] * len(lines)
+        by_score = sorted(range(len(lines)), key=lambda i: evidence[i].get('similarity_score', 0.0))
+        dropped = 0
+        for idx in by_score:
+            if total <= max_total_chars or dropped == len(lines) - 1:
+                break
+            keep[idx] = False
+            total -= lengths[idx]
+            dropped += 1
+
+        kept = [line for line, flag in zip(lines, keep) if flag]
+        kept.append(f"[Note: {dropped} lower-scored evidence chunk(s) omitted to fit the prompt budget]")
+        return "\n".join(kept)
+
+    def _format_evidence_line(self, index: int, chunk: Dict[str, Any], max_chars: int) -> str:
+        """Format a single numbered evidence line."""
+        metadata = chunk['metadata']
+        source = metadata.get('source_field', 'unknown')
+        source_system = metadata.get('source_system', '')
+        text = chunk['text']
+        if source in self._LAST_ACTIVITY_FIELDS:
+            text = f"Last Known Activity: {text}"
+        if len(text) > max_chars:
+            text = text[:max_chars].rstrip() + "..."
+        source_label = f"{source} | {source_system}" if source_system else source
+        return f"[{index}] ({source_label}, score: {chunk.get('similarity_score', 0.0):.2f}): {text}"
 
     def _prepend_confidence(self, answer: str, tier: str, note: str) -> str:
         """Add confidence tier and rationale to the top of the answer."""
@@ -1091,41 +1323,27 @@ Keep the answer factual and grounded in the provided intelligence."""
         
         return fields
     
+    # Intent-specific instructions for targeted answers
+    _INTENT_INSTRUCTIONS = {
+        QueryIntent.TACTICS: "Answer specifically about tactics, techniques, and procedures (TTPs). Provide detailed explanation with examples from the evidence. Use bullet points for clarity.",
+        QueryIntent.ASSOCIATIONS: "Answer specifically about associated or related threat actors. Explain the connections and relationships clearly with supporting context.",
+        QueryIntent.TARGETS: "Answer specifically about targets, victims, sectors, and regions. Provide detailed information about who they target and why.",
+        QueryIntent.TOOLS: "Answer specifically about tools, malware, and infrastructure used. Describe the technical capabilities in detail.",
+        QueryIntent.VULNERABILITIES: "Answer specifically about vulnerabilities, CVEs, zero-days, and other exploited flaws. List the named vulnerabilities first, then summarize the attack pattern in evidence-only terms.",
+        QueryIntent.CAMPAIGNS: "Answer specifically about campaigns and operations. Describe the notable incidents with context and impact.",
+        QueryIntent.ORIGIN: "Answer specifically about origin, attribution, and sponsorship. Be direct about where they're from with supporting details.",
+        QueryIntent.TIMELINE: "Answer specifically about timeline and activity periods. State when they were first seen and include the last known activity date if provided (last updated / last card change).",
+    }
+
     def _generate_targeted_answer(self, query: str, evidence_text: str, intent: QueryIntent, extraction_result: Dict) -> str:
         """Generate a targeted answer based on query intent and extracted information."""
-        
-        # Load system prompt
-        try:
-            with open('agent/system_prompt.txt', 'r') as f:
-                system_prompt = f.read()
-        except:
-            system_prompt = "You are a threat intelligence analyst."
-        
-        # Build intent-specific instructions
-        intent_instructions = {
-            QueryIntent.TACTICS: "Answer specifically about tactics, techniques, and procedures (TTPs). Provide detailed explanation with examples from the evidence. Use bullet points for clarity.",
-            QueryIntent.ASSOCIATIONS: "Answer specifically about associated or related threat actors. Explain the connections and relationships clearly with supporting context.",
-            QueryIntent.TARGETS: "Answer specifically about targets, victims, sectors, and regions. Provide detailed information about who they target and why.",
-            QueryIntent.TOOLS: "Answer specifically about tools, malware, and infrastructure used. Describe the technical capabilities in detail.",
-            QueryIntent.VULNERABILITIES: "Answer specifically about vulnerabilities, CVEs, zero-days, and other exploited flaws. List the named vulnerabilities first, then summarize the attack pattern in evidence-only terms.",
-            QueryIntent.CAMPAIGNS: "Answer specifically about campaigns and operations. Describe the notable incidents with context and impact.",
-            QueryIntent.ORIGIN: "Answer specifically about origin, attribution, and sponsorship. Be direct about where they're from with supporting details.",
-            QueryIntent.TIMELINE: "Answer specifically about timeline and activity periods. State when they were first seen and include the last known activity date if provided (last updated / last card change).",
-        }
-        
-        instruction = intent_instructions.get(intent, "Answer the specific question asked with appropriate detail.")
-        
-        prompt = f"""{system_prompt}
-
-INSTRUCTION: {instruction}
-
-EVIDENCE PROVIDED:
-{evidence_text}
-
-USER QUERY: {query}
-
-RESPONSE (provide detailed, well-formatted answer):
-"""
+        instruction = self._INTENT_INSTRUCTIONS.get(intent, "Answer the specific question asked with appropriate detail.")
+        prompt = _TARGETED_PROMPT_TMPL.format_map({
+            'system_prompt': _load_system_prompt(),
+            'instruction': instruction,
+            'evidence': evidence_text,
+            'query': query,
+        })
         
         try:
             response = self.llm.generate(
@@ -1134,27 +1352,23 @@ RESPONSE (provide detailed, well-formatted answer):
                 max_tokens=min(200, self.default_max_tokens),
                 timeout=self.default_timeout,
             )
-            return response.strip() if response else extraction_result['summary']
+            if response:
+                return response.strip()
+            self._llm_state.failed = True
+            return extraction_result['summary']
         except Exception as e:
-            logger.error(f"Targeted answer generation error: {e}")
+            logger.error("Targeted answer generation error: %s", e)
+            self._llm_state.failed = True
             return extraction_result['summary']
     
-    def _generate_with_ollama(
+    def _build_ollama_prompt(
         self,
         query: str,
         evidence_text: str,
         response_mode: str = 'adaptive',
         strict_evidence: bool = False
     ) -> str:
-        """Generate response using Ollama LLM with mode-specific prompt."""
-        
-        # Load system prompt
-        try:
-            with open('agent/system_prompt.txt', 'r') as f:
-                system_prompt = f.read()
-        except:
-            system_prompt = "You are a threat intelligence analyst."
-        
+        """Build the mode-specific Ollama prompt."""
         # Build mode-specific instruction
         mode_instruction = self._get_mode_instruction(response_mode)
         if strict_evidence:
@@ -1164,17 +1378,22 @@ RESPONSE (provide detailed, well-formatted answer):
                 + mode_instruction
             )
         
-        prompt = f"""{system_prompt}
-
-{mode_instruction}
-
-EVIDENCE PROVIDED:
-{evidence_text}
-
-USER QUERY: {query}
+        return _PROMPT_TMPL.format_map({
+            'system_prompt': _load_system_prompt(),
+            'instruction': mode_instruction,
+            'evidence': evidence_text,
+            'query': query,
+        })
 
-RESPONSE:
-"""
+    def _generate_with_ollama(
+        self,
+        query: str,
+        evidence_text: str,
+        response_mode: str = 'adaptive',
+        strict_evidence: bool = False
+    ) -> str:
+        """Generate response using Ollama LLM with mode-specific prompt."""
+        prompt = self._build_ollama_prompt(query, evidence_text, response_mode, strict_evidence)
         
         try:
             # Adjust parameters based on mode
@@ -1189,9 +1408,11 @@ RESPONSE:
             )
             if response and response.strip():
                 return response.strip()
+            self._llm_state.failed = True
             return self._generate_summary(query, [])
         except Exception as e:
-            logger.error(f"Ollama generation error: {e}")
+            logger.error("Ollama generation error: %s", e)
+            self._llm_state.failed = True
             return self._generate_summary(query, [])
     
     def _get_mode_instruction(self, response_mode: str) -> str:
@@ -1618,11 +1839,9 @@ RESPONSE:
         if not evidence:
             return 0.0
         
-        avg_similarity = sum(
-            chunk.get('similarity_score', 0.5) for chunk in evidence
-        ) / len(evidence)
+        avg_similarity, count = _avg_similarity(evidence)
         
-        source_penalty = 1.0 if len(evidence) >= 3 else 0.7
+        source_penalty = 1.0 if count >= 3 else 0.7
         
         confidence = avg_similarity * source_penalty
         return min(confidence, 1.0)
@@ -1,20 +1,31 @@
 #!/usr/bin/env python
 """Threat-AI: Unified application with CLI and Web UI."""
 
+import atexit
 import logging
+import os
+import queue
+import threading
 import yaml
 import sys
 import argparse
 import webbrowser
 import time
-import io
+from concurrent.futures import ThreadPoolExecutor
 import json
 import re
 from pathlib import Path
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 from functools import lru_cache
 import hashlib
+import importlib
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
 
 from training_lab import TrainingLabManager
 from feeds import ThreatFeedManager
@@ -56,9 +67,27 @@ threat_feed_manager = None
 query_orchestrator = None
 feed_scheduler = None
 
+# Background component warmup (set by start_background_initialization)
+_init_executor = None
+_init_future = None
+
 query_cache = {}
 CACHE_TTL_SECONDS = 3600
 
+# Config-derived values bound once in initialize_components()
+RETRIEVAL_TOP_K = 5
+_STATUS_TEMPLATE = {'model': 'N/A', 'host': 'N/A'}
+
+# Input limits for /api/query
+MAX_QUERY_CHARS = 2000
+MAX_QUERY_BODY_BYTES = 16 * 1024
+
+# Deferred history writes: ('history', query, result) items drained by a background thread
+_WRITE_Q = queue.Queue()
+_WRITE_BATCH_SIZE = 32
+_write_thread = None
+_write_thread_lock = threading.Lock()
+
 def _extract_focus_actor(query_text: str, result: dict) -> str:
     """Extract a best-effort primary actor for report CTA wording."""
     if result:
@@ -95,11 +124,27 @@ def build_report_suggestion_text(query_text: str, result: dict) -> str:
     )
 
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # LibYAML C parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed config keyed by (path, mtime) so unchanged files are not re-parsed
+_CONFIG_CACHE = {}
+
+
 def load_config(config_path: str = "config/settings.yaml") -> dict:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file (cached until the file changes)."""
     global config
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    key = (config_path, os.stat(config_path).st_mtime)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is None:
+        with open(config_path, 'r') as f:
+            cached = yaml.load(f, Loader=_YamlLoader)
+        for stale in [k for k in _CONFIG_CACHE if k[0] == config_path]:
+            del _CONFIG_CACHE[stale]
+        _CONFIG_CACHE[key] = cached
+    config = cached
     return config
 
 
@@ -124,20 +169,162 @@ def _start_feed_scheduler():
     feed_scheduler.start()
 
 
+def _close_llm_client():
+    """Release pooled Ollama connections on interpreter shutdown."""
+    llm = getattr(interpreter, 'llm', None)
+    if llm is not None and hasattr(llm, 'close'):
+        try:
+            llm.close()
+        except Exception as e:
+            logger.debug("Error closing Ollama session: %s", e)
+
+
+atexit.register(_close_llm_client)
+
+
+def _flush_audit_trail():
+    """Write out queued audit entries before the interpreter exits."""
+    if audit is not None and hasattr(audit, 'flush'):
+        try:
+            audit.flush()
+        except Exception as e:
+            logger.debug("Error flushing audit trail: %s", e)
+
+
+atexit.register(_flush_audit_trail)
+
+
+@lru_cache(maxsize=None)
+def _query_history():
+    """Process-wide QueryHistory shared by the history routes and the write queue."""
+    from history import QueryHistory
+    return QueryHistory()
+
+
+@lru_cache(maxsize=None)
+def _feedback_store():
+    """Process-wide FeedbackStore shared by the feedback routes."""
+    from feedback.store import FeedbackStore
+    return FeedbackStore()
+
+
+def _drain_up_to(q, max_items, timeout):
+    """
+    Collect up to max_items from a queue.
+
+    Args:
+        q: Queue to read from
+        max_items: Largest batch to return
+        timeout: Seconds to wait for the first item
+
+    Returns:
+        List of items (empty when nothing arrived within timeout)
+    """
+    try:
+        batch = [q.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while len(batch) < max_items:
+        try:
+            batch.append(q.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _flush_write_batch(batch):
+    """Persist one batch of deferred writes and mark them done."""
+    try:
+        history_items = [(item[1], item[2]) for item in batch if item[0] == 'history']
+        if history_items:
+            _query_history().save_many(history_items)
+    except Exception as e:
+        logger.error("Error writing query history batch: %s", e)
+    finally:
+        for _ in batch:
+            _WRITE_Q.task_done()
+
+
+def _write_loop():
+    """Background writer: flush queued history entries in small batches."""
+    while True:
+        batch = _drain_up_to(_WRITE_Q, _WRITE_BATCH_SIZE, timeout=0.2)
+        if batch:
+            _flush_write_batch(batch)
+
+
+def start_write_queue():
+    """Start the deferred-write thread once per process."""
+    global _write_thread
+    with _write_thread_lock:
+        if _write_thread is None or not _write_thread.is_alive():
+            _write_thread = threading.Thread(target=_write_loop, daemon=True, name="history-writer")
+            _write_thread.start()
+
+
+def _drain_write_queue():
+    """Write any queued history entries before the interpreter exits."""
+    if _write_thread is not None and _write_thread.is_alive():
+        _WRITE_Q.join()
+        return
+    while True:
+        batch = _drain_up_to(_WRITE_Q, _WRITE_BATCH_SIZE, timeout=0)
+        if not batch:
+            break
+        _flush_write_batch(batch)
+
+
+atexit.register(_drain_write_queue)
+
+
+# Heavy component modules (torch, Chroma, Ollama client) imported by initialize_components()
+_COMPONENT_MODULES = (
+    'embeddings.vector_store',
+    'embeddings.embedder',
+    'retrieval.retrieve',
+    'agent.interpreter',
+    'evaluation.audit',
+)
+
+
+def _import_component_modules():
+    """
+    Import the component modules concurrently.
+
+    Most of the cost is reading and loading native extensions, which
+    releases the GIL, so independent imports overlap well.
+
+    Returns:
+        Dict mapping module name to the imported module
+    """
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="import") as ex:
+        futures = [ex.submit(importlib.import_module, name) for name in _COMPONENT_MODULES]
+        return {name: f.result() for name, f in zip(_COMPONENT_MODULES, futures)}
+
+
 def initialize_components():
     """Initialize all system components."""
     global vector_store, retriever, interpreter, audit, config, conversation_manager, training_lab_manager, threat_feed_manager, query_orchestrator, feed_scheduler
+    global RETRIEVAL_TOP_K, _STATUS_TEMPLATE
     
     logger.info("Initializing components...")
     
     try:
         load_config()
+
+        # Bind hot-path config values once instead of walking the dict per request
+        RETRIEVAL_TOP_K = int(config.get('retrieval', {}).get('top_k', 5) or 5)
+        _STATUS_TEMPLATE = {
+            'model': config.get('ollama', {}).get('model', 'N/A'),
+            'host': config.get('ollama', {}).get('host', 'N/A'),
+        }
         
-        from embeddings.vector_store import VectorStore
-        from embeddings.embedder import LocalEmbedder
-        from retrieval.retrieve import EvidenceRetriever
-        from agent.interpreter import EvidenceBasedInterpreter
-        from evaluation.audit import AuditTrail
+        mods = _import_component_modules()
+        VectorStore = mods['embeddings.vector_store'].VectorStore
+        LocalEmbedder = mods['embeddings.embedder'].LocalEmbedder
+        EvidenceRetriever = mods['retrieval.retrieve'].EvidenceRetriever
+        EvidenceBasedInterpreter = mods['agent.interpreter'].EvidenceBasedInterpreter
+        AuditTrail = mods['evaluation.audit'].AuditTrail
         
         # Initialize vector store
         vs_config = config.get('vector_store', {})
@@ -174,10 +361,11 @@ def initialize_components():
             temperature=ollama_config.get('temperature', 0.3),
             max_tokens=ollama_config.get('max_tokens', 512),
         )
-        logger.info(f"✓ Interpreter initialized: {'Ollama' if interpreter.use_ollama else 'Fallback'}")
+        logger.info("✓ Interpreter initialized: %s", 'Ollama' if interpreter.use_ollama else 'Fallback')
         
         # Initialize audit trail
         audit = AuditTrail()
+        start_write_queue()
         logger.info("✓ Audit trail initialized")
         
         # Initialize conversation manager
@@ -212,6 +400,7 @@ def initialize_components():
             threat_feed_manager=threat_feed_manager,
             cache=query_cache,
             cache_ttl_seconds=CACHE_TTL_SECONDS,
+            top_k=RETRIEVAL_TOP_K,
         )
         logger.info("✓ Query orchestrator initialized")
 
@@ -222,34 +411,191 @@ def initialize_components():
         return True
         
     except Exception as e:
-        logger.error(f"Failed to initialize components: {e}")
+        logger.error("Failed to initialize components: %s", e)
+        return False
+
+
+def start_background_initialization():
+    """Initialize components in a worker thread so the web server starts immediately."""
+    global _init_executor, _init_future
+    if _init_future is None:
+        _init_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='threat-ai-init')
+        _init_future = _init_executor.submit(initialize_components)
+    return _init_future
+
+
+def _log_initialization_result(future):
+    """Report the outcome of background initialization."""
+    if future.exception() is None and future.result():
+        logger.info("SYSTEM READY FOR QUERIES")
+    else:
+        logger.error("Failed to initialize system components.")
+
+
+def _ensure_initialized() -> bool:
+    """Block until background initialization has finished (first request only)."""
+    if _init_future is None:
+        return query_orchestrator is not None
+    try:
+        return bool(_init_future.result())
+    except Exception as e:
+        logger.error("Background initialization failed: %s", e)
         return False
 
 
 def process_query(query_text: str, use_cache: bool = True, conversation_id: str = None) -> dict:
     """Process a query through the query orchestrator service."""
+    _ensure_initialized()
     if query_orchestrator is None:
         return {'error': 'System not initialized'}
     return query_orchestrator.process_query(query_text, use_cache=use_cache, conversation_id=conversation_id)
 
 
+def process_queries(queries: list, use_cache: bool = True, max_workers: int = 4) -> list:
+    """Process several independent queries through the query orchestrator service.
+
+    Retrieval is batched across the queries; the thread pool only overlaps
+    their Ollama calls (see QueryOrchestrator.process_queries).
+
+    Args:
+        queries: Query strings
+        use_cache: Whether to consult the query cache
+        max_workers: Concurrent queries in flight
+
+    Returns:
+        Results in the same order as queries
+    """
+    _ensure_initialized()
+    if query_orchestrator is None:
+        return [{'error': 'System not initialized'} for _ in queries]
+    return query_orchestrator.process_queries(queries, use_cache=use_cache, max_workers=max_workers)
+
+
 # ==================== WEB UI ROUTES ====================
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (numpy-aware, insertion-ordered keys)."""
+
+    _FRAGMENT = getattr(orjson, 'Fragment', None)
+    _OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+    if _FRAGMENT is not None:
+        # Route dict subclasses through _default so pre-encoded metadata is embedded as-is
+        _OPTIONS |= orjson.OPT_PASSTHROUGH_SUBCLASS
+
+    def _default(self, o):
+        """Embed RawMetadata blobs verbatim; unwrap other builtin subclasses."""
+        if isinstance(o, dict):
+            raw = getattr(o, 'raw', None)
+            if raw is not None:
+                return self._FRAGMENT(raw)
+            return dict(o)
+        if isinstance(o, list):
+            return list(o)
+        if isinstance(o, str) and not hasattr(o, '__html__'):
+            return str(o)
+        if isinstance(o, int):
+            return int(o)
+        return self.default(o)
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self._default, option=self._OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response from orjson bytes, skipping the str round-trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._OPTIONS | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self._default, option=option),
+            mimetype=self.mimetype,
+        )
+
+
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 app.config['JSON_SORT_KEYS'] = False
+# Export routes receive whole results back; anything past this is refused with 413
+app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+
+def _request_json(silent=False):
+    """
+    Parse the request body with the app's JSON provider.
+
+    Reads the body with cache=False so the raw bytes are not kept on the
+    request alongside the parsed object.
+
+    Args:
+        silent: Return None instead of raising on malformed JSON
+
+    Returns:
+        Parsed JSON value, or None for an empty body
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    try:
+        return app.json.loads(raw)
+    except ValueError:
+        if silent:
+            return None
+        raise
+
+
+@app.before_request
+def _wait_for_components():
+    """Hold API requests until background warmup completes; pages render immediately."""
+    if request.path.startswith('/api/') and request.path != '/api/status':
+        _ensure_initialized()
+
+
+# Rendered static pages, keyed by (template, context items); filled on first hit
+_PAGE_CACHE = {}
+
+
+def _render_static_page(template_name, **context):
+    """
+    Serve a template with no per-request variables from a rendered-once cache.
+
+    Pages are rendered on their first request (url_for needs a request
+    context) and then served as bytes. Debug mode renders every time so
+    template edits show up.
+
+    Args:
+        template_name: Template to render
+        **context: Template variables (part of the cache key)
+
+    Returns:
+        HTML response
+    """
+    from flask import Response
+
+    if app.debug:
+        return render_template(template_name, **context)
+    key = (template_name, tuple(sorted(context.items())))
+    body = _PAGE_CACHE.get(key)
+    if body is None:
+        body = render_template(template_name, **context).encode('utf-8')
+        _PAGE_CACHE[key] = body
+    return Response(body, mimetype='text/html')
 
 
 @app.route('/')
 def index():
     """Main chat interface."""
     bundle_path = Path('static') / 'dist' / 'app.js'
-    return render_template('chat.html', use_bundled_frontend=bundle_path.exists())
+    return _render_static_page('chat.html', use_bundled_frontend=bundle_path.exists())
 
 
 @app.route('/old')
 def old_interface():
     """Old Q&A interface."""
-    return render_template('index.html')
+    return _render_static_page('index.html')
 
 
 @app.route('/training-lab')
@@ -274,7 +620,7 @@ def training_models():
             'note': 'Recommended order favors lightweight local models for laptop usage.'
         })
     except Exception as e:
-        logger.error(f"Error getting training models: {e}")
+        logger.error("Error getting training models: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -285,7 +631,7 @@ def training_start():
         if training_lab_manager is None:
             return jsonify({'error': 'Training lab is not initialized'}), 500
 
-        data = request.json or {}
+        data = _request_json() or {}
         result = training_lab_manager.start_run(
             model=data.get('model'),
             min_questions_per_actor=int(data.get('min_questions_per_actor', 3)),
@@ -298,7 +644,7 @@ def training_start():
             return jsonify(result), 400
         return jsonify(result)
     except Exception as e:
-        logger.error(f"Error starting training run: {e}")
+        logger.error("Error starting training run: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -314,7 +660,7 @@ def training_stop():
             return jsonify(result), 400
         return jsonify(result)
     except Exception as e:
-        logger.error(f"Error stopping training run: {e}")
+        logger.error("Error stopping training run: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -325,7 +671,7 @@ def training_resume():
         if training_lab_manager is None:
             return jsonify({'error': 'Training lab is not initialized'}), 500
 
-        data = request.json or {}
+        data = _request_json() or {}
         run_id = (data.get('run_id') or '').strip()
         if not run_id:
             return jsonify({'error': 'run_id is required'}), 400
@@ -335,7 +681,7 @@ def training_resume():
             return jsonify(result), 400
         return jsonify(result)
     except Exception as e:
-        logger.error(f"Error resuming training run: {e}")
+        logger.error("Error resuming training run: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -346,7 +692,7 @@ def training_cache_build():
         if training_lab_manager is None:
             return jsonify({'error': 'Training lab is not initialized'}), 500
 
-        data = request.json or {}
+        data = _request_json() or {}
         result = training_lab_manager.build_qa_cache(
             run_id=data.get('run_id'),
             merge=bool(data.get('merge', True)),
@@ -355,7 +701,7 @@ def training_cache_build():
             return jsonify(result), 400
         return jsonify(result)
     except Exception as e:
-        logger.error(f"Error building training cache: {e}")
+        logger.error("Error building training cache: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -367,7 +713,7 @@ def training_cache_status():
             return jsonify({'error': 'Training lab is not initialized'}), 500
         return jsonify(training_lab_manager.cache_status())
     except Exception as e:
-        logger.error(f"Error getting training cache status: {e}")
+        logger.error("Error getting training cache status: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -378,11 +724,11 @@ def training_cache_mode():
         if training_lab_manager is None:
             return jsonify({'error': 'Training lab is not initialized'}), 500
 
-        data = request.json or {}
+        data = _request_json() or {}
         enabled = bool(data.get('enabled', False))
         return jsonify(training_lab_manager.set_cache_only_mode(enabled))
     except Exception as e:
-        logger.error(f"Error updating training cache mode: {e}")
+        logger.error("Error updating training cache mode: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -397,7 +743,7 @@ def training_status():
         result = training_lab_manager.get_state(run_id=run_id)
         return jsonify(result)
     except Exception as e:
-        logger.error(f"Error getting training status: {e}")
+        logger.error("Error getting training status: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -411,7 +757,7 @@ def training_runs():
         limit = int(request.args.get('limit', 20))
         return jsonify({'runs': training_lab_manager.list_runs(limit=limit)})
     except Exception as e:
-        logger.error(f"Error listing training runs: {e}")
+        logger.error("Error listing training runs: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -430,16 +776,44 @@ def training_records():
         offset = int(request.args.get('offset', 0))
         return jsonify(training_lab_manager.get_records(run_id=run_id, limit=limit, offset=offset))
     except Exception as e:
-        logger.error(f"Error getting training records: {e}")
+        logger.error("Error getting training records: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+def _validate_query(value):
+    """
+    Check a submitted query string.
+
+    Args:
+        value: Raw 'query' value from the request body
+
+    Returns:
+        (stripped query, None) when valid, else (None, error message)
+    """
+    if not isinstance(value, str):
+        return None, 'invalid query'
+    query = value.strip()
+    if not query:
+        return None, 'Query cannot be empty'
+    if len(query) > MAX_QUERY_CHARS:
+        return None, f'Query too long (max {MAX_QUERY_CHARS} characters)'
+    return query, None
+
+
 @app.route('/api/query', methods=['POST'])
 def web_query():
     """Web API endpoint for queries with multi-turn conversation support."""
     try:
-        data = request.json
-        user_query = data.get('query', '').strip()
+        # Reject oversized bodies before Flask parses them into a dict
+        if (request.content_length or 0) > MAX_QUERY_BODY_BYTES:
+            return jsonify({'error': 'Request body too large'}), 413
+
+        data = _request_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'invalid query'}), 400
+        user_query, error = _validate_query(data.get('query'))
+        if error:
+            return jsonify({'error': error}), 400
         conversation_id = data.get('conversation_id', None)
         
         result = process_query(user_query, conversation_id=conversation_id)
@@ -447,10 +821,8 @@ def web_query():
         if 'error' in result:
             return jsonify(result), 400 if 'empty' in result.get('error', '') else 500
         
-        # Save to query history
-        from history import QueryHistory
-        history = QueryHistory()
-        history.save_query(user_query, result)
+        # Save to query history off the request path
+        _WRITE_Q.put(('history', user_query, result))
         
         # Return conversation_id for client to use in follow-up queries
         if conversation_id:
@@ -459,37 +831,100 @@ def web_query():
         return jsonify(result)
         
     except Exception as e:
-        logger.error(f"Error in web_query: {e}")
+        logger.error("Error in web_query: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/query_batch', methods=['POST'])
+def web_query_batch():
+    """Answer a list of independent queries in one request."""
+    try:
+        # Up to 50 queries, each allowed a single-query body
+        if (request.content_length or 0) > MAX_QUERY_BODY_BYTES * 50:
+            return jsonify({'error': 'Request body too large'}), 413
+
+        data = _request_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'queries must be a non-empty list'}), 400
+        queries = data.get('queries')
+        if not isinstance(queries, list) or not queries:
+            return jsonify({'error': 'queries must be a non-empty list'}), 400
+        if len(queries) > 50:
+            return jsonify({'error': 'At most 50 queries per batch'}), 400
+
+        validated = [_validate_query(q) for q in queries]
+        errors = [{'index': i, 'error': error} for i, (_, error) in enumerate(validated) if error]
+        if errors:
+            return jsonify({'error': 'invalid queries in batch', 'errors': errors}), 400
+
+        queries = [query for query, _ in validated]
+        results = process_queries(queries, use_cache=bool(data.get('use_cache', True)))
+        return jsonify({'results': results, 'count': len(results)})
+
+    except Exception as e:
+        logger.error("Error in web_query_batch: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/query_stream', methods=['POST'])
+def web_query_stream():
+    """Stream an answer as Server-Sent Events while Ollama generates it."""
+    from flask import Response, stream_with_context
+
+    if (request.content_length or 0) > MAX_QUERY_BODY_BYTES:
+        return jsonify({'error': 'Request body too large'}), 413
+
+    data = _request_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'invalid query'}), 400
+    user_query, error = _validate_query(data.get('query'))
+    if error:
+        return jsonify({'error': error}), 400
+
+    def generate_stream():
+        if query_orchestrator is None:
+            yield f"data: {json.dumps({'type': 'error', 'error': 'System not initialized'})}\n\n"
+            return
+        for event in query_orchestrator.stream_query(user_query):
+            yield f"data: {json.dumps(event)}\n\n"
+
+    return Response(stream_with_context(generate_stream()), mimetype='text/event-stream')
+
+
 @app.route('/api/status')
 def status():
     """Get system status."""
     try:
         status_info = {
             'llm_mode': 'Ollama' if interpreter and interpreter.use_ollama else 'Fallback/Unavailable',
-            'model': config.get('ollama', {}).get('model', 'N/A') if config else 'N/A',
-            'host': config.get('ollama', {}).get('host', 'N/A') if config else 'N/A',
-            'initialized': vector_store is not None and retriever is not None and interpreter is not None
+            **_STATUS_TEMPLATE,
+            'initialized': vector_store is not None and retriever is not None and interpreter is not None,
+            'initializing': _init_future is not None and not _init_future.done(),
         }
         return jsonify(status_info)
     except Exception as e:
-        logger.error(f"Error getting status: {e}")
+        logger.error("Error getting status: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+SAMPLE_QUERIES = (
+    "What are common tactics used by APT28?",
+    "Describe REvil ransomware variants",
+    "What vulnerabilities does Lazarus Group exploit?",
+    "How does Emotet propagate?",
+    "What infrastructure does Turla use?"
+)
+
+# Constant payload: serialized once at import, served with a fresh Response per request
+_SAMPLES_BODY = json.dumps({'samples': list(SAMPLE_QUERIES)})
+
+
 @app.route('/api/samples')
 def samples():
     """Get sample queries."""
-    samples_list = [
-        "What are common tactics used by APT28?",
-        "Describe REvil ransomware variants",
-        "What vulnerabilities does Lazarus Group exploit?",
-        "How does Emotet propagate?",
-        "What infrastructure does Turla use?"
-    ]
-    return jsonify({'samples': samples_list})
+    response = app.response_class(_SAMPLES_BODY, mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
 
 
 @app.route('/api/feeds/ingest', methods=['POST'])
@@ -499,7 +934,7 @@ def ingest_feeds():
         if threat_feed_manager is None:
             return jsonify({'error': 'Threat feed manager not initialized'}), 500
 
-        data = request.json or {}
+        data = _request_json() or {}
         max_items_per_source = int(data.get('max_items_per_source', 50))
         fresh_hours = int(data.get('fresh_hours', 12))
         force = bool(data.get('force', False))
@@ -510,7 +945,7 @@ def ingest_feeds():
         )
         return jsonify(stats)
     except Exception as e:
-        logger.error(f"Error ingesting feeds: {e}")
+        logger.error("Error ingesting feeds: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -536,7 +971,7 @@ def feed_ingestion_status():
 
         return jsonify(health)
     except Exception as e:
-        logger.error(f"Error getting feed ingestion status: {e}")
+        logger.error("Error getting feed ingestion status: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -544,9 +979,7 @@ def feed_ingestion_status():
 def submit_feedback():
     """Submit feedback for a query response."""
     try:
-        data = request.json
-        
-        from feedback.store import FeedbackStore
+        data = _request_json()
         
         feedback_data = {
             'query': data.get('query'),
@@ -564,10 +997,16 @@ def submit_feedback():
             'corrections': data.get('corrections')
         }
         
-        feedback_store = FeedbackStore()
+        feedback_store = _feedback_store()
         feedback_id = feedback_store.store_feedback(feedback_data)
+
+        # Feedback may flag a bad answer; stop serving memoized completions
+        if interpreter is not None and hasattr(interpreter, 'clear_cache'):
+            interpreter.clear_cache()
+        if feedback_data.get('corrections') and query_orchestrator is not None:
+            query_orchestrator.invalidate_trace(feedback_data.get('trace_id'))
         
-        logger.info(f"Feedback submitted: {feedback_id}")
+        logger.info("Feedback submitted: %s", feedback_id)
         return jsonify({
             'success': True,
             'feedback_id': feedback_id,
@@ -575,33 +1014,47 @@ def submit_feedback():
         })
         
     except Exception as e:
-        logger.error(f"Error submitting feedback: {e}")
+        logger.error("Error submitting feedback: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+def _stream_attachment(chunks, mimetype: str, download_name: str):
+    """Stream generated report chunks as a file download.
+
+    The first chunk is pulled eagerly so generation errors still surface as
+    a JSON 500 from the calling route instead of a truncated download.
+    """
+    from itertools import chain
+    from flask import Response, stream_with_context
+
+    first = next(chunks, b'')
+    return Response(
+        stream_with_context(chain((first,), chunks)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={download_name}'},
+    )
+
+
 @app.route('/api/export/pdf', methods=['POST'])
 def export_pdf():
     """Export query result as PDF."""
     try:
         from export.report_generator import ReportGenerator
         
-        data = request.json
+        data = _request_json()
         result = data.get('result', {})
         
         if not result:
             return jsonify({'error': 'No result data provided'}), 400
         
-        pdf_bytes = ReportGenerator.generate_pdf(result)
-        
-        return send_file(
-            io.BytesIO(pdf_bytes),
+        return _stream_attachment(
+            ReportGenerator.iter_pdf(result),
             mimetype='application/pdf',
-            as_attachment=True,
             download_name=f"threat-intelligence-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.pdf"
         )
         
     except Exception as e:
-        logger.error(f"Error exporting PDF: {e}")
+        logger.error("Error exporting PDF: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -611,23 +1064,20 @@ def export_csv():
     try:
         from export.report_generator import ReportGenerator
         
-        data = request.json
+        data = _request_json()
         result = data.get('result', {})
         
         if not result:
             return jsonify({'error': 'No result data provided'}), 400
         
-        csv_data = ReportGenerator.generate_csv(result)
-        
-        return send_file(
-            io.BytesIO(csv_data.encode('utf-8')),
+        return _stream_attachment(
+            ReportGenerator.iter_csv(result),
             mimetype='text/csv',
-            as_attachment=True,
             download_name=f"threat-intelligence-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv"
         )
         
     except Exception as e:
-        logger.error(f"Error exporting CSV: {e}")
+        logger.error("Error exporting CSV: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -637,12 +1087,10 @@ def export_csv():
 def get_history():
     """Get query history."""
     try:
-        from history import QueryHistory
-        
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
         
-        history = QueryHistory()
+        history = _query_history()
         queries = history.get_all_queries(limit=limit, offset=offset)
         stats = history.get_stats()
         
@@ -651,7 +1099,7 @@ def get_history():
             'stats': stats
         })
     except Exception as e:
-        logger.error(f"Error fetching history: {e}")
+        logger.error("Error fetching history: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -659,18 +1107,16 @@ def get_history():
 def search_history():
     """Search query history."""
     try:
-        from history import QueryHistory
-        
         search_term = request.args.get('q', '').strip()
         if not search_term:
             return jsonify({'error': 'Search term required'}), 400
         
-        history = QueryHistory()
+        history = _query_history()
         queries = history.search_queries(search_term)
         
         return jsonify({'queries': queries})
     except Exception as e:
-        logger.error(f"Error searching history: {e}")
+        logger.error("Error searching history: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -678,9 +1124,7 @@ def search_history():
 def get_query_detail(query_id):
     """Get specific query from history."""
     try:
-        from history import QueryHistory
-        
-        history = QueryHistory()
+        history = _query_history()
         query = history.get_query(query_id)
         
         if not query:
@@ -688,7 +1132,7 @@ def get_query_detail(query_id):
         
         return jsonify(query)
     except Exception as e:
-        logger.error(f"Error fetching query: {e}")
+        logger.error("Error fetching query: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -696,9 +1140,7 @@ def get_query_detail(query_id):
 def delete_query_history(query_id):
     """Delete query from history."""
     try:
-        from history import QueryHistory
-        
-        history = QueryHistory()
+        history = _query_history()
         deleted = history.delete_query(query_id)
         
         if not deleted:
@@ -706,7 +1148,7 @@ def delete_query_history(query_id):
         
         return jsonify({'success': True, 'message': 'Query deleted'})
     except Exception as e:
-        logger.error(f"Error deleting query: {e}")
+        logger.error("Error deleting query: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -714,14 +1156,12 @@ def delete_query_history(query_id):
 def clear_history():
     """Clear all query history."""
     try:
-        from history import QueryHistory
-        
-        history = QueryHistory()
+        history = _query_history()
         history.clear_all()
         
         return jsonify({'success': True, 'message': 'History cleared'})
     except Exception as e:
-        logger.error(f"Error clearing history: {e}")
+        logger.error("Error clearing history: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -731,13 +1171,13 @@ def clear_history():
 def create_conversation():
     """Create a new conversation."""
     try:
-        data = request.json or {}
+        data = _request_json() or {}
         title = data.get('title', 'New Chat')
         
         conv_id = conversation_manager.create_conversation(title)
         return jsonify({'conversation_id': conv_id, 'title': title})
     except Exception as e:
-        logger.error(f"Error creating conversation: {e}")
+        logger.error("Error creating conversation: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -749,10 +1189,32 @@ def list_conversations():
         conversations = conversation_manager.list_conversations(limit)
         return jsonify({'conversations': conversations})
     except Exception as e:
-        logger.error(f"Error listing conversations: {e}")
+        logger.error("Error listing conversations: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
+def _add_assistant_message(conversation, content, metadata):
+    """
+    Append an assistant reply, encoding its metadata (evidence included) once.
+
+    The orjson bytes travel with the message, so returning the conversation
+    later embeds them instead of serializing the evidence again.
+
+    Args:
+        conversation: Conversation to append to
+        content: Assistant message text
+        metadata: Confidence, evidence, trace and report fields for the reply
+    """
+    if orjson is not None:
+        try:
+            meta_blob = orjson.dumps(metadata, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+            conversation.add_message_raw('assistant', content, meta_blob, metadata)
+            return
+        except TypeError as e:
+            logger.debug("Falling back to plain message metadata: %s", e)
+    conversation.add_message('assistant', content, metadata)
+
+
 @app.route('/api/conversations/<conv_id>', methods=['GET'])
 def get_conversation(conv_id):
     """Get a specific conversation with full history."""
@@ -763,7 +1225,7 @@ def get_conversation(conv_id):
         
         return jsonify(conversation.to_dict())
     except Exception as e:
-        logger.error(f"Error getting conversation: {e}")
+        logger.error("Error getting conversation: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -776,7 +1238,7 @@ def delete_conversation(conv_id):
             return jsonify({'success': True, 'message': 'Conversation deleted'})
         return jsonify({'error': 'Conversation not found'}), 404
     except Exception as e:
-        logger.error(f"Error deleting conversation: {e}")
+        logger.error("Error deleting conversation: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -784,12 +1246,12 @@ def delete_conversation(conv_id):
 def send_message(conv_id):
     """Send a message in a conversation and get AI response."""
     try:
-        data = request.json
-        user_message = data.get('message', '').strip()
-        report_requested = is_report_request(user_message)
-        
-        if not user_message:
+        data = _request_json()
+        user_message = data.get('message', '')
+        if not user_message or user_message.isspace():
             return jsonify({'error': 'Message cannot be empty'}), 400
+        user_message = user_message.strip()
+        report_requested = is_report_request(user_message)
         
         # Get or create conversation
         conversation = conversation_manager.get_conversation(conv_id)
@@ -859,7 +1321,7 @@ def send_message(conv_id):
         )
 
         # Add assistant response to conversation with metadata
-        conversation.add_message('assistant', assistant_message, {
+        _add_assistant_message(conversation, assistant_message, {
             'confidence': result.get('confidence'),
             'evidence': result.get('evidence', []),
             'trace_id': result.get('trace_id'),
@@ -898,7 +1360,7 @@ def send_message(conv_id):
         })
         
     except Exception as e:
-        logger.error(f"Error sending message: {e}")
+        logger.error("Error sending message: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -913,17 +1375,17 @@ def stream_message(conv_id):
     from flask import Response
     
     # Extract request data BEFORE generator (while request context is active)
-    data = request.json or {}
+    data = _request_json() or {}
     user_message = data.get('message', '').strip()
     
     def generate_stream():
         try:
-            report_requested = is_report_request(user_message)
-            
             if not user_message:
                 yield f"data: {json.dumps({'error': 'Message cannot be empty'})}\n\n"
                 return
             
+            report_requested = is_report_request(user_message)
+            
             # Get or create conversation
             conversation = conversation_manager.get_conversation(conv_id)
             if not conversation:
@@ -1017,7 +1479,7 @@ def stream_message(conv_id):
                 yield f"data: {stream_data}\n\n"
             
             # Add to conversation after streaming completes
-            conversation.add_message('assistant', assistant_message, {
+            _add_assistant_message(conversation, assistant_message, {
                 'confidence': result.get('confidence'),
                 'evidence': result.get('evidence', []),
                 'trace_id': result.get('trace_id'),
@@ -1034,7 +1496,7 @@ def stream_message(conv_id):
             conversation_manager.save_conversation(conv_id)
             
         except Exception as e:
-            logger.error(f"Error in stream_message: {e}")
+            logger.error("Error in stream_message: %s", e)
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
     
     return Response(generate_stream(), mimetype='text/event-stream')
@@ -1092,15 +1554,23 @@ def run_cli():
             logger.info("\n\nInterrupted by user.")
             break
         except Exception as e:
-            logger.error(f"Error: {e}")
+            logger.error("Error: %s", e)
+
 
+def run_web_ui(port=5000, host='127.0.0.1', open_browser=True, server='waitress', threads=8):
+    """Run web UI.
 
-def run_web_ui(port=5000, host='127.0.0.1', open_browser=True):
-    """Run web UI."""
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+        open_browser: Open a browser tab on start
+        server: 'waitress' (threaded WSGI server) or 'dev' (Flask's Werkzeug server)
+        threads: Waitress worker threads
+    """
     logger.info("\n" + "="*50)
     logger.info("THREAT-AI WEB UI MODE")
     logger.info("="*50)
-    logger.info(f"Starting web server on http://{host}:{port}")
+    logger.info("Starting web server on http://%s:%s", host, port)
     logger.info("Press Ctrl+C to stop\n")
     
     # Open browser if requested
@@ -1108,12 +1578,24 @@ def run_web_ui(port=5000, host='127.0.0.1', open_browser=True):
         time.sleep(1.5)
         try:
             webbrowser.open(f'http://{host}:{port}')
-            logger.info(f"✓ Browser opened\n")
+            logger.info("✓ Browser opened\n")
         except:
-            logger.warning(f"⚠ Could not open browser - navigate to http://{host}:{port} manually\n")
+            logger.warning("⚠ Could not open browser - navigate to http://%s:%s manually\n", host, port)
     
     try:
-        app.run(debug=False, host=host, port=port, use_reloader=False)
+        if server == 'dev':
+            app.run(debug=False, host=host, port=port, use_reloader=False)
+            return
+
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.warning("waitress not installed - falling back to the Flask dev server (pip install waitress)")
+            app.run(debug=False, host=host, port=port, use_reloader=False, threaded=True)
+            return
+
+        logger.info("Serving with waitress (%s threads)", threads)
+        serve(app, host=host, port=port, threads=threads, connection_limit=200)
     except KeyboardInterrupt:
         logger.info("\n✓ Server stopped")
 
@@ -1129,6 +1611,7 @@ Examples:
   python app.py --web --port 8000        Run web UI on custom port
     python app.py --web --host 0.0.0.0     Bind web UI for server deployment
   python app.py --web --no-browser       Run web UI without opening browser
+  python app.py --web --server dev       Run web UI on the Flask dev server
   python app.py --cli                    Run CLI interface
         """
     )
@@ -1159,6 +1642,23 @@ Examples:
         action='store_true',
         help='Do not open browser automatically'
     )
+    parser.add_argument(
+        '--server',
+        choices=['waitress', 'dev'],
+        default='waitress',
+        help='Web server to run (default: waitress)'
+    )
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=8,
+        help='Worker threads for waitress (default: 8)'
+    )
+    parser.add_argument(
+        '--dev',
+        action='store_true',
+        help='Shorthand for --server dev'
+    )
     
     args = parser.parse_args()
     
@@ -1169,26 +1669,33 @@ Examples:
     logger.info("Starting Threat-AI MVP...")
     
     try:
-        # Initialize components
-        if not initialize_components():
-            logger.error("Failed to initialize system components.")
-            sys.exit(1)
-        
-        logger.info("\n" + "="*50)
-        logger.info("SYSTEM READY FOR QUERIES")
-        logger.info("="*50)
-        
         # Run selected mode
         if args.cli:
+            # Initialize components
+            if not initialize_components():
+                logger.error("Failed to initialize system components.")
+                sys.exit(1)
+            
+            logger.info("\n" + "="*50)
+            logger.info("SYSTEM READY FOR QUERIES")
+            logger.info("="*50)
             run_cli()
         else:  # web UI
-            run_web_ui(port=args.port, host=args.host, open_browser=not args.no_browser)
+            # Warm components up in the background; API calls wait on the first use
+            start_background_initialization().add_done_callback(_log_initialization_result)
+            run_web_ui(
+                port=args.port,
+                host=args.host,
+                open_browser=not args.no_browser,
+                server='dev' if args.dev else args.server,
+                threads=max(1, args.threads),
+            )
     
     except KeyboardInterrupt:
         logger.info("\nInterrupted by user.")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 
@@ -1,14 +1,26 @@
 """Convert JSON threat actor profiles into semantic text chunks."""
 
+import hashlib
 import logging
-import uuid
+import os
 import re
-from typing import Dict, Any, List
-from .rules import ChunkingRules
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Any, List, Optional
+from .rules import get_field_type
 
 logger = logging.getLogger(__name__)
 
 
+def _cid(actor_id: str, field: str, idx: int, text: str) -> str:
+    """Content-addressed chunk id: unchanged chunks keep their id across re-ingests."""
+    return hashlib.blake2b(
+        f"{actor_id}|{field}|{idx}|".encode('utf-8') + text.encode('utf-8'),
+        digest_size=16,
+    ).hexdigest()
+
+
 class SemanticChunker:
     """Convert threat actor JSON into semantic chunks."""
     
@@ -120,6 +132,91 @@ class SemanticChunker:
         else:
             return self._chunk_actor_field_level(actor)
     
+    def chunk_actor_columnar(self, actor: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """
+        Chunk an actor profile into parallel columns instead of per-chunk dicts.
+        
+        Bulk ingest should prefer this form: the embedder takes ``texts``
+        directly and the vector store takes ids/metadatas as-is, with no
+        outer dict per chunk.
+        
+        Args:
+            actor: Threat actor profile
+            
+        Returns:
+            Dict with equal-length 'chunk_ids', 'actor_ids', 'texts' and 'metadatas' lists
+        """
+        return self._to_columns(self.chunk_actor(actor))
+    
+    @staticmethod
+    def _to_columns(chunks: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Transpose chunk dicts into column lists."""
+        n = len(chunks)
+        chunk_ids = [None] * n
+        actor_ids = [None] * n
+        texts = [None] * n
+        metadatas = [None] * n
+        for i, chunk in enumerate(chunks):
+            chunk_ids[i] = chunk['chunk_id']
+            actor_ids[i] = chunk['actor_id']
+            texts[i] = chunk['text']
+            metadatas[i] = chunk['metadata']
+        return {'chunk_ids': chunk_ids, 'actor_ids': actor_ids, 'texts': texts, 'metadatas': metadatas}
+    
+    # Below this many actors a process pool costs more to start than it saves
+    PARALLEL_MIN_ACTORS = 64
+
+    def chunk_actors(self, actors: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Chunk many actor profiles, spreading the work across processes.
+        
+        Args:
+            actors: Threat actor profiles
+            max_workers: Worker processes (defaults to the CPU count)
+            
+        Returns:
+            One list of chunks per actor, in input order
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(actors) < self.PARALLEL_MIN_ACTORS:
+            return [self.chunk_actor(actor) for actor in actors]
+        
+        chunksize = max(1, len(actors) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                return list(ex.map(self.chunk_actor, actors, chunksize=chunksize))
+        except Exception as e:
+            logger.warning("Parallel chunking failed (%s); chunking serially", e)
+            return [self.chunk_actor(actor) for actor in actors]
+    
+    def chunk_many(self, actors: List[Dict[str, Any]], sort_by_length: bool = True,
+                   max_workers: Optional[int] = None) -> Dict[str, List[Any]]:
+        """
+        Chunk many actors into one set of columns, ready for batched embedding.
+        
+        With sort_by_length, rows are ordered by text length so each embedder
+        batch holds similarly sized texts and wastes little padding.
+        
+        Args:
+            actors: Threat actor profiles
+            sort_by_length: Reorder rows by ascending text length
+            max_workers: Worker processes for chunk_actors()
+            
+        Returns:
+            Columns as from chunk_actor_columnar(), plus 'orig_index' giving each
+            row's position in plain actor-then-chunk order
+        """
+        chunks = [chunk for actor_chunks in self.chunk_actors(actors, max_workers=max_workers)
+                  for chunk in actor_chunks]
+        if sort_by_length:
+            order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]['text']))
+            chunks = [chunks[i] for i in order]
+        else:
+            order = list(range(len(chunks)))
+        columns = self._to_columns(chunks)
+        columns['orig_index'] = order
+        return columns
+    
     def _chunk_actor_entity_level(self, actor: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Create one comprehensive chunk per actor with all metadata.
@@ -230,7 +327,7 @@ class SemanticChunker:
         
         # Create single comprehensive chunk
         chunk = {
-            'chunk_id': str(uuid.uuid4()),
+            'chunk_id': _cid(actor_id, 'entity_profile', 0, full_text),
             'actor_id': actor_id,
             'text': full_text,
             'metadata': {
@@ -265,10 +362,11 @@ class SemanticChunker:
         chunks = [chunk]
 
         if last_updated:
+            last_updated_text = str(last_updated)
             last_updated_chunk = {
-                'chunk_id': str(uuid.uuid4()),
+                'chunk_id': _cid(actor_id, 'last_updated', 0, last_updated_text),
                 'actor_id': actor_id,
-                'text': str(last_updated),
+                'text': last_updated_text,
                 'metadata': {
                     'source_field': 'last_updated',
                     'chunk_type': 'atomic',
@@ -294,10 +392,11 @@ class SemanticChunker:
             chunks.append(last_updated_chunk)
 
         if sponsor:
+            sponsor_text = str(sponsor)
             sponsor_chunk = {
-                'chunk_id': str(uuid.uuid4()),
+                'chunk_id': _cid(actor_id, 'sponsor', 0, sponsor_text),
                 'actor_id': actor_id,
-                'text': str(sponsor),
+                'text': sponsor_text,
                 'metadata': {
                     'source_field': 'sponsor',
                     'chunk_type': 'atomic',
@@ -337,10 +436,11 @@ class SemanticChunker:
             if not isinstance(values, list):
                 values = [values]
             joiner = ' | ' if field_name == 'campaigns' else ', '
+            list_text = joiner.join(str(v) for v in values)
             list_chunk = {
-                'chunk_id': str(uuid.uuid4()),
+                'chunk_id': _cid(actor_id, field_name, 0, list_text),
                 'actor_id': actor_id,
-                'text': joiner.join(str(v) for v in values),
+                'text': list_text,
                 'metadata': {
                     'source_field': field_name,
                     'chunk_type': 'list',
@@ -378,8 +478,9 @@ class SemanticChunker:
         aliases = actor.get('aliases', [])
         name_giver = actor.get('name_giver') or actor.get('name-giver')
         
+        get_type = get_field_type
         for field_name, field_value in actor.items():
-            field_type = ChunkingRules.get_field_type(field_name)
+            field_type = get_type(field_name)
             
             if field_type == 'atomic':
                 chunk = self._create_atomic_chunk(actor_id, field_name, field_value)
@@ -412,10 +513,11 @@ class SemanticChunker:
     
     def _create_atomic_chunk(self, actor_id: str, field_name: str, value: Any) -> Dict[str, Any]:
         """Create a chunk for atomic fields."""
+        text = f"{field_name}: {value}"
         return {
-            'chunk_id': str(uuid.uuid4()),
+            'chunk_id': _cid(actor_id, field_name, 0, text),
             'actor_id': actor_id,
-            'text': f"{field_name}: {value}",
+            'text': text,
             'metadata': {
                 'source_field': field_name,
                 'chunk_type': 'atomic',
@@ -425,14 +527,22 @@ class SemanticChunker:
     
     def _chunk_list_field(self, actor_id: str, field_name: str, items: List[Any]) -> List[Dict[str, Any]]:
         """Create chunks for list fields."""
-        chunks = []
         if not items:
-            return chunks
+            return []
         
-        chunk_text = f"{field_name}: {', '.join(str(item) for item in items)}"
+        # Lists of strings (aliases, ttps, ...) join directly; anything else
+        # goes through map(str) rather than a per-item generator frame.
+        if isinstance(items[0], str):
+            try:
+                joined = ', '.join(items)
+            except TypeError:
+                joined = ', '.join(map(str, items))
+        else:
+            joined = ', '.join(map(str, items))
+        chunk_text = f"{field_name}: {joined}"
         return [
             {
-                'chunk_id': str(uuid.uuid4()),
+                'chunk_id': _cid(actor_id, field_name, 0, chunk_text),
                 'actor_id': actor_id,
                 'text': chunk_text,
                 'metadata': {
@@ -444,6 +554,9 @@ class SemanticChunker:
             }
         ]
     
+    # Stripped, non-empty runs between periods (same pieces as split('.') + strip())
+    _SENT_RE = re.compile(r'[^.\s](?:[^.]*[^.\s])?')
+
     def _chunk_text_field(self, actor_id: str, field_name: str, text: str) -> List[Dict[str, Any]]:
         """Split text field into semantic chunks."""
         chunks = []
@@ -451,44 +564,20 @@ class SemanticChunker:
         if not text or len(text) < self.min_length:
             return [self._create_atomic_chunk(actor_id, field_name, text)]
         
-        # Simple sliding window chunking
-        sentences = text.split('.')
-        current_chunk = []
-        current_length = 0
+        # Greedy sentence packing: each chunk takes sentences while their
+        # period-terminated lengths fit in chunk_size (at least one sentence).
+        sentences = self._SENT_RE.findall(text)
+        cum = list(accumulate(len(sentence) + 1 for sentence in sentences))
+        start = 0
+        base = 0
         chunk_index = 0
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-            
-            sentence_with_period = sentence + '.'
-            if current_length + len(sentence_with_period) > self.chunk_size and current_chunk:
-                chunk_text = ' '.join(current_chunk)
-                if len(chunk_text) >= self.min_length:
-                    chunks.append({
-                        'chunk_id': str(uuid.uuid4()),
-                        'actor_id': actor_id,
-                        'text': chunk_text,
-                        'metadata': {
-                            'source_field': field_name,
-                            'chunk_type': 'text',
-                            'chunk_index': chunk_index
-                        }
-                    })
-                    chunk_index += 1
-                    current_chunk = [sentence_with_period]
-                    current_length = len(sentence_with_period)
-            else:
-                current_chunk.append(sentence_with_period)
-                current_length += len(sentence_with_period)
-        
-        # Add remaining chunk
-        if current_chunk:
-            chunk_text = ' '.join(current_chunk)
+        while start < len(sentences):
+            end = max(start + 1, bisect_right(cum, base + self.chunk_size, lo=start))
+            chunk_text = '. '.join(sentences[start:end]) + '.'
             if len(chunk_text) >= self.min_length:
                 chunks.append({
-                    'chunk_id': str(uuid.uuid4()),
+                    'chunk_id': _cid(actor_id, field_name, chunk_index, chunk_text),
                     'actor_id': actor_id,
                     'text': chunk_text,
                     'metadata': {
@@ -497,5 +586,8 @@ class SemanticChunker:
                         'chunk_index': chunk_index
                     }
                 })
+                chunk_index += 1
+            base = cum[end - 1]
+            start = end
         
         return chunks
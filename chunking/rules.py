@@ -7,57 +7,64 @@ class ChunkingRules:
     """Define how different fields should be chunked."""
     
     # Fields that should be treated as single chunks
-    ATOMIC_FIELDS = {
-        'id': True,
-        'name': True,
-        'first_seen': True,
-        'last_seen': True,
-        'last_updated': True,
-        'last_card_change': True,
-        'last-card-change': True,
-        'sponsor': True,
-        'sponsorship': True,
-        'name_giver': True,
-        'name-giver': True,
-    }
+    ATOMIC_FIELDS = frozenset({
+        'id',
+        'name',
+        'first_seen',
+        'last_seen',
+        'last_updated',
+        'last_card_change',
+        'last-card-change',
+        'sponsor',
+        'sponsorship',
+        'name_giver',
+        'name-giver',
+    })
     
     # Fields that can be split into chunks
-    LIST_FIELDS = {
-        'aliases': True,
-        'ttps': True,
-        'tactics': True,
-        'targets': True,
-        'tools': True,
-        'campaigns': True,
-        'operations': True,
-        'counter_operations': True,
-        'counter-operations': True,
-        'alias_givers': True,
-        'origins': True,
-        'motivations': True,
-        'observed_sectors': True,
-        'observed-sectors': True,
-        'observed_countries': True,
-        'observed-countries': True,
-    }
+    LIST_FIELDS = frozenset({
+        'aliases',
+        'ttps',
+        'tactics',
+        'targets',
+        'tools',
+        'campaigns',
+        'operations',
+        'counter_operations',
+        'counter-operations',
+        'alias_givers',
+        'origins',
+        'motivations',
+        'observed_sectors',
+        'observed-sectors',
+        'observed_countries',
+        'observed-countries',
+    })
     
     # Fields that should be text-chunked
-    TEXT_FIELDS = {
-        'description': True,
-    }
+    TEXT_FIELDS = frozenset({
+        'description',
+    })
     
     @staticmethod
     def should_chunk(field_name: str) -> bool:
         """Determine if a field should be chunked."""
-        return field_name in ChunkingRules.TEXT_FIELDS or field_name in ChunkingRules.LIST_FIELDS
+        return _FIELD_TYPE.get(field_name) in ('list', 'text')
     
     @staticmethod
     def get_field_type(field_name: str) -> str:
         """Get the type of field for chunking strategy."""
-        if field_name in ChunkingRules.ATOMIC_FIELDS:
-            return 'atomic'
-        elif field_name in ChunkingRules.LIST_FIELDS:
-            return 'list'
-        elif field_name in ChunkingRules.TEXT_FIELDS:
-            return 'text'
-        return 'unknown'
+        return _FIELD_TYPE.get(field_name, 'unknown')
+
+
+# Single field -> chunking strategy table (one hash probe per lookup)
+_FIELD_TYPE: Dict[str, str] = {
+    **{field: 'text' for field in ChunkingRules.TEXT_FIELDS},
+    **{field: 'list' for field in ChunkingRules.LIST_FIELDS},
+    **{field: 'atomic' for field in ChunkingRules.ATOMIC_FIELDS},
+}
+
+
+def get_field_type(field_name: str) -> str:
+    """Module-level variant of ChunkingRules.get_field_type for hot loops."""
+    return _FIELD_TYPE.get(field_name, 'unknown')
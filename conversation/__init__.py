@@ -1,38 +1,172 @@
 """Conversation Management for Threat-AI Chat System."""
 
 import json
+import mmap
+import os
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # optional; metadata is then stored as a plain dict
+    orjson = None
+
+if orjson is not None:
+    _SAVE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _read_json(path) -> Dict:
+    """Parse a JSON file, with orjson over a read-only mmap when available."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b'')  # raises JSONDecodeError, as json.load would
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return orjson.loads(view)
+                finally:
+                    view.release()
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _replace_file(filepath: str, write) -> None:
+    """Write through ``filepath + '.tmp'`` and swap it in, so readers never see a partial file."""
+    tmp_path = filepath + '.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, filepath)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class RawMetadata(dict):
+    """Message metadata that also keeps its orjson encoding.
+
+    Reads behave like a plain dict; orjson-backed writers can embed ``raw``
+    verbatim instead of re-encoding large evidence arrays. Treat as read-only.
+    """
+
+    __slots__ = ('raw',)
+
+    def __init__(self, raw: bytes, data: Optional[Dict] = None):
+        super().__init__(orjson.loads(raw) if data is None else data)
+        self.raw = raw
+
 
 class ConversationManager:
     """Manages chat conversations with context retention."""
     
-    def __init__(self, storage_dir: str = "data/conversations"):
+    def __init__(self, storage_dir: str = "data/conversations", max_active: int = 128):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.active_conversations: Dict[str, 'Conversation'] = {}
+        # LRU of loaded conversations; the least recently used is saved and
+        # dropped once more than max_active are resident
+        self.active_conversations: 'OrderedDict[str, Conversation]' = OrderedDict()
+        self.max_active = max_active
+        self._active_lock = threading.Lock()
+        # Listing metadata per conversation, kept in index.jsonl so the list
+        # view never opens the conversation files themselves
+        self._index_path = self.storage_dir / "index.jsonl"
+        self._index_lock = threading.Lock()
+        self._index: Dict[str, Dict] = self._load_index()
+    
+    @staticmethod
+    def _summary(data: Dict) -> Dict:
+        """Index entry for a conversation dict."""
+        return {
+            'id': data['id'],
+            'title': data['title'],
+            'created_at': data['created_at'],
+            'updated_at': data['updated_at'],
+            'message_count': len(data['messages'])
+        }
+    
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the listing index, rebuilding it from the JSON files if missing.
+        
+        The file is append-only: later lines supersede earlier ones and
+        ``{"id": ..., "deleted": true}`` lines remove an entry.
+        """
+        index: Dict[str, Dict] = {}
+        if self._index_path.exists():
+            lines = 0
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    lines += 1
+                    if entry.get('deleted'):
+                        index.pop(entry['id'], None)
+                    else:
+                        index[entry['id']] = entry
+            if lines > 2 * len(index) + 100:
+                self._write_index(index)
+            return index
+        
+        for conv_file in self.storage_dir.glob("*.json"):
+            try:
+                entry = self._summary(_read_json(conv_file))
+            except Exception:
+                continue
+            index[entry['id']] = entry
+        self._write_index(index)
+        return index
+    
+    def _write_index(self, index: Dict[str, Dict]):
+        """Rewrite the index file to hold exactly one line per entry."""
+        tmp_path = self._index_path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in index.values()))
+        tmp_path.replace(self._index_path)
+    
+    def _append_index(self, entry: Dict):
+        """Record an index update or tombstone."""
+        with open(self._index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
     
     def create_conversation(self, title: str = "New Chat") -> str:
         """Create a new conversation and return its ID."""
         conv_id = str(uuid.uuid4())
         conversation = Conversation(conv_id, title)
-        self.active_conversations[conv_id] = conversation
+        self._remember(conv_id, conversation)
         return conv_id
     
+    def _remember(self, conv_id: str, conversation: 'Conversation') -> 'Conversation':
+        """Make a conversation resident, evicting (and saving) the least recently used."""
+        evicted = []
+        with self._active_lock:
+            resident = self.active_conversations.setdefault(conv_id, conversation)
+            self.active_conversations.move_to_end(conv_id)
+            while len(self.active_conversations) > self.max_active:
+                evicted.append(self.active_conversations.popitem(last=False))
+        for old_id, old_conversation in evicted:
+            self._write(old_id, old_conversation)
+        return resident
+    
     def get_conversation(self, conv_id: str) -> Optional['Conversation']:
         """Get conversation by ID, load from disk if needed."""
-        if conv_id in self.active_conversations:
-            return self.active_conversations[conv_id]
+        with self._active_lock:
+            conversation = self.active_conversations.get(conv_id)
+            if conversation is not None:
+                self.active_conversations.move_to_end(conv_id)
+                return conversation
         
         # Try loading from disk
         conv_file = self.storage_dir / f"{conv_id}.json"
         if conv_file.exists():
             conversation = Conversation.load_from_file(str(conv_file))
-            self.active_conversations[conv_id] = conversation
-            return conversation
+            return self._remember(conv_id, conversation)
         
         return None
     
@@ -40,36 +174,34 @@ class ConversationManager:
         """Save conversation to disk."""
         conversation = self.active_conversations.get(conv_id)
         if conversation:
-            conv_file = self.storage_dir / f"{conv_id}.json"
-            conversation.save_to_file(str(conv_file))
+            self._write(conv_id, conversation)
+    
+    def _write(self, conv_id: str, conversation: 'Conversation'):
+        """Persist a conversation file and its index entry."""
+        conv_file = self.storage_dir / f"{conv_id}.json"
+        conversation.save_to_file(str(conv_file))
+        entry = self._summary(conversation.to_dict())
+        with self._index_lock:
+            self._index[conv_id] = entry
+            self._append_index(entry)
     
     def list_conversations(self, limit: int = 50) -> List[Dict]:
-        """List all conversations (from disk)."""
-        conversations = []
-        for conv_file in sorted(self.storage_dir.glob("*.json"), 
-                               key=lambda x: x.stat().st_mtime, 
-                               reverse=True)[:limit]:
-            try:
-                with open(conv_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    conversations.append({
-                        'id': data['id'],
-                        'title': data['title'],
-                        'created_at': data['created_at'],
-                        'updated_at': data['updated_at'],
-                        'message_count': len(data['messages'])
-                    })
-            except Exception:
-                continue
-        return conversations
+        """List saved conversations, most recently updated first."""
+        with self._index_lock:
+            entries = list(self._index.values())
+        entries.sort(key=itemgetter('updated_at'), reverse=True)
+        return [dict(e) for e in entries[:limit]]
     
     def delete_conversation(self, conv_id: str) -> bool:
         """Delete a conversation."""
         conv_file = self.storage_dir / f"{conv_id}.json"
         if conv_file.exists():
             conv_file.unlink()
-        if conv_id in self.active_conversations:
-            del self.active_conversations[conv_id]
+        with self._index_lock:
+            if self._index.pop(conv_id, None) is not None:
+                self._append_index({'id': conv_id, 'deleted': True})
+        with self._active_lock:
+            self.active_conversations.pop(conv_id, None)
         return True
 
 
@@ -87,6 +219,7 @@ class Conversation:
         self.actor_chunks_cache: Dict[str, List[Dict]] = {}  # {actor_name: chunks}
         self.actors_mentioned: List[str] = []  # [APT28, TA558, ...]
         self.current_actor: Optional[str] = None  # Most recent actor in context
+        self._titled = False  # Set once the title has been taken from the first message
     
     def add_message(self, role: str, content: str, metadata: Optional[Dict] = None):
         """Add a message to the conversation.
@@ -96,19 +229,35 @@ class Conversation:
             content: The message content
             metadata: Optional metadata (evidence, confidence, etc.)
         """
+        now_iso = datetime.now().isoformat()
         message = {
             'role': role,
             'content': content,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso,
             'metadata': metadata or {}
         }
         self.messages.append(message)
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = now_iso
         
+        if self._titled:
+            return
+        self._titled = True
         # Auto-update title from first user message
         if len(self.messages) == 1 and role == 'user':
             self.title = content[:50] + ('...' if len(content) > 50 else '')
     
+    def add_message_raw(self, role: str, content: str, meta_blob: bytes,
+                        metadata: Optional[Dict] = None):
+        """Add a message whose metadata is already orjson-encoded.
+        
+        Args:
+            role: 'user' or 'assistant'
+            content: The message content
+            meta_blob: orjson encoding of the metadata
+            metadata: The decoded metadata, if the caller still has it (skips a parse)
+        """
+        self.add_message(role, content, RawMetadata(meta_blob, metadata))
+    
     def get_context_messages(self, max_messages: int = 10) -> List[Dict]:
         """Get recent messages for context (excluding metadata)."""
         recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
@@ -169,15 +318,23 @@ class Conversation:
         }
     
     def save_to_file(self, filepath: str):
-        """Save conversation to JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        """Save conversation to JSON file (atomically replaced)."""
+        data = self.to_dict()
+        
+        def write(path):
+            if orjson is not None:
+                with open(path, 'wb', buffering=64 * 1024) as f:
+                    f.write(orjson.dumps(data, option=_SAVE_OPTIONS))
+                return
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        
+        _replace_file(filepath, write)
     
     @classmethod
     def load_from_file(cls, filepath: str) -> 'Conversation':
         """Load conversation from JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _read_json(filepath)
         
         conv = cls(data['id'], data['title'])
         conv.messages = data['messages']
@@ -185,5 +342,6 @@ class Conversation:
         conv.updated_at = data['updated_at']
         conv.actors_mentioned = data.get('actors_mentioned', [])
         conv.current_actor = data.get('current_actor')
+        conv._titled = True  # A saved conversation keeps its stored title
         # Note: actor_chunks_cache is NOT persisted (will be re-loaded on demand)
         return conv
@@ -1,9 +1,17 @@
 """Generate embeddings using sentence transformers."""
 
+import atexit
+import hashlib
 import logging
 import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from collections import OrderedDict
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
@@ -12,20 +20,107 @@ logger = logging.getLogger(__name__)
 class LocalEmbedder:
     """Generate vector embeddings using local transformer models."""
     
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", batch_size: int = 32):
+    # Length-sorted batches keep padding low, so GPUs can take much larger ones
+    GPU_BATCH_SIZE = 1024
+    
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", batch_size: int = 32,
+                 cache_size: int = 10_000, cache_dir: Optional[str] = "data/cache",
+                 micro_batch_wait: float = 0.005):
         """
         Initialize embedder.
         
         Args:
             model_name: HuggingFace model identifier
             batch_size: Batch size for embedding generation
+            cache_size: Most embeddings kept in the in-memory LRU (0 disables it)
+            cache_dir: Directory for the per-model cache file loaded at start and
+                written at exit (None keeps the cache in memory only)
+            micro_batch_wait: Seconds embed_text waits for more concurrent callers
+                once others are already queued, so one forward pass serves them
+                all; a lone caller never waits (0 encodes each call directly)
         """
         self.model_name = model_name
         self.batch_size = batch_size
         self.model = None
         self.device = os.getenv("THREATAI_EMBED_DEVICE", "auto")
+        self.precision = os.getenv("THREATAI_EMBED_PRECISION", "auto")  # auto | fp32 | fp16 | bf16
         self._cpu_fallback_attempted = False
+        
+        # Content-addressed LRU: blake2b(text) -> read-only embedding row
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_path = None
+        if cache_dir and cache_size:
+            safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+            self._cache_path = os.path.join(cache_dir, f"embeddings_{safe_name}.npz")
+        
+        # Shared micro-batch queue for concurrent embed_text calls: (text, Future) pairs
+        self.micro_batch_wait = micro_batch_wait
+        self._batch_queue: "queue.Queue" = queue.Queue()
+        self._batch_thread: Optional[threading.Thread] = None
+        self._batch_thread_lock = threading.Lock()
+        
         self._load_model()
+        if self._cache_path:
+            self._load_cache()
+            atexit.register(self.save_cache)
+    
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """Digest used as the cache key for a text."""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+    
+    def _cache_put(self, key: bytes, embedding: np.ndarray) -> np.ndarray:
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        if not self.cache_size:
+            return embedding
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return embedding
+    
+    def _load_cache(self):
+        """Warm the LRU from the cache file written by a previous run."""
+        if not os.path.exists(self._cache_path):
+            return
+        try:
+            with np.load(self._cache_path, allow_pickle=False) as data:
+                keys, vectors = data['keys'], data['vectors']
+            vectors = self._unit_norm(vectors.astype(np.float32))  # files from before normalization
+            for key, vector in zip(keys.tolist()[-self.cache_size:], vectors[-self.cache_size:]):
+                self._cache_put(key, vector)
+            logger.info(f"Loaded {len(self._cache)} cached embeddings from {self._cache_path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self._cache_path}: {e}")
+    
+    def save_cache(self):
+        """Write the LRU to the per-model cache file (oldest first)."""
+        if not self._cache_path:
+            return
+        with self._cache_lock:
+            if not self._cache:
+                return
+            keys = np.array(list(self._cache.keys()), dtype='S16')
+            vectors = np.stack(list(self._cache.values()))
+        try:
+            os.makedirs(os.path.dirname(self._cache_path) or '.', exist_ok=True)
+            tmp_path = self._cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, keys=keys, vectors=vectors)
+            os.replace(tmp_path, self._cache_path)
+        except Exception as e:
+            logger.warning(f"Could not save embedding cache: {e}")
 
     def _is_cuda_compatible(self) -> bool:
         """Best-effort CUDA compatibility check for current torch build and GPU."""
@@ -76,6 +171,39 @@ class LocalEmbedder:
         self.device = "cpu"
         logger.warning("Reloading embedding model on CPU after CUDA runtime error")
         self.model = SentenceTransformer(self.model_name, device="cpu")
+        self._apply_precision()
+    
+    def _apply_precision(self):
+        """
+        Pick weight precision and thread settings for the loaded model's device.
+        
+        On CUDA the model runs in bf16 (compute capability 8.0+) or fp16, which
+        halves weight bandwidth and enables tensor cores; embeddings are cast back
+        to float32 on output. On CPU the model stays fp32 and torch may use every core.
+        """
+        try:
+            import torch
+        except ImportError:
+            return
+        
+        try:
+            device = str(getattr(self.model, 'device', 'cpu'))
+            if not device.startswith('cuda'):
+                torch.set_num_threads(os.cpu_count() or 1)
+                return
+            
+            torch.set_float32_matmul_precision('high')
+            precision = self.precision
+            if precision == 'auto':
+                major, _ = torch.cuda.get_device_capability(self.model.device)
+                precision = 'bf16' if major >= 8 else 'fp16'
+            if precision == 'bf16':
+                self.model = self.model.bfloat16()
+            elif precision == 'fp16':
+                self.model = self.model.half()
+            logger.info("Embedding model precision: %s", precision)
+        except Exception as e:
+            logger.warning("Could not apply embedding precision settings (%s); keeping defaults", e)
     
     def _load_model(self):
         """Load the embedding model."""
@@ -93,6 +221,7 @@ class LocalEmbedder:
                 self.model = SentenceTransformer(self.model_name, device=model_device)
             else:
                 self.model = SentenceTransformer(self.model_name)
+            self._apply_precision()
 
             logger.info(f"Model loaded successfully. Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
         except Exception as e:
@@ -105,13 +234,30 @@ class LocalEmbedder:
             raise RuntimeError("Model not loaded")
 
         try:
-            return self.model.encode(payload, **kwargs)
+            return self._unit_norm(self._as_float32(self.model.encode(payload, **kwargs)))
         except Exception as e:
             if self._is_cuda_runtime_error(e):
                 self._reload_model_on_cpu()
-                return self.model.encode(payload, **kwargs)
+                return self._unit_norm(self._as_float32(self.model.encode(payload, **kwargs)))
             raise
     
+    @staticmethod
+    def _as_float32(embeddings):
+        """Upcast half-precision model output so downstream math runs in float32."""
+        if isinstance(embeddings, np.ndarray) and embeddings.dtype != np.float32:
+            return embeddings.astype(np.float32)
+        return embeddings
+    
+    @staticmethod
+    def _unit_norm(embeddings):
+        """Scale embeddings to unit length so cosine similarity is a plain dot product."""
+        if not isinstance(embeddings, np.ndarray):
+            return embeddings
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        embeddings /= norms
+        return embeddings
+    
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
@@ -122,9 +268,59 @@ class LocalEmbedder:
         Returns:
             Embedding vector
         """
-        embedding = self._encode_with_fallback(text, convert_to_numpy=True)
+        key = self._cache_key(text)
+        embedding = self._cache_get(key)
+        if embedding is None:
+            embedding = self._cache_put(key, self._encode_single(text))
         return embedding
     
+    def _encode_single(self, text: str) -> np.ndarray:
+        """Encode one text, sharing a forward pass with concurrent callers when micro-batching."""
+        if not self.micro_batch_wait:
+            return self._encode_with_fallback(text, convert_to_numpy=True)
+        
+        if self._batch_thread is None or not self._batch_thread.is_alive():
+            with self._batch_thread_lock:
+                if self._batch_thread is None or not self._batch_thread.is_alive():
+                    self._batch_thread = threading.Thread(target=self._batch_loop, daemon=True, name="embed-batcher")
+                    self._batch_thread.start()
+        
+        future: Future = Future()
+        self._batch_queue.put((text, future))
+        return future.result()
+    
+    def _batch_loop(self):
+        """Encode queued texts together, waiting up to micro_batch_wait for more only under concurrency."""
+        while True:
+            items = [self._batch_queue.get()]
+            # Take whatever queued up while the last batch was encoding
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._batch_queue.get_nowait())
+                except queue.Empty:
+                    break
+            # A lone caller is encoded at once; with others already waiting, give
+            # stragglers a short window to join the same forward pass
+            if len(items) > 1:
+                deadline = time.monotonic() + self.micro_batch_wait
+                while len(items) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(self._batch_queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+            
+            try:
+                encoded = self._encode_sorted([text for text, _ in items])
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(items, encoded):
+                future.set_result(embedding)
+    
     def embed_texts(self, texts: List[str]) -> List[np.ndarray]:
         """
         Generate embeddings for multiple texts.
@@ -135,8 +331,39 @@ class LocalEmbedder:
         Returns:
             List of embedding vectors
         """
-        embeddings = self._encode_with_fallback(texts, batch_size=self.batch_size, convert_to_numpy=True)
-        return [emb for emb in embeddings]
+        if not texts:
+            return []
+        
+        keys = [self._cache_key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [self._cache_get(key) for key in keys]
+        misses = [i for i, embedding in enumerate(results) if embedding is None]
+        if misses:
+            # Duplicate texts within one call are encoded once
+            first_of: Dict[bytes, int] = {}
+            unique = [i for i in misses if first_of.setdefault(keys[i], i) == i]
+            encoded = self._encode_sorted([texts[i] for i in unique])
+            for i, embedding in zip(unique, encoded):
+                results[i] = self._cache_put(keys[i], embedding)
+            for i in misses:
+                if results[i] is None:
+                    results[i] = results[first_of[keys[i]]]
+        return results
+    
+    def _encode_sorted(self, texts: List[str]) -> np.ndarray:
+        """Encode shortest-first so each batch pads to a similar length; rows come back in input order."""
+        order = np.argsort(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)), kind='stable')
+        sorted_texts = [texts[i] for i in order]
+        encoded = self._encode_with_fallback(sorted_texts, batch_size=self._encode_batch_size(), convert_to_numpy=True)
+        embeddings = np.empty_like(encoded)
+        embeddings[order] = encoded
+        return embeddings
+    
+    def _encode_batch_size(self) -> int:
+        """Batch size for multi-text encodes: large on GPU, the configured size on CPU."""
+        device = str(getattr(self.model, 'device', 'cpu'))
+        if device.startswith('cuda'):
+            return max(self.batch_size, self.GPU_BATCH_SIZE)
+        return self.batch_size
     
     def embed_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -146,15 +373,17 @@ class LocalEmbedder:
             chunks: List of chunk dictionaries with 'text' field
             
         Returns:
-            Chunks with added 'embedding' field
+            Chunks with added 'embedding' field (float32 ndarray)
         """
         texts = [chunk['text'] for chunk in chunks]
         embeddings = self.embed_texts(texts)
         
+        # Embeddings stay float32 ndarrays; convert with .tolist() only where
+        # a consumer needs plain JSON
         embedded_chunks = []
         for chunk, embedding in zip(chunks, embeddings):
             chunk_copy = chunk.copy()
-            chunk_copy['embedding'] = embedding.tolist()
+            chunk_copy['embedding'] = embedding
             embedded_chunks.append(chunk_copy)
         
         return embedded_chunks
@@ -1,29 +1,172 @@
 """Vector store using Chroma DB for semantic search."""
 
+import atexit
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+import threading
+from typing import List, Dict, Any, Tuple, Optional, Union
 import chromadb
+import numpy as np
 import uuid
 import os
 
 logger = logging.getLogger(__name__)
 
+_WHERE_OPS = {
+    '$eq': lambda a, b: a == b,
+    '$ne': lambda a, b: a != b,
+    '$in': lambda a, b: a in b,
+    '$nin': lambda a, b: a not in b,
+    '$gt': lambda a, b: a is not None and a > b,
+    '$gte': lambda a, b: a is not None and a >= b,
+    '$lt': lambda a, b: a is not None and a < b,
+    '$lte': lambda a, b: a is not None and a <= b,
+}
+
+
+def _match_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Chroma-style where clause against one stored metadata dict.
+    
+    Args:
+        metadata: Flattened Chroma metadata for a chunk
+        where: Filter such as {"actor_name": "APT28"} or {"$and": [...]}
+        
+    Returns:
+        True if the metadata satisfies every condition
+        
+    Raises:
+        ValueError: For operators the in-memory index does not implement
+    """
+    for key, cond in where.items():
+        if key == '$and':
+            if not all(_match_where(metadata, sub) for sub in cond):
+                return False
+        elif key == '$or':
+            if not any(_match_where(metadata, sub) for sub in cond):
+                return False
+        elif key.startswith('$'):
+            raise ValueError(f"Unsupported where operator: {key}")
+        elif isinstance(cond, dict):
+            value = metadata.get(key)
+            for op, operand in cond.items():
+                fn = _WHERE_OPS.get(op)
+                if fn is None:
+                    raise ValueError(f"Unsupported where operator: {op}")
+                if not fn(value, operand):
+                    return False
+        elif metadata.get(key) != cond:
+            return False
+    return True
+
+
+# Chunk metadata copied to Chroma as-is, and list fields stored comma-joined
+# (Chroma doesn't support lists in metadata), in stored key order
+_SCALAR_FIELDS = ('actor_name', 'primary_name', 'source_system', 'last_activity', 'country_primary')
+_LIST_FIELDS = (
+    'aliases', 'countries', 'attack_methods', 'target_sectors', 'tactics', 'observed_sectors',
+    'observed_countries', 'information_sources', 'source_ids', 'related_actors',
+)
+
+
+def _chroma_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a chunk's metadata into the filterable form stored in Chroma."""
+    meta = chunk['metadata']
+    metadata = {
+        'actor_id': chunk.get('actor_id', ''),
+        'source_field': meta.get('source_field', ''),
+        'chunk_type': meta.get('chunk_type', ''),
+        'chunk_index': str(meta.get('chunk_index', 0)),
+    }
+    metadata.update((field, meta.get(field, '')) for field in _SCALAR_FIELDS)
+    if 'name_giver' in meta:
+        metadata['name_giver'] = meta['name_giver']
+    for field in _LIST_FIELDS:
+        values = meta.get(field)
+        if values:
+            metadata[field] = ','.join(str(v) for v in values if v)
+    return metadata
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    """Rebuild a list stored as a comma-separated metadata string."""
+    if not value:
+        return []
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _chunk_from_record(chunk_id: str, document: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the chunk dict the retriever expects from a stored Chroma record."""
+    chunk = {
+        'chunk_id': chunk_id,
+        'actor_id': metadata.get('actor_id', ''),
+        'text': document,
+        'metadata': {
+            'source_field': metadata.get('source_field', ''),
+            'chunk_type': metadata.get('chunk_type', ''),
+            'chunk_index': int(metadata.get('chunk_index', 0)),
+            'actor_name': metadata.get('actor_name', ''),
+            'primary_name': metadata.get('primary_name', ''),
+            'aliases': _split_list(metadata.get('aliases')),
+            'countries': _split_list(metadata.get('countries')),
+            'information_sources': _split_list(metadata.get('information_sources')),
+            'source_ids': _split_list(metadata.get('source_ids', '')),
+            'related_actors': _split_list(metadata.get('related_actors')),
+            'source_system': metadata.get('source_system', ''),
+            'last_activity': metadata.get('last_activity', ''),
+            'country_primary': metadata.get('country_primary', '')
+        }
+    }
+    
+    # Add name_giver if present
+    if 'name_giver' in metadata:
+        chunk['metadata']['name_giver'] = metadata['name_giver']
+    
+    for list_field in ('attack_methods', 'target_sectors', 'tactics', 'observed_sectors', 'observed_countries'):
+        if metadata.get(list_field):
+            chunk['metadata'][list_field] = _split_list(metadata[list_field])
+    
+    return chunk
+
 
 class VectorStore:
     """Vector store using Chroma DB for persistent vector storage."""
     
-    def __init__(self, dimension: int = 384, persist_directory: str = "data/chroma_db"):
+    QUANTIZE_MODES = ("int8", "none")
+    
+    def __init__(self, dimension: int = 384, persist_directory: str = "data/chroma_db",
+                 flat_search_max: int = 200000, quantize: str = "int8"):
         """
         Initialize vector store with Chroma DB.
         
         Args:
             dimension: Embedding dimension (384 for MiniLM)
             persist_directory: Path to persistent storage
+            flat_search_max: Largest collection searched with the in-memory
+                matrix; bigger collections go through Chroma's HNSW index
+            quantize: "int8" keeps the in-memory index and its sidecar file as
+                int8 rows with a per-row scale (4x smaller); "none" keeps float32
         """
+        if quantize not in self.QUANTIZE_MODES:
+            raise ValueError(f"quantize must be one of {self.QUANTIZE_MODES}, got {quantize!r}")
         self.dimension = dimension
         self.persist_directory = persist_directory
+        self.flat_search_max = flat_search_max
+        self.quantize = quantize
         self.collection = None
+        self._sidecar_path = os.path.join(persist_directory, f"flat_index_{quantize}.npz")
+        
+        # In-memory copy of the collection for exact cosine search:
+        # (unit-norm rows, per-row scales or None, ids, documents, metadatas), swapped as one tuple
+        self._flat: Optional[Tuple[np.ndarray, Optional[np.ndarray], List[str], List[str], List[Dict[str, Any]]]] = None
+        self._flat_rows: Dict[str, int] = {}
+        self._flat_disabled = False
+        self._flat_lock = threading.Lock()
+        # Set when upserts changed the in-memory index after the sidecar was written;
+        # the sidecar is saved once by save_index() (also at exit), not per batch
+        self._flat_dirty = False
+        
         self._initialize_chroma()
+        atexit.register(self.save_index)
     
     def _initialize_chroma(self):
         """Initialize Chroma DB client and collection."""
@@ -34,10 +177,11 @@ class VectorStore:
             # Create persistent Chroma client using new API
             client = chromadb.PersistentClient(path=self.persist_directory)
             
-            # Create or get collection
+            # Embeddings arrive unit-norm, so inner product equals cosine; both spaces
+            # report distance as 1 - cos, so existing cosine collections score the same
             self.collection = client.get_or_create_collection(
                 name="threat_actors",
-                metadata={"hnsw:space": "cosine"}
+                metadata={"hnsw:space": "ip"}
             )
             
             logger.info(f"Initialized Chroma DB collection with persist directory: {self.persist_directory}")
@@ -50,7 +194,7 @@ class VectorStore:
         Add chunks with embeddings to store.
         
         Args:
-            chunks: List of chunks with 'embedding' field
+            chunks: List of chunks with 'embedding' field (ndarray or list of floats)
             
         Returns:
             Number of chunks added
@@ -59,93 +203,29 @@ class VectorStore:
             return 0
         
         try:
-            # Prepare data for Chroma
-            ids = []
-            embeddings = []
-            metadatas = []
-            documents = []
+            # Prepare data for Chroma in one pass per column
+            missing = [chunk for chunk in chunks if 'embedding' not in chunk]
+            for chunk in missing:
+                logger.warning(f"Chunk {chunk.get('chunk_id')} missing embedding")
+            if missing:
+                chunks = [chunk for chunk in chunks if 'embedding' in chunk]
             
-            for chunk in chunks:
-                if 'embedding' not in chunk:
-                    logger.warning(f"Chunk {chunk.get('chunk_id')} missing embedding")
-                    continue
-                
-                chunk_id = chunk.get('chunk_id', str(uuid.uuid4()))
-                ids.append(chunk_id)
-                embeddings.append(chunk['embedding'])
-                documents.append(chunk['text'])
-                
-                # Store comprehensive metadata for filtering
-                metadata = {
-                    'actor_id': chunk.get('actor_id', ''),
-                    'source_field': chunk['metadata'].get('source_field', ''),
-                    'chunk_type': chunk['metadata'].get('chunk_type', ''),
-                    'chunk_index': str(chunk['metadata'].get('chunk_index', 0)),
-                    'actor_name': chunk['metadata'].get('actor_name', ''),
-                    'primary_name': chunk['metadata'].get('primary_name', ''),
-                    'source_system': chunk['metadata'].get('source_system', ''),
-                    'last_activity': chunk['metadata'].get('last_activity', ''),
-                    'country_primary': chunk['metadata'].get('country_primary', ''),
-                }
-                
-                # Add name_giver if present
-                if 'name_giver' in chunk['metadata']:
-                    metadata['name_giver'] = chunk['metadata']['name_giver']
-                
-                # Store aliases as comma-separated string (Chroma doesn't support lists in metadata)
-                aliases = chunk['metadata'].get('aliases', [])
-                if aliases:
-                    metadata['aliases'] = ','.join(str(a) for a in aliases if a)
-                
-                # Store countries
-                countries = chunk['metadata'].get('countries', [])
-                if countries:
-                    metadata['countries'] = ','.join(str(c) for c in countries if c)
-
-                attack_methods = chunk['metadata'].get('attack_methods', [])
-                if attack_methods:
-                    metadata['attack_methods'] = ','.join(str(m) for m in attack_methods if m)
-
-                target_sectors = chunk['metadata'].get('target_sectors', [])
-                if target_sectors:
-                    metadata['target_sectors'] = ','.join(str(s) for s in target_sectors if s)
-
-                tactics = chunk['metadata'].get('tactics', [])
-                if tactics:
-                    metadata['tactics'] = ','.join(str(t) for t in tactics if t)
-
-                observed_sectors = chunk['metadata'].get('observed_sectors', [])
-                if observed_sectors:
-                    metadata['observed_sectors'] = ','.join(str(s) for s in observed_sectors if s)
-
-                observed_countries = chunk['metadata'].get('observed_countries', [])
-                if observed_countries:
-                    metadata['observed_countries'] = ','.join(str(c) for c in observed_countries if c)
-                
-                # Store information_sources
-                info_sources = chunk['metadata'].get('information_sources', [])
-                if info_sources:
-                    metadata['information_sources'] = ','.join(str(s) for s in info_sources if s)
-
-                source_ids = chunk['metadata'].get('source_ids', [])
-                if source_ids:
-                    metadata['source_ids'] = ','.join(str(s) for s in source_ids if s)
-                
-                # Store related_actors
-                related_actors = chunk['metadata'].get('related_actors', [])
-                if related_actors:
-                    metadata['related_actors'] = ','.join(str(r) for r in related_actors if r)
-                
-                metadatas.append(metadata)
+            ids = [chunk.get('chunk_id') or str(uuid.uuid4()) for chunk in chunks]
+            embeddings = [chunk['embedding'] for chunk in chunks]
+            documents = [chunk['text'] for chunk in chunks]
+            metadatas = [_chroma_metadata(chunk) for chunk in chunks]
             
-            # Add to collection
+            # Upsert so re-ingesting unchanged (content-addressed) chunks is idempotent
             if ids:
-                self.collection.add(
+                # One contiguous (N, dim) float32 array; Chroma's list-of-lists form is built once from it
+                matrix = np.stack([np.asarray(e, dtype=np.float32) for e in embeddings])
+                self.collection.upsert(
                     ids=ids,
-                    embeddings=embeddings,
+                    embeddings=matrix.tolist(),
                     documents=documents,
                     metadatas=metadatas
                 )
+                self._flat_upsert(ids, matrix, documents, metadatas)
                 logger.info(f"Added {len(ids)} chunks to Chroma DB vector store")
                 return len(ids)
             
@@ -154,23 +234,279 @@ class VectorStore:
             logger.error(f"Error adding chunks to vector store: {e}")
             raise
     
-    def search(self, query_embedding: List[float], k: int = 5, where: Optional[Dict[str, Any]] = None) -> List[Tuple[Dict[str, Any], float]]:
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length (zero rows stay zero)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    @staticmethod
+    def _quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric int8 quantization with one float32 scale per row."""
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    
+    def _encode_rows(self, embeddings: Any, n: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Normalize raw embeddings and convert them to the configured storage format."""
+        rows = np.asarray(embeddings, dtype=np.float32)
+        rows = self._normalize_rows(rows.reshape(n, -1) if n else rows.reshape(0, self.dimension))
+        if self.quantize == "int8":
+            return self._quantize_rows(rows)
+        return rows, None
+    
+    def _save_sidecar(self, matrix: np.ndarray, scales: Optional[np.ndarray], ids: List[str]):
+        """Persist the in-memory rows next to the Chroma files (atomic replace)."""
+        tmp_path = self._sidecar_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, matrix=matrix, scales=scales if scales is not None else np.empty(0, np.float32),
+                         ids=np.asarray(ids, dtype=str))
+            os.replace(tmp_path, self._sidecar_path)
+            # A sidecar in another storage mode no longer matches the collection
+            self._remove_sidecars(keep=self._sidecar_path)
+        except Exception as e:
+            logger.warning(f"Could not write embedding sidecar: {e}")
+    
+    def _remove_sidecars(self, keep: Optional[str] = None):
+        """Delete persisted flat-index files (except keep)."""
+        for mode in self.QUANTIZE_MODES:
+            path = os.path.join(self.persist_directory, f"flat_index_{mode}.npz")
+            if path != keep and os.path.exists(path):
+                os.remove(path)
+    
+    def _load_sidecar(self, expected_count: int) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], List[str]]]:
+        """Load persisted rows if the sidecar matches the collection size."""
+        if not os.path.exists(self._sidecar_path):
+            return None
+        try:
+            with np.load(self._sidecar_path, allow_pickle=False) as data:
+                ids = data['ids'].tolist()
+                if len(ids) != expected_count:
+                    return None
+                scales = data['scales'] if self.quantize == "int8" else None
+                return data['matrix'], scales, ids
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding sidecar: {e}")
+            return None
+    
+    def _load_flat_index(self):
+        """Pull every stored embedding into memory once (no-op if already loaded or too large)."""
+        if self._flat is not None or self._flat_disabled:
+            return
+        with self._flat_lock:
+            if self._flat is not None or self._flat_disabled:
+                return
+            try:
+                count = self.collection.count()
+                if count > self.flat_search_max:
+                    logger.info(f"Collection has {count} chunks; using Chroma HNSW search")
+                    self._flat_disabled = True
+                    return
+                
+                sidecar = self._load_sidecar(count) if count else None
+                include = ["documents", "metadatas"] if sidecar else ["embeddings", "documents", "metadatas"]
+                records = self.collection.get(include=include) if count else {}
+                ids = list(records.get('ids') or [])
+                documents = list(records.get('documents') or [])
+                metadatas = [m or {} for m in (records.get('metadatas') or [])]
+                
+                if sidecar is not None and set(sidecar[2]) == set(ids):
+                    matrix, scales, ids_order = sidecar
+                    by_id = {chunk_id: i for i, chunk_id in enumerate(ids)}
+                    documents = [documents[by_id[chunk_id]] for chunk_id in ids_order]
+                    metadatas = [metadatas[by_id[chunk_id]] for chunk_id in ids_order]
+                    ids = ids_order
+                else:
+                    if sidecar is not None:
+                        records = self.collection.get(include=["embeddings", "documents", "metadatas"])
+                        ids = list(records.get('ids') or [])
+                        documents = list(records.get('documents') or [])
+                        metadatas = [m or {} for m in (records.get('metadatas') or [])]
+                    embeddings = records.get('embeddings')
+                    if ids and embeddings is not None:
+                        matrix, scales = self._encode_rows(embeddings, len(ids))
+                    else:
+                        matrix, scales = self._encode_rows(np.empty((0, self.dimension)), 0)
+                    if ids:
+                        self._save_sidecar(matrix, scales, ids)
+                
+                self._flat = (matrix, scales, ids, documents, metadatas)
+                self._flat_rows = {chunk_id: row for row, chunk_id in enumerate(ids)}
+                logger.info(f"Loaded {len(ids)} embeddings into the in-memory search index ({self.quantize})")
+            except Exception as e:
+                logger.warning(f"Could not build in-memory index, using Chroma search: {e}")
+                self._flat_disabled = True
+    
+    def _flat_upsert(self, ids: List[str], embeddings: List[Any], documents: List[str],
+                     metadatas: List[Dict[str, Any]]):
+        """Mirror an upsert into the in-memory index if it has been loaded (sidecar saved by save_index)."""
+        if self._flat is None:
+            # A sidecar on disk would miss these rows; the next load re-reads Chroma
+            self._remove_sidecars()
+            return
+        with self._flat_lock:
+            matrix, scales, flat_ids, flat_docs, flat_metas = self._flat
+            matrix = matrix.copy()
+            scales = scales.copy() if scales is not None else None
+            flat_ids, flat_docs, flat_metas = list(flat_ids), list(flat_docs), list(flat_metas)
+            rows, row_scales = self._encode_rows(embeddings, len(ids))
+            new_idx = []
+            for i, chunk_id in enumerate(ids):
+                row = self._flat_rows.get(chunk_id)
+                if row is None:
+                    self._flat_rows[chunk_id] = len(flat_ids)
+                    flat_ids.append(chunk_id)
+                    flat_docs.append(documents[i])
+                    flat_metas.append(metadatas[i])
+                    new_idx.append(i)
+                else:
+                    matrix[row] = rows[i]
+                    if scales is not None:
+                        scales[row] = row_scales[i]
+                    flat_docs[row] = documents[i]
+                    flat_metas[row] = metadatas[i]
+            if new_idx:
+                matrix = np.concatenate([matrix.reshape(-1, rows.shape[1]), rows[new_idx]])
+                if scales is not None:
+                    scales = np.concatenate([scales, row_scales[new_idx]])
+            if len(flat_ids) > self.flat_search_max:
+                self._flat = None
+                self._flat_rows = {}
+                self._flat_disabled = True
+                self._flat_dirty = False
+                return
+            self._flat = (matrix, scales, flat_ids, flat_docs, flat_metas)
+            if not self._flat_dirty:
+                # Until save_index() runs the old sidecar is stale; remove it so a
+                # crash makes the next load rebuild from Chroma instead
+                self._remove_sidecars()
+                self._flat_dirty = True
+    
+    def save_index(self):
+        """Write the in-memory index sidecar if upserts have changed it since the last save."""
+        with self._flat_lock:
+            if not self._flat_dirty or self._flat is None:
+                return
+            matrix, scales, ids, _, _ = self._flat
+            self._save_sidecar(matrix, scales, ids)
+            self._flat_dirty = False
+    
+    def _flat_search(self, query_embeddings: Any, k: int,
+                     where: Optional[Dict[str, Any]]) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Exact cosine top-k over the in-memory matrix for one or more queries.
+        
+        All queries are scored with a single matrix product.
+        
+        Raises:
+            ValueError: If the where clause uses an unsupported operator
+        """
+        matrix, scales, ids, documents, metadatas = self._flat
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        n_queries = len(queries)
+        if not ids or k <= 0 or not n_queries:
+            return [[] for _ in range(n_queries)]
+        
+        queries, query_scales = self._encode_rows(queries, n_queries)
+        
+        if where:
+            candidates = np.fromiter((_match_where(m, where) for m in metadatas), dtype=bool, count=len(metadatas))
+            candidates = np.flatnonzero(candidates)
+            if not len(candidates):
+                return [[] for _ in range(n_queries)]
+            rows = matrix[candidates]
+            row_scales = scales[candidates] if scales is not None else None
+        else:
+            candidates = None
+            rows = matrix
+            row_scales = scales
+        
+        if row_scales is not None:
+            # int8 dot products accumulated in int32, then rescaled to cosine
+            sims = np.einsum('bj,ij->bi', queries, rows, dtype=np.int32).astype(np.float32)
+            sims *= query_scales[:, None] * row_scales[None, :]
+        else:
+            sims = queries @ rows.T
+        
+        n_rows = sims.shape[1]
+        if k < n_rows:
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+        else:
+            top = np.argsort(-sims, axis=1, kind='stable')
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        result_rows = candidates[top] if candidates is not None else top
+        
+        # Same 0-1 scale as the Chroma path: cosine distance d = 1 - cos, similarity = 1 - d/2
+        scores = np.clip((1.0 + top_sims) / 2.0, 0.0, 1.0)
+        return [
+            [
+                (_chunk_from_record(ids[row], documents[row], metadatas[row]), float(score))
+                for row, score in zip(query_rows, query_scores)
+            ]
+            for query_rows, query_scores in zip(result_rows.tolist(), scores.tolist())
+        ]
+    
+    def search(self, query_embedding: Union[List[float], np.ndarray], k: int = 5,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[Dict[str, Any], float]]:
         """
         Search for similar chunks with optional metadata filtering.
         
+        Collections up to flat_search_max chunks are searched exactly with one
+        matrix-vector product in memory; larger ones, or filters the in-memory
+        matcher does not support, go through Chroma.
+        
         Args:
-            query_embedding: Query embedding vector
+            query_embedding: Query embedding vector (list or 1-D array)
             k: Number of results to return
             where: Optional metadata filter (e.g., {"actor_name": "APT28"})
             
         Returns:
             List of (chunk, similarity) tuples
         """
+        queries = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        return self.search_batch(queries, k=k, where=where)[0]
+    
+    def search_batch(self, query_embeddings: Union[List[List[float]], np.ndarray], k: int = 5,
+                     where: Optional[Dict[str, Any]] = None) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Search for several query embeddings in one pass.
+        
+        The in-memory path scores every query with one matrix product; the
+        Chroma path issues a single query call with all embeddings.
+        
+        Args:
+            query_embeddings: Query embedding vectors (lists or a 2-D array)
+            k: Number of results per query
+            where: Optional metadata filter applied to every query
+            
+        Returns:
+            One list of (chunk, similarity) tuples per query, in input order
+        """
+        if len(query_embeddings) == 0:
+            return []
+        
+        self._load_flat_index()
+        if self._flat is not None:
+            try:
+                return self._flat_search(query_embeddings, k, where)
+            except ValueError as e:
+                logger.debug(f"Falling back to Chroma search: {e}")
+            except Exception as e:
+                logger.error(f"Error searching vector store: {e}")
+                return [[] for _ in query_embeddings]
+        
         try:
+            # Chroma wants plain lists; convert the whole batch in one C-level pass
             query_params = {
-                'query_embeddings': [query_embedding],
+                'query_embeddings': np.asarray(query_embeddings, dtype=np.float32).tolist(),
                 'n_results': k,
-                'include': ["embeddings", "documents", "metadatas", "distances"]
+                'include': ["documents", "metadatas", "distances"]
             }
             
             # Add metadata filter if provided
@@ -180,97 +516,25 @@ class VectorStore:
             results = self.collection.query(**query_params)
             
             if not results or not results['ids'] or len(results['ids']) == 0:
-                return []
+                return [[] for _ in query_embeddings]
             
             # Convert Chroma results to our format
-            matches = []
-            for idx, (chunk_id, document, metadata, distance) in enumerate(
-                zip(
-                    results['ids'][0],
-                    results['documents'][0],
-                    results['metadatas'][0],
-                    results['distances'][0]
-                )
+            batches = []
+            for ids, documents, metadatas, distances in zip(
+                results['ids'],
+                results['documents'],
+                results['metadatas'],
+                results['distances']
             ):
-                # Chroma returns cosine distance (0-2), convert to similarity (0-1)
-                similarity = 1 - (distance / 2)
-                
-                # Reconstruct aliases list from comma-separated string
-                aliases = []
-                if metadata.get('aliases'):
-                    aliases = [a.strip() for a in metadata['aliases'].split(',') if a.strip()]
-                
-                # Reconstruct countries list
-                countries = []
-                if metadata.get('countries'):
-                    countries = [c.strip() for c in metadata['countries'].split(',') if c.strip()]
-                
-                # Reconstruct information_sources list
-                info_sources = []
-                if metadata.get('information_sources'):
-                    info_sources = [s.strip() for s in metadata['information_sources'].split(',') if s.strip()]
-                
-                # Reconstruct related_actors list
-                related_actors = []
-                if metadata.get('related_actors'):
-                    related_actors = [r.strip() for r in metadata['related_actors'].split(',') if r.strip()]
-                
-                chunk = {
-                    'chunk_id': chunk_id,
-                    'actor_id': metadata.get('actor_id', ''),
-                    'text': document,
-                    'metadata': {
-                        'source_field': metadata.get('source_field', ''),
-                        'chunk_type': metadata.get('chunk_type', ''),
-                        'chunk_index': int(metadata.get('chunk_index', 0)),
-                        'actor_name': metadata.get('actor_name', ''),
-                        'primary_name': metadata.get('primary_name', ''),
-                        'aliases': aliases,
-                        'countries': countries,
-                        'information_sources': info_sources,
-                        'source_ids': [s.strip() for s in metadata.get('source_ids', '').split(',') if s.strip()],
-                        'related_actors': related_actors,
-                        'source_system': metadata.get('source_system', ''),
-                        'last_activity': metadata.get('last_activity', ''),
-                        'country_primary': metadata.get('country_primary', '')
-                    }
-                }
-                
-                # Add name_giver if present
-                if 'name_giver' in metadata:
-                    chunk['metadata']['name_giver'] = metadata['name_giver']
-
-                if metadata.get('attack_methods'):
-                    chunk['metadata']['attack_methods'] = [
-                        m.strip() for m in metadata['attack_methods'].split(',') if m.strip()
-                    ]
-
-                if metadata.get('target_sectors'):
-                    chunk['metadata']['target_sectors'] = [
-                        s.strip() for s in metadata['target_sectors'].split(',') if s.strip()
-                    ]
-
-                if metadata.get('tactics'):
-                    chunk['metadata']['tactics'] = [
-                        t.strip() for t in metadata['tactics'].split(',') if t.strip()
-                    ]
-
-                if metadata.get('observed_sectors'):
-                    chunk['metadata']['observed_sectors'] = [
-                        s.strip() for s in metadata['observed_sectors'].split(',') if s.strip()
-                    ]
-
-                if metadata.get('observed_countries'):
-                    chunk['metadata']['observed_countries'] = [
-                        c.strip() for c in metadata['observed_countries'].split(',') if c.strip()
-                    ]
-                
-                matches.append((chunk, similarity))
-            
-            return matches
+                # Chroma returns 1 - cos (0-2) for both ip and cosine spaces, convert to similarity (0-1)
+                batches.append([
+                    (_chunk_from_record(chunk_id, document, metadata), 1 - (distance / 2))
+                    for chunk_id, document, metadata, distance in zip(ids, documents, metadatas, distances)
+                ])
+            return batches
         except Exception as e:
             logger.error(f"Error searching vector store: {e}")
-            return []
+            return [[] for _ in query_embeddings]
     
     def get_size(self) -> int:
         """Get number of chunks in store."""
@@ -286,6 +550,12 @@ class VectorStore:
         try:
             client = chromadb.PersistentClient(path=self.persist_directory)
             client.delete_collection("threat_actors")
+            with self._flat_lock:
+                self._flat = None
+                self._flat_rows = {}
+                self._flat_disabled = False
+                self._flat_dirty = False
+            self._remove_sidecars()
             logger.info("Deleted Chroma DB collection")
         except Exception as e:
             logger.warning(f"Could not delete collection: {e}")
@@ -1,27 +1,168 @@
 """Audit trails and traceability."""
 
+import atexit
+import hashlib
 import logging
 import json
+import queue
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uuid
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize one audit entry as a JSONL line."""
+    if orjson is not None:
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry) + '\n').encode('utf-8')
+
+
 class AuditTrail:
     """Maintain audit trail for traceability."""
     
-    def __init__(self, audit_log_path: str = "logs/audit.jsonl"):
+    # Most entries the background writer appends per write call
+    WRITE_BATCH_SIZE = 32
+    # Longest buffered entries may sit before reaching the OS under steady load
+    FLUSH_INTERVAL_SECONDS = 1.0
+    # Leading log bytes hashed into the saved index to recognise the same file
+    INDEX_HEAD_BYTES = 4096
+    
+    def __init__(self, audit_log_path: str = "logs/audit.jsonl", async_writes: bool = True):
         """
         Initialize audit trail.
         
         Args:
             audit_log_path: Path to audit log file
+            async_writes: Append entries from a background thread instead of the caller
         """
         self.audit_log_path = Path(audit_log_path)
         self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One buffered append handle for the life of the trail instead of open/write/close per entry
+        self._fh = open(self.audit_log_path, 'ab', buffering=64 * 1024)
+        self._fh_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+
+        # trace_id -> byte offsets of its lines; built lazily on the first lookup
+        self._index_path = self.audit_log_path.with_suffix(self.audit_log_path.suffix + '.idx')
+        self._offsets: Optional[Dict[str, List[int]]] = None
+
+        self.async_writes = bool(async_writes)
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if self.async_writes:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._drain, daemon=True, name="audit-writer")
+            self._writer.start()
+
+    def _drain(self) -> None:
+        """Write queued entries in batches until the process exits."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._append_entries(batch)
+                # Push buffered lines to the OS once the queue goes idle
+                if self._queue.empty():
+                    self._flush_file()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _flush_file(self) -> None:
+        with self._fh_lock:
+            if not self._fh.closed:
+                self._fh.flush()
+            self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Block until every queued entry has been written to the log file."""
+        if self._queue is not None:
+            self._queue.join()
+        self._flush_file()
+
+    def close(self) -> None:
+        """Flush pending entries, save the trace index and release the log file handle."""
+        try:
+            self.flush()
+        finally:
+            with self._fh_lock:
+                if not self._fh.closed:
+                    self._save_index()
+                    self._fh.close()
+
+    def _load_index(self, use_saved: bool = True) -> None:
+        """
+        Build the trace_id offset index (caller holds _fh_lock, file flushed).
+        
+        Starts from the saved .idx sidecar when it still describes a prefix of
+        the log and scans only the bytes appended since; otherwise (or with
+        use_saved=False) rescans the whole file.
+        """
+        offsets: Dict[str, List[int]] = {}
+        start = 0
+        size = self.audit_log_path.stat().st_size if self.audit_log_path.exists() else 0
+        if use_saved and self._index_path.exists():
+            try:
+                saved = json.loads(self._index_path.read_text(encoding='utf-8'))
+                # The head digest catches a rotated or rewritten log that has since
+                # grown past the saved size
+                if (0 <= saved.get('size', -1) <= size and
+                        saved.get('head') == self._head_digest(saved['size'])):
+                    offsets = {k: list(v) for k, v in saved.get('offsets', {}).items()}
+                    start = saved['size']
+            except Exception as e:
+                logger.warning(f"Rebuilding unreadable audit index: {e}")
+                offsets, start = {}, 0
+        
+        if start < size:
+            with open(self.audit_log_path, 'rb') as f:
+                f.seek(start)
+                pos = start
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        entry = None
+                    trace_id = entry.get('trace_id') if isinstance(entry, dict) else None
+                    if trace_id:
+                        offsets.setdefault(trace_id, []).append(pos)
+                    pos += len(line)
+        self._offsets = offsets
+
+    def _head_digest(self, size: int) -> str:
+        """Digest of the log's first bytes (up to 4 KB, within size) identifying this file."""
+        with open(self.audit_log_path, 'rb') as f:
+            return hashlib.blake2b(f.read(min(size, self.INDEX_HEAD_BYTES)), digest_size=16).hexdigest()
+    
+    def _save_index(self) -> None:
+        """Persist the offset index next to the log (caller holds _fh_lock)."""
+        if self._offsets is None:
+            return
+        try:
+            self._fh.flush()
+            size = self._fh.tell()
+            payload = {'size': size, 'head': self._head_digest(size), 'offsets': self._offsets}
+            tmp_path = self._index_path.with_suffix(self._index_path.suffix + '.tmp')
+            tmp_path.write_text(json.dumps(payload), encoding='utf-8')
+            tmp_path.replace(self._index_path)
+        except Exception as e:
+            logger.warning(f"Could not save audit index: {e}")
     
     def log_query(self, query: str, query_type: str, evidence: List[Dict[str, Any]]) -> str:
         """
@@ -90,10 +231,30 @@ class AuditTrail:
         self._write_audit_log(log_entry)
     
     def _write_audit_log(self, entry: Dict[str, Any]) -> None:
-        """Write entry to audit log."""
+        """Write entry to audit log (queued when async_writes is enabled)."""
+        if self._queue is not None:
+            self._queue.put(entry)
+        else:
+            self._append_entries([entry])
+
+    def _append_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries to the buffered audit log with a single write."""
+        if not entries:
+            return
         try:
-            with open(self.audit_log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry) + '\n')
+            lines = list(map(_dumps_line, entries))
+            with self._fh_lock:
+                if self._offsets is not None:
+                    pos = self._fh.tell()
+                    for entry, line in zip(entries, lines):
+                        trace_id = entry.get('trace_id')
+                        if trace_id:
+                            self._offsets.setdefault(trace_id, []).append(pos)
+                        pos += len(line)
+                self._fh.write(b''.join(lines))
+                if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_SECONDS:
+                    self._fh.flush()
+                    self._last_flush = time.monotonic()
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
     
@@ -108,14 +269,38 @@ class AuditTrail:
             List of events for the trace
         """
         events = []
+        self.flush()
         try:
-            if self.audit_log_path.exists():
-                with open(self.audit_log_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        entry = json.loads(line)
-                        if entry.get('trace_id') == trace_id:
-                            events.append(entry)
+            with self._fh_lock:
+                if self._offsets is None:
+                    self._load_index()
+                trace_offsets = list(self._offsets.get(trace_id, ()))
+            events = self._read_trace(trace_id, trace_offsets)
+            if events is None:
+                # An offset pointed at another trace's line (e.g. the log was rotated
+                # or truncated after the index was saved); rescan the whole file
+                logger.warning("Audit index is stale; rebuilding it from the log")
+                with self._fh_lock:
+                    self._load_index(use_saved=False)
+                    trace_offsets = list(self._offsets.get(trace_id, ()))
+                events = self._read_trace(trace_id, trace_offsets) or []
         except Exception as e:
             logger.error(f"Failed to retrieve trace: {e}")
         
         return events
+    
+    def _read_trace(self, trace_id: str, trace_offsets: List[int]) -> Optional[List[Dict[str, Any]]]:
+        """Read the lines at trace_offsets, or return None if any is not an event of trace_id."""
+        events = []
+        if trace_offsets:
+            with open(self.audit_log_path, 'rb') as f:
+                for off in trace_offsets:
+                    f.seek(off)
+                    try:
+                        entry = json.loads(f.readline())
+                    except ValueError:
+                        return None
+                    if not isinstance(entry, dict) or entry.get('trace_id') != trace_id:
+                        return None
+                    events.append(entry)
+        return events
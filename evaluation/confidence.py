@@ -3,6 +3,8 @@
 import logging
 from typing import Dict, Any, List
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,14 +79,18 @@ class ConfidenceCalculator:
                 'quality_score': 0.0,
             }
         
-        similarities = [chunk.get('similarity_score', 0.5) for chunk in evidence]
+        similarities = np.fromiter(
+            (chunk.get('similarity_score', 0.5) for chunk in evidence),
+            dtype=np.float64,
+            count=len(evidence),
+        )
         
-        avg_similarity = sum(similarities) / len(similarities)
-        min_similarity = min(similarities)
-        max_similarity = max(similarities)
+        avg_similarity = float(similarities.mean())
+        min_similarity = float(similarities.min())
+        max_similarity = float(similarities.max())
         
         # Quality score based on consistency of similarity scores
-        variance = sum((s - avg_similarity) ** 2 for s in similarities) / len(similarities)
+        variance = float(similarities.var())
         consistency = 1.0 / (1.0 + variance)
         
         quality_score = (avg_similarity * 0.7) + (consistency * 0.3)
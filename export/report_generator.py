@@ -4,8 +4,9 @@ import csv
 import html
 import io
 import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, BinaryIO
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -16,6 +17,162 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Styles are immutable once built, so they are shared by every report
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#0f172a'),
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_COMPANY_STYLE = ParagraphStyle(
+    'CompanyTitle',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#0f172a'),
+    spaceAfter=6,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#1f2937'),
+    spaceAfter=12,
+    spaceBefore=12,
+    fontName='Helvetica-Bold'
+)
+
+_SUBHEADING_STYLE = ParagraphStyle(
+    'SubHeading',
+    parent=_STYLES['Heading3'],
+    fontSize=12,
+    textColor=colors.HexColor('#1f2937'),
+    spaceAfter=8,
+    spaceBefore=12,
+    fontName='Helvetica-Bold'
+)
+
+_BODY_STYLE = ParagraphStyle(
+    'CustomBody',
+    parent=_STYLES['BodyText'],
+    fontSize=10,
+    textColor=colors.HexColor('#111827'),
+    alignment=TA_JUSTIFY,
+    spaceAfter=10
+)
+
+_BULLET_STYLE = ParagraphStyle(
+    'BulletItem',
+    parent=_STYLES['BodyText'],
+    fontSize=10,
+    leftIndent=20,
+    bulletIndent=10,
+    spaceAfter=6
+)
+
+_EVIDENCE_CELL_STYLE = ParagraphStyle(
+    'EvidenceCompact',
+    parent=_STYLES['BodyText'],
+    fontSize=7.5,
+    leading=9,
+    wordWrap='CJK',
+)
+
+_LINK_STYLE = ParagraphStyle(
+    'LinkCell',
+    parent=_STYLES['BodyText'],
+    fontSize=7.5,
+    leading=9,
+    wordWrap='CJK',
+)
+
+_FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#6b7280'),
+    alignment=TA_CENTER
+)
+
+_META_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#eff6ff')),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#111827')),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
+    ('LINEBELOW', (0, -1), (-1, -1), 2, colors.HexColor('#3b82f6')),
+])
+
+_COVERAGE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+_EVIDENCE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('FONTSIZE', (0, 1), (-1, -1), 7.5),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+    ('LEFTPADDING', (0, 0), (-1, -1), 3),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (3, 0), (3, -1), 'CENTER'),
+    ('ALIGN', (5, 0), (5, -1), 'CENTER'),
+])
+
+_REFERENCES_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('FONTSIZE', (0, 1), (-1, -1), 7.5),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 3),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+
+# Campaign and counter-operation timelines share one look
+_TIMELINE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
+])
+
 
 class ReportGenerator:
     """Generate reports in different formats."""
@@ -123,14 +280,7 @@ class ReportGenerator:
         label = url if len(url or "") <= 72 else (url[:69] + "...")
         safe_label = html.escape(label or "", quote=False)
         link_html = f'<link href="{safe_url}" color="blue"><u>{safe_label}</u></link>'
-        link_style = ParagraphStyle(
-            'LinkCell',
-            parent=styles['BodyText'],
-            fontSize=7.5,
-            leading=9,
-            wordWrap='CJK',
-        )
-        return Paragraph(link_html, link_style)
+        return Paragraph(link_html, _LINK_STYLE)
 
     @staticmethod
     def _collect_references(evidence: List[Dict[str, Any]]) -> Dict[str, str]:
@@ -165,16 +315,7 @@ class ReportGenerator:
             return []
 
         table = Table(data, colWidths=[4.5*inch, 2.0*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        table.setStyle(_COVERAGE_TABLE_STYLE)
         return [table]
     
     @staticmethod
@@ -197,15 +338,7 @@ class ReportGenerator:
 
             if list_items:
                 for item in list_items:
-                    bullet_style = ParagraphStyle(
-                        'BulletItem',
-                        parent=styles['BodyText'],
-                        fontSize=10,
-                        leftIndent=20,
-                        bulletIndent=10,
-                        spaceAfter=6
-                    )
-                    elements.append(Paragraph(f"• {item}", bullet_style))
+                    elements.append(Paragraph(f"• {item}", _BULLET_STYLE))
             return elements
 
         formatted_text = ReportGenerator._format_inline_markdown(text.replace('\n', '<br/>'))
@@ -259,16 +392,7 @@ class ReportGenerator:
                         continue
                     
                     # Add as subheading
-                    subheading_style = ParagraphStyle(
-                        'SubHeading',
-                        parent=styles['Heading3'],
-                        fontSize=12,
-                        textColor=colors.HexColor('#1f2937'),
-                        spaceAfter=8,
-                        spaceBefore=12,
-                        fontName='Helvetica-Bold'
-                    )
-                    elements.append(Paragraph(heading_text, subheading_style))
+                    elements.append(Paragraph(heading_text, _SUBHEADING_STYLE))
                     
                     if rest_text:
                         elements.extend(ReportGenerator._format_section_content(rest_text, styles))
@@ -313,13 +437,6 @@ class ReportGenerator:
             return []
 
         refs = ReportGenerator._collect_references(evidence)
-        compact_style = ParagraphStyle(
-            'EvidenceCompact',
-            parent=styles['BodyText'],
-            fontSize=7.5,
-            leading=9,
-            wordWrap='CJK',
-        )
 
         data = [['#', 'Actor', 'Field', 'Score', 'Evidence (Excerpt)', 'Refs']]
         for idx, item in enumerate(evidence, 1):
@@ -334,31 +451,15 @@ class ReportGenerator:
 
             data.append([
                 str(idx),
-                Paragraph(html.escape(item.get('actor', 'Unknown')), compact_style),
-                Paragraph(html.escape(item.get('source', 'Unknown')), compact_style),
+                Paragraph(html.escape(item.get('actor', 'Unknown')), _EVIDENCE_CELL_STYLE),
+                Paragraph(html.escape(item.get('source', 'Unknown')), _EVIDENCE_CELL_STYLE),
                 f"{item.get('score', 0):.3f}",
-                Paragraph(ReportGenerator._format_inline_markdown(evidence_text), compact_style),
-                Paragraph(html.escape(", ".join(item_refs) if item_refs else "N/A"), compact_style),
+                Paragraph(ReportGenerator._format_inline_markdown(evidence_text), _EVIDENCE_CELL_STYLE),
+                Paragraph(html.escape(", ".join(item_refs) if item_refs else "N/A"), _EVIDENCE_CELL_STYLE),
             ])
 
         table = Table(data, colWidths=[0.35*inch, 1.2*inch, 1.0*inch, 0.55*inch, 3.2*inch, 0.8*inch], repeatRows=1)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (-1, -1), 7.5),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (3, 0), (3, -1), 'CENTER'),
-            ('ALIGN', (5, 0), (5, -1), 'CENTER'),
-        ]))
+        table.setStyle(_EVIDENCE_TABLE_STYLE)
         return [table]
 
     @staticmethod
@@ -376,21 +477,7 @@ class ReportGenerator:
             ])
 
         table = Table(data, colWidths=[0.8*inch, 5.9*inch], repeatRows=1)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (-1, -1), 7.5),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ]))
+        table.setStyle(_REFERENCES_TABLE_STYLE)
         return [table]
 
     @staticmethod
@@ -460,15 +547,7 @@ class ReportGenerator:
                 row.get('activity', ''),
             ])
         table = Table(data, colWidths=[0.4*inch, 1.1*inch, 4.6*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-        ]))
+        table.setStyle(_TIMELINE_TABLE_STYLE)
         return [table]
 
     @staticmethod
@@ -484,32 +563,34 @@ class ReportGenerator:
                 row.get('activity', ''),
             ])
         table = Table(data, colWidths=[0.6*inch, 1.1*inch, 4.4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1d5db')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-        ]))
+        table.setStyle(_TIMELINE_TABLE_STYLE)
         return [table]
     
     @staticmethod
-    def generate_pdf(result: Dict[str, Any]) -> bytes:
+    def generate_pdf(result: Dict[str, Any], out: Optional[BinaryIO] = None) -> Optional[bytes]:
         """
         Generate PDF report from query result.
         
         Args:
             result: Query result dictionary with query, answer, evidence, confidence
+            out: Optional binary stream (file, response body) to write the PDF into
             
         Returns:
-            PDF bytes
+            PDF bytes, or None when the PDF was written to ``out``
         """
+        if out is not None:
+            ReportGenerator._build_pdf(result, out)
+            return None
+        buffer = io.BytesIO()
+        ReportGenerator._build_pdf(result, buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _build_pdf(result: Dict[str, Any], buffer) -> None:
+        """Lay out the PDF report and write it to a binary file-like object."""
         try:
             normalized = ReportGenerator._normalize_result(result)
 
-            buffer = io.BytesIO()
             doc = SimpleDocTemplate(
                 buffer,
                 pagesize=letter,
@@ -520,54 +601,14 @@ class ReportGenerator:
             )
             
             story = []
-            styles = getSampleStyleSheet()
+            styles = _STYLES
             answer_text = ReportGenerator._sanitize_answer_for_report(normalized.get('answer', ''))
             evidence = normalized.get('evidence', [])
             field_counts = ReportGenerator._source_field_counts(evidence)
             
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#0f172a'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            )
-
-            company_style = ParagraphStyle(
-                'CompanyTitle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.HexColor('#0f172a'),
-                spaceAfter=6,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.HexColor('#1f2937'),
-                spaceAfter=12,
-                spaceBefore=12,
-                fontName='Helvetica-Bold'
-            )
-            
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['BodyText'],
-                fontSize=10,
-                textColor=colors.HexColor('#111827'),
-                alignment=TA_JUSTIFY,
-                spaceAfter=10
-            )
-            
             # Title Section with better spacing
-            story.append(Paragraph("THREAT INTELLIGENCE REPORT", title_style))
-            story.append(Paragraph("ThreatAI Platform", company_style))
+            story.append(Paragraph("THREAT INTELLIGENCE REPORT", _TITLE_STYLE))
+            story.append(Paragraph("ThreatAI Platform", _COMPANY_STYLE))
             story.append(Spacer(1, 0.3*inch))
             
             # Add a horizontal line
@@ -591,46 +632,33 @@ class ReportGenerator:
             ]
             
             meta_table = Table(metadata, colWidths=[1.8*inch, 4.5*inch])
-            meta_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#eff6ff')),
-                ('BACKGROUND', (1, 0), (1, -1), colors.white),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#111827')),
-                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#d1d5db')),
-                ('LINEBELOW', (0, -1), (-1, -1), 2, colors.HexColor('#3b82f6')),
-            ]))
+            meta_table.setStyle(_META_TABLE_STYLE)
             story.append(meta_table)
             story.append(Spacer(1, 0.4*inch))
 
             # Executive Summary
-            story.append(Paragraph("EXECUTIVE SUMMARY", heading_style))
+            story.append(Paragraph("EXECUTIVE SUMMARY", _HEADING_STYLE))
             summary_text = ReportGenerator._build_summary(answer_text)
-            story.append(Paragraph(summary_text, body_style))
+            story.append(Paragraph(summary_text, _BODY_STYLE))
             story.append(Spacer(1, 0.2*inch))
 
             # Structured Data Coverage (only available fields)
             coverage_table = ReportGenerator._build_data_coverage_table(evidence)
             if coverage_table:
-                story.append(Paragraph("DATA COVERAGE", heading_style))
+                story.append(Paragraph("DATA COVERAGE", _HEADING_STYLE))
                 story.extend(coverage_table)
                 story.append(Spacer(1, 0.2*inch))
 
             # Table of Contents
             toc_entries = ReportGenerator._extract_headings(answer_text)
             if toc_entries:
-                story.append(Paragraph("TABLE OF CONTENTS", heading_style))
+                story.append(Paragraph("TABLE OF CONTENTS", _HEADING_STYLE))
                 for entry in toc_entries:
                     story.append(Paragraph(f"• {entry}", styles['BodyText']))
                 story.append(Spacer(1, 0.2*inch))
             
             # Answer Section
-            story.append(Paragraph("DETAILED ANALYSIS", heading_style))
+            story.append(Paragraph("DETAILED ANALYSIS", _HEADING_STYLE))
             
             # Use the new markdown-aware formatter
             answer_elements = ReportGenerator._format_answer_for_pdf(
@@ -643,13 +671,13 @@ class ReportGenerator:
 
             campaign_rows = ReportGenerator._extract_campaign_table(answer_text)
             if campaign_rows:
-                story.append(Paragraph("CAMPAIGNS & OPERATIONS", heading_style))
+                story.append(Paragraph("CAMPAIGNS & OPERATIONS", _HEADING_STYLE))
                 story.extend(ReportGenerator._build_campaign_table(campaign_rows))
                 story.append(Spacer(1, 0.3*inch))
 
             counter_rows = ReportGenerator._extract_counter_operations_table(answer_text)
             if counter_rows:
-                story.append(Paragraph("COUNTER OPERATIONS", heading_style))
+                story.append(Paragraph("COUNTER OPERATIONS", _HEADING_STYLE))
                 story.extend(ReportGenerator._build_counter_operations_table(counter_rows))
                 story.append(Spacer(1, 0.3*inch))
 
@@ -657,49 +685,105 @@ class ReportGenerator:
             if field_counts.get('sponsor', 0) > 0:
                 sponsor_text = ReportGenerator._extract_section_from_answer(answer_text, 'Sponsorship')
                 if sponsor_text:
-                    story.append(Paragraph("SPONSORSHIP", heading_style))
+                    story.append(Paragraph("SPONSORSHIP", _HEADING_STYLE))
                     story.extend(ReportGenerator._format_section_content(sponsor_text, styles))
                     story.append(Spacer(1, 0.2*inch))
 
             if field_counts.get('entity_profile', 0) > 0:
                 profile_text = ReportGenerator._extract_section_from_answer(answer_text, 'Profile')
                 if profile_text:
-                    story.append(Paragraph("PROFILE", heading_style))
+                    story.append(Paragraph("PROFILE", _HEADING_STYLE))
                     story.extend(ReportGenerator._format_section_content(profile_text, styles))
                     story.append(Spacer(1, 0.2*inch))
             
             # Evidence Section
             if evidence:
-                story.append(Paragraph(f"EVIDENCE MATRIX ({len(evidence)} records)", heading_style))
+                story.append(Paragraph(f"EVIDENCE MATRIX ({len(evidence)} records)", _HEADING_STYLE))
                 story.extend(ReportGenerator._build_evidence_table(evidence, styles))
                 story.append(Spacer(1, 0.2*inch))
 
                 refs_table = ReportGenerator._build_references_table(evidence, styles)
                 if refs_table:
-                    story.append(Paragraph("REFERENCES", heading_style))
+                    story.append(Paragraph("REFERENCES", _HEADING_STYLE))
                     story.extend(refs_table)
             
             story.append(Spacer(1, 0.2*inch))
-            story.append(Paragraph("_" * 80, body_style))
+            story.append(Paragraph("_" * 80, _BODY_STYLE))
             
             # Footer
             footer_text = "This report was generated by Threat-AI Intelligence Platform"
-            story.append(Paragraph(footer_text, ParagraphStyle(
-                'Footer',
-                parent=styles['Normal'],
-                fontSize=8,
-                textColor=colors.HexColor('#6b7280'),
-                alignment=TA_CENTER
-            )))
+            story.append(Paragraph(footer_text, _FOOTER_STYLE))
             
             doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
             
         except Exception as e:
             logger.error(f"Error generating PDF: {e}")
             raise
     
+    @staticmethod
+    def _csv_rows(normalized: Dict[str, Any]):
+        """Yield CSV report rows for a normalized result."""
+        # Header
+        yield ['ThreatAI Intelligence Report']
+        yield []
+        
+        # Metadata
+        timestamp = ReportGenerator._parse_timestamp(normalized.get('timestamp'))
+        yield ['Report Metadata']
+        yield ['Generated', timestamp.strftime('%Y-%m-%d %H:%M:%S')]
+        yield ['Trace ID', normalized.get('trace_id', 'N/A')]
+        yield ['Confidence', f"{(normalized.get('confidence', 0) * 100):.1f}%"]
+        yield ['Sources Used', normalized.get('source_count', 0)]
+        yield []
+        
+        # Query
+        yield ['QUERY']
+        yield [normalized.get('query', 'N/A')]
+        yield []
+        
+        answer_text = ReportGenerator._sanitize_answer_for_report(normalized.get('answer', ''))
+
+        # Executive Summary
+        yield ['EXECUTIVE SUMMARY']
+        summary_text = ReportGenerator._build_summary(answer_text)
+        yield [summary_text]
+        yield []
+
+        # Answer
+        yield ['ANALYSIS & ANSWER']
+        yield [answer_text or 'N/A']
+        yield []
+        
+        # Evidence
+        evidence = normalized.get('evidence', [])
+        if evidence:
+            yield ['EVIDENCE SOURCES']
+            yield ['#', 'Actor', 'Source', 'Score', 'Text', 'Links']
+            # Collected in the same pass for the references section
+            unique_links: Dict[str, None] = {}
+            for i, e in enumerate(evidence, 1):
+                links = [l for l in e.get('links', []) or [] if isinstance(l, str)]
+                unique_links.update(dict.fromkeys(links))
+                yield [
+                    i,
+                    e.get('actor', 'Unknown'),
+                    e.get('source', 'Unknown'),
+                    f"{e.get('score', 0):.3f}",
+                    e.get('text', 'N/A'),
+                    " | ".join(links)
+                ]
+            yield []
+
+            # References section
+            if unique_links:
+                yield ['REFERENCES']
+                for link in unique_links:
+                    yield [link]
+                yield []
+        
+        yield ['---']
+        yield ['Generated by Threat-AI Intelligence Platform']
+
     @staticmethod
     def generate_csv(result: Dict[str, Any]) -> str:
         """
@@ -715,75 +799,99 @@ class ReportGenerator:
             normalized = ReportGenerator._normalize_result(result)
 
             output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Header
-            writer.writerow(['ThreatAI Intelligence Report'])
-            writer.writerow([])
-            
-            # Metadata
-            timestamp = ReportGenerator._parse_timestamp(normalized.get('timestamp'))
-            writer.writerow(['Report Metadata'])
-            writer.writerow(['Generated', timestamp.strftime('%Y-%m-%d %H:%M:%S')])
-            writer.writerow(['Trace ID', normalized.get('trace_id', 'N/A')])
-            writer.writerow(['Confidence', f"{(normalized.get('confidence', 0) * 100):.1f}%"])
-            writer.writerow(['Sources Used', normalized.get('source_count', 0)])
-            writer.writerow([])
-            
-            # Query
-            writer.writerow(['QUERY'])
-            writer.writerow([normalized.get('query', 'N/A')])
-            writer.writerow([])
+            csv.writer(output).writerows(ReportGenerator._csv_rows(normalized))
+            return output.getvalue()
             
-            answer_text = ReportGenerator._sanitize_answer_for_report(normalized.get('answer', ''))
+        except Exception as e:
+            logger.error(f"Error generating CSV: {e}")
+            raise
 
-            # Executive Summary
-            writer.writerow(['EXECUTIVE SUMMARY'])
-            summary_text = ReportGenerator._build_summary(answer_text)
-            writer.writerow([summary_text])
-            writer.writerow([])
+    @staticmethod
+    def _map_batch(func, results: List[Dict[str, Any]], max_workers: Optional[int], use_processes: bool) -> List:
+        """Apply a report function to each result on a worker pool, keeping input order."""
+        if not results:
+            return []
+        workers = max_workers or min(8, len(results))
+        if workers <= 1 or len(results) == 1:
+            return [func(result) for result in results]
+        executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor_cls(max_workers=workers) as executor:
+            return list(executor.map(func, results))
 
-            # Answer
-            writer.writerow(['ANALYSIS & ANSWER'])
-            writer.writerow([answer_text or 'N/A'])
-            writer.writerow([])
+    @staticmethod
+    def generate_pdf_batch(results: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                           use_processes: bool = False) -> List[bytes]:
+        """
+        Generate PDF reports for several query results concurrently.
+        
+        Args:
+            results: Query result dictionaries
+            max_workers: Pool size (default: min(8, len(results)))
+            use_processes: Use a process pool, for layout-heavy batches where
+                the GIL limits threads
             
-            # Evidence
-            evidence = normalized.get('evidence', [])
-            if evidence:
-                writer.writerow(['EVIDENCE SOURCES'])
-                writer.writerow(['#', 'Actor', 'Source', 'Score', 'Text', 'Links'])
-                for i, e in enumerate(evidence, 1):
-                    links = e.get('links', [])
-                    link_str = " | ".join([l for l in links if isinstance(l, str)])
-                    writer.writerow([
-                        i,
-                        e.get('actor', 'Unknown'),
-                        e.get('source', 'Unknown'),
-                        f"{e.get('score', 0):.3f}",
-                        e.get('text', 'N/A'),
-                        link_str
-                    ])
-                writer.writerow([])
-
-                # References section
-                all_links = []
-                for e in evidence:
-                    links = e.get('links', [])
-                    if links:
-                        all_links.extend([l for l in links if isinstance(l, str)])
-                unique_links = list(dict.fromkeys(all_links))
-                if unique_links:
-                    writer.writerow(['REFERENCES'])
-                    for link in unique_links:
-                        writer.writerow([link])
-                    writer.writerow([])
+        Returns:
+            PDF bytes per result, in input order
+        """
+        return ReportGenerator._map_batch(ReportGenerator.generate_pdf, results, max_workers, use_processes)
+
+    @staticmethod
+    def generate_csv_batch(results: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                           use_processes: bool = False) -> List[str]:
+        """
+        Generate CSV reports for several query results concurrently.
+        
+        Args:
+            results: Query result dictionaries
+            max_workers: Pool size (default: min(8, len(results)))
+            use_processes: Use a process pool instead of threads
             
-            writer.writerow(['---'])
-            writer.writerow(['Generated by Threat-AI Intelligence Platform'])
+        Returns:
+            CSV strings per result, in input order
+        """
+        return ReportGenerator._map_batch(ReportGenerator.generate_csv, results, max_workers, use_processes)
+
+    @staticmethod
+    def iter_csv(result: Dict[str, Any]):
+        """
+        Stream CSV report rows as UTF-8 bytes while they are produced.
+        
+        Args:
+            result: Query result dictionary
             
-            return output.getvalue()
+        Yields:
+            Encoded CSV lines
+        """
+        normalized = ReportGenerator._normalize_result(result)
+        line = io.StringIO()
+        writer = csv.writer(line)
+        for row in ReportGenerator._csv_rows(normalized):
+            writer.writerow(row)
+            yield line.getvalue().encode('utf-8')
+            line.seek(0)
+            line.truncate(0)
+
+    @staticmethod
+    def iter_pdf(result: Dict[str, Any], chunk_size: int = 64 * 1024):
+        """
+        Stream a PDF report in fixed-size chunks.
+        
+        reportlab lays out the whole document before writing, so the PDF is
+        still built once; chunks are sliced from the build buffer without an
+        extra full-size copy.
+        
+        Args:
+            result: Query result dictionary
+            chunk_size: Bytes per yielded chunk
             
-        except Exception as e:
-            logger.error(f"Error generating CSV: {e}")
-            raise
+        Yields:
+            PDF byte chunks
+        """
+        buffer = io.BytesIO()
+        ReportGenerator._build_pdf(result, buffer)
+        view = buffer.getbuffer()
+        try:
+            for offset in range(0, len(view), chunk_size):
+                yield bytes(view[offset:offset + chunk_size])
+        finally:
+            view.release()
@@ -1,27 +1,144 @@
 """Store and manage analyst feedback."""
 
+import atexit
 import json
 import logging
+import mmap
+import os
 import csv
+import io
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 import uuid
 
+from history import format_timestamp
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional; only export_parquet needs it
+    pa = pq = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize one feedback entry as a UTF-8 JSONL line."""
+    if orjson is not None:
+        # numpy scalars (e.g. float64 confidences) serialize as they do with json
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _as_float(value: Any):
+    """Coerce a numeric feedback field, or None when it is missing or not a number."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+
+def _with_timestamp(feedback: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the ISO 'timestamp' API readers expect from 'timestamp_ns'."""
+    if 'timestamp' not in feedback:
+        timestamp = format_timestamp(feedback)
+        if timestamp is not None:
+            feedback['timestamp'] = timestamp
+    return feedback
+
+
+def _timestamp_ns(feedback: Dict[str, Any]) -> Optional[int]:
+    """Epoch nanoseconds of an entry, parsing the ISO string of older entries."""
+    value = feedback.get('timestamp_ns')
+    if value is not None:
+        return int(value)
+    try:
+        elapsed = datetime.fromisoformat(feedback['timestamp']).replace(tzinfo=None) - datetime(1970, 1, 1)
+        return elapsed // timedelta(microseconds=1) * 1000
+    except (KeyError, TypeError, ValueError):
+        return None
+
+# Append-only descriptor flags; the kernel positions every write at end of file
+_APPEND_FLAGS = (os.O_WRONLY | os.O_CREAT | os.O_APPEND |
+                 getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write every byte of data to fd, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+@contextmanager
+def _mapped(path: Path):
+    """Map a file read-only for the duration of the block (empty files yield b'')."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _iter_lines(buf):
+    """Yield the non-blank lines of a mapped buffer, first line first."""
+    start, end = 0, len(buf)
+    while start < end:
+        nl = buf.find(b'\n', start)
+        if nl < 0:
+            nl = end
+        line = buf[start:nl]
+        if line and not line.isspace():
+            yield line
+        start = nl + 1
+
+
 class FeedbackStore:
     """Manage feedback storage and retrieval."""
     
-    def __init__(self, storage_path: str = "data/feedback/feedback.jsonl", csv_path: str = "data/feedback/feedback.csv", json_path: str = "data/feedback/feedback.json"):
+    # Most entries the background writer appends per file open
+    WRITE_BATCH_SIZE = 256
+    # Pending entries allowed before store_feedback blocks on the writer
+    QUEUE_MAXSIZE = 4096
+    
+    CSV_FIELDNAMES = [
+        'feedback_id', 'timestamp', 'query', 'answer', 'trace_id', 'model',
+        'source_count', 'confidence', 'response_id', 'rating', 'relevance',
+        'accuracy', 'completeness', 'comments', 'corrections'
+    ]
+    
+    # Columns of the Parquet export that hold numbers; 'timestamp' is timestamp[ns], the rest are strings
+    NUMERIC_FIELDS = ('source_count', 'confidence', 'rating')
+    
+    def __init__(self, storage_path: str = "data/feedback/feedback.jsonl", csv_path: str = "data/feedback/feedback.csv", json_path: str = "data/feedback/feedback.json",
+                 async_writes: bool = True):
         """
         Initialize feedback store.
         
         Args:
             storage_path: Path to feedback storage file
             csv_path: Path to CSV feedback file
-            json_path: Path to JSON feedback file
+            json_path: Path to the JSON-array export, regenerated from the JSONL
+                file by export_json_array (and at exit) rather than on every write
+            async_writes: Append entries from a background thread in batches
+                instead of in the caller
         """
         self.storage_path = Path(storage_path)
         self.csv_path = Path(csv_path)
@@ -31,6 +148,67 @@ class FeedbackStore:
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self.csv_path.parent.mkdir(parents=True, exist_ok=True)
         self.json_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One store is shared across request threads; serialize the file appends
+        self._write_lock = threading.Lock()
+        # feedback_id -> byte offset of its JSONL line; built on the first lookup,
+        # then extended by appends and by scanning bytes written elsewhere
+        self._offsets: Optional[Dict[str, int]] = None
+        # query text -> offsets of its feedback lines, kept alongside _offsets
+        self._by_query: Dict[str, List[int]] = {}
+        self._indexed_size = 0
+        # ((st_mtime_ns, st_size), parsed entries) of the last full read
+        self._all_cache: Optional[Tuple[Tuple[int, int], List[Dict[str, Any]]]] = None
+        # JSONL and CSV descriptors, opened on the first write and kept for the
+        # store's lifetime; CSV rows are rendered into _csv_buffer first
+        self._jsonl_fd: Optional[int] = None
+        self._csv_fd: Optional[int] = None
+        self._csv_buffer = io.StringIO(newline='')
+        self._csv_writer = csv.writer(self._csv_buffer)
+        
+        self.async_writes = bool(async_writes)
+        self._queue: Optional[queue.Queue] = None
+        if self.async_writes:
+            self._queue = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+            threading.Thread(target=self._drain, daemon=True, name="feedback-writer").start()
+        atexit.register(self.close)
+    
+    def _drain(self) -> None:
+        """Write queued feedback in batches until the process exits."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to store {len(batch)} feedback entries: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        with self._write_lock:
+            self._append_jsonl(batch)
+            self._append_csv(batch)
+    
+    def flush(self) -> None:
+        """Block until every queued feedback entry has been written."""
+        if self._queue is not None:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Flush pending feedback, close the file handles and refresh the JSON-array export."""
+        self.flush()
+        with self._write_lock:
+            for fd in (self._jsonl_fd, self._csv_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._jsonl_fd = self._csv_fd = None
+        self.export_json_array()
     
     def store_feedback(self, feedback: Dict[str, Any]) -> str:
         """
@@ -44,51 +222,180 @@ class FeedbackStore:
         """
         feedback_id = str(uuid.uuid4())
         feedback['feedback_id'] = feedback_id
-        feedback['timestamp'] = datetime.utcnow().isoformat()
+        feedback['timestamp_ns'] = time.time_ns()
         
         try:
-            self._append_jsonl(feedback)
-            self._append_csv(feedback)
-            self._append_json_array(feedback)
+            if self._queue is not None:
+                self._queue.put(feedback)
+            else:
+                self._write_batch([feedback])
             logger.info(f"Stored feedback: {feedback_id}")
             return feedback_id
         except Exception as e:
             logger.error(f"Failed to store feedback: {e}")
             raise
 
-    def _append_jsonl(self, feedback: Dict[str, Any]) -> None:
-        with open(self.storage_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(feedback, ensure_ascii=False) + '\n')
-
-    def _append_csv(self, feedback: Dict[str, Any]) -> None:
-        fieldnames = [
-            'feedback_id', 'timestamp', 'query', 'answer', 'trace_id', 'model',
-            'source_count', 'confidence', 'response_id', 'rating', 'relevance',
-            'accuracy', 'completeness', 'comments', 'corrections'
-        ]
-
-        write_header = not self.csv_path.exists()
-        with open(self.csv_path, 'a', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if write_header:
-                writer.writeheader()
-            row = {key: feedback.get(key) for key in fieldnames}
-            writer.writerow(row)
-
-    def _append_json_array(self, feedback: Dict[str, Any]) -> None:
-        data = []
-        if self.json_path.exists():
-            try:
-                with open(self.json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if not isinstance(data, list):
-                    data = []
-            except Exception:
-                data = []
-
-        data.append(feedback)
-        with open(self.json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def _append_jsonl(self, entries: List[Dict[str, Any]]) -> None:
+        lines = [_dumps_line(feedback) for feedback in entries]
+        if self._jsonl_fd is None:
+            self._jsonl_fd = os.open(self.storage_path, _APPEND_FLAGS, 0o644)
+        pos = os.lseek(self._jsonl_fd, 0, os.SEEK_END)
+        _write_all(self._jsonl_fd, b''.join(lines))
+        if self._offsets is not None and pos == self._indexed_size:
+            for feedback, line in zip(entries, lines):
+                self._index_entry(feedback, pos)
+                pos += len(line)
+            self._indexed_size = pos
+
+    def _index_entry(self, feedback: Dict[str, Any], pos: int) -> None:
+        feedback_id = feedback.get('feedback_id')
+        if feedback_id:
+            self._offsets[feedback_id] = pos
+        query = feedback.get('query')
+        if isinstance(query, str):
+            self._by_query.setdefault(query, []).append(pos)
+
+    def _sync_index(self) -> Dict[str, int]:
+        """Bring the offset index up to the end of the JSONL file (caller holds _write_lock)."""
+        size = self.storage_path.stat().st_size if self.storage_path.exists() else 0
+        if self._offsets is None or size < self._indexed_size:
+            self._offsets, self._by_query, self._indexed_size = {}, {}, 0
+        if size > self._indexed_size:
+            with open(self.storage_path, 'rb') as f:
+                f.seek(self._indexed_size)
+                pos = self._indexed_size
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # partial line still being written; pick it up next time
+                    if line.strip():
+                        try:
+                            feedback = _loads(line)
+                        except ValueError:
+                            feedback = None
+                        if isinstance(feedback, dict):
+                            self._index_entry(feedback, pos)
+                    pos += len(line)
+                self._indexed_size = pos
+        return self._offsets
+
+    def _append_csv(self, entries: List[Dict[str, Any]]) -> None:
+        fieldnames = self.CSV_FIELDNAMES
+        buffer = self._csv_buffer
+        buffer.seek(0)
+        buffer.truncate()
+        if self._csv_fd is None:
+            self._csv_fd = os.open(self.csv_path, _APPEND_FLAGS, 0o644)
+            if os.lseek(self._csv_fd, 0, os.SEEK_END) == 0:
+                self._csv_writer.writerow(fieldnames)
+        # Rows are built as lists in field order; same output as DictWriter without its per-row dict scan.
+        # The CSV is read by people, so the stored epoch nanoseconds go out as ISO text
+        self._csv_writer.writerows(
+            [format_timestamp(feedback) if key == 'timestamp' else feedback.get(key) for key in fieldnames]
+            for feedback in entries
+        )
+        # The whole batch goes to the kernel in one write
+        _write_all(self._csv_fd, buffer.getvalue().encode('utf-8'))
+
+    def export_json_array(self) -> int:
+        """
+        Regenerate the JSON-array file from the JSONL source of truth.
+        
+        Lines are streamed one at a time, so memory stays flat regardless of
+        file size. Each is validated and copied verbatim, except entries that
+        store only 'timestamp_ns', which are re-serialized with the ISO
+        'timestamp' the feedback schema documents.
+        
+        Returns:
+            Number of feedback entries written
+        """
+        self.flush()
+        if not self.storage_path.exists():
+            return 0
+        tmp_path = self.json_path.with_name(self.json_path.name + '.tmp')
+        count = 0
+        try:
+            with self._write_lock, \
+                    open(self.storage_path, 'rb') as src, \
+                    open(tmp_path, 'wb') as dst:
+                dst.write(b'[')
+                for line in src:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict) and 'timestamp' not in entry and 'timestamp_ns' in entry:
+                        line = _dumps_line(_with_timestamp(entry)).rstrip(b'\n')
+                    dst.write(b',\n' if count else b'\n')
+                    dst.write(line)
+                    count += 1
+                dst.write(b'\n]\n' if count else b']\n')
+            os.replace(tmp_path, self.json_path)
+        except Exception as e:
+            logger.error(f"Failed to export feedback JSON array: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return count
+    
+    def export_parquet(self, parquet_path: str = "data/feedback/feedback.parquet",
+                       row_group_size: int = 1024) -> int:
+        """
+        Write the feedback corpus to a zstd-compressed Parquet file for analytics.
+        
+        The JSONL file is streamed and written one row group at a time, so
+        memory is bounded by row_group_size. Requires pyarrow.
+        
+        Args:
+            parquet_path: Destination file (atomically replaced)
+            row_group_size: Feedback entries per row group
+            
+        Returns:
+            Number of feedback entries written
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Parquet export (pip install pyarrow)")
+        
+        fields = self.CSV_FIELDNAMES
+        schema = pa.schema([
+            (name, pa.timestamp('ns') if name == 'timestamp' else
+             pa.float64() if name in self.NUMERIC_FIELDS else pa.string()) for name in fields
+        ])
+        
+        def column(rows, name):
+            if name == 'timestamp':
+                return [_timestamp_ns(row) for row in rows]
+            if name in self.NUMERIC_FIELDS:
+                return [_as_float(row.get(name)) for row in rows]
+            return [None if row.get(name) is None else str(row.get(name)) for row in rows]
+        
+        def write_group(writer, rows):
+            writer.write_table(pa.table({name: column(rows, name) for name in fields}, schema=schema))
+        
+        path = Path(parquet_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        count = 0
+        try:
+            with pq.ParquetWriter(str(tmp_path), schema, compression='zstd') as writer:
+                rows = []
+                for feedback in self._iter_feedback():
+                    rows.append(feedback)
+                    if len(rows) >= row_group_size:
+                        write_group(writer, rows)
+                        count += len(rows)
+                        rows = []
+                if rows or not count:
+                    write_group(writer, rows)
+                    count += len(rows)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to export feedback to Parquet: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        return count
     
     def get_feedback(self, feedback_id: str) -> Dict[str, Any]:
         """
@@ -100,12 +407,16 @@ class FeedbackStore:
         Returns:
             Feedback dictionary or None
         """
+        self.flush()
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    feedback = json.loads(line)
-                    if feedback.get('feedback_id') == feedback_id:
-                        return feedback
+            with self._write_lock:
+                offset = self._sync_index().get(feedback_id)
+            if offset is not None:
+                with open(self.storage_path, 'rb') as f:
+                    f.seek(offset)
+                    feedback = _loads(f.readline())
+                if feedback.get('feedback_id') == feedback_id:
+                    return _with_timestamp(feedback)
         except Exception as e:
             logger.error(f"Failed to retrieve feedback: {e}")
         
@@ -115,21 +426,40 @@ class FeedbackStore:
         """
         Get all feedback entries.
         
+        Entries are served from a cache of the last full read; each call gets
+        fresh top-level dicts, but nested values are shared and must not be
+        modified in place.
+        
         Returns:
             List of feedback dictionaries
         """
         feedback_list = []
+        self.flush()
         try:
-            if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        feedback = json.loads(line)
-                        feedback_list.append(feedback)
+            if not self.storage_path.exists():
+                return feedback_list
+            st = self.storage_path.stat()
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._all_cache
+            if cached is not None and cached[0] == key:
+                return [dict(feedback) for feedback in cached[1]]
+            feedback_list.extend(self._iter_feedback())
+            self._all_cache = (key, feedback_list)
+            return [dict(feedback) for feedback in feedback_list]
         except Exception as e:
             logger.error(f"Failed to retrieve all feedback: {e}")
         
         return feedback_list
     
+    def _iter_feedback(self):
+        """Yield feedback entries one line at a time, oldest first."""
+        self.flush()
+        if not self.storage_path.exists():
+            return
+        with _mapped(self.storage_path) as buf:
+            for line in _iter_lines(buf):
+                yield _with_timestamp(_loads(line))
+    
     def get_feedback_for_query(self, query: str) -> List[Dict[str, Any]]:
         """
         Get feedback for a specific query.
@@ -140,9 +470,21 @@ class FeedbackStore:
         Returns:
             List of feedback dictionaries for the query
         """
+        if not isinstance(query, str):
+            return [fb for fb in self.get_all_feedback() if fb.get('query') == query]
+        
         feedback_list = []
-        for feedback in self.get_all_feedback():
-            if feedback.get('query') == query:
-                feedback_list.append(feedback)
+        self.flush()
+        try:
+            with self._write_lock:
+                self._sync_index()
+                offsets = list(self._by_query.get(query, ()))
+            if offsets:
+                with open(self.storage_path, 'rb') as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        feedback_list.append(_with_timestamp(_loads(f.readline())))
+        except Exception as e:
+            logger.error(f"Failed to retrieve feedback for query: {e}")
         
         return feedback_list
@@ -1,22 +1,200 @@
 """Store and manage query history."""
 
+import atexit
 import json
 import logging
+import mmap
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 import uuid
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize one history entry as a UTF-8 JSONL line."""
+    if orjson is not None:
+        # numpy scalars (e.g. float64 confidences) serialize as they do with json
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def format_timestamp(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Return an entry's UTC time as an ISO-8601 string.
+    
+    Entries store integer epoch nanoseconds in 'timestamp_ns'; older ones
+    carry the ISO string in 'timestamp', which is returned unchanged.
+    
+    Args:
+        entry: History or feedback record
+        
+    Returns:
+        ISO-8601 timestamp, or None if the entry has neither field
+    """
+    timestamp = entry.get('timestamp')
+    if timestamp is None and entry.get('timestamp_ns') is not None:
+        timestamp = (_EPOCH + timedelta(microseconds=entry['timestamp_ns'] // 1000)).isoformat()
+    return timestamp
+
+
+def _with_timestamp(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the ISO 'timestamp' readers expect from 'timestamp_ns'."""
+    if 'timestamp' not in entry:
+        timestamp = format_timestamp(entry)
+        if timestamp is not None:
+            entry['timestamp'] = timestamp
+    return entry
+
+
+# Deletions append {"op": "delete", "query_id": ...}; entries never start with this key
+_TOMBSTONE_PREFIX = b'{"op"'
+
+
+# Append-only descriptor flags; the kernel positions every write at end of file
+_APPEND_FLAGS = (os.O_WRONLY | os.O_CREAT | os.O_APPEND |
+                 getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write every byte of data to fd, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+@contextmanager
+def _mapped(path: Path):
+    """Map a file read-only for the duration of the block (empty files yield b'')."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _iter_lines(buf):
+    """Yield the non-blank lines of a mapped buffer, first line first."""
+    start, end = 0, len(buf)
+    while start < end:
+        nl = buf.find(b'\n', start)
+        if nl < 0:
+            nl = end
+        line = buf[start:nl]
+        if line and not line.isspace():
+            yield line
+        start = nl + 1
+
+
+def _iter_lines_reversed(buf):
+    """Yield the non-blank lines of a mapped buffer, last line first."""
+    end = len(buf)
+    while end > 0:
+        nl = buf.rfind(b'\n', 0, end)
+        line = buf[nl + 1:end]
+        if line and not line.isspace():
+            yield line
+        end = nl
+
+
 class QueryHistory:
     """Manage query history storage and retrieval."""
     
+    # delete_query compacts the file once tombstoned entries exceed this share
+    # of all entries (and there are at least COMPACT_MIN_TOMBSTONES of them)
+    COMPACT_RATIO = 0.2
+    COMPACT_MIN_TOMBSTONES = 32
+    
     def __init__(self, storage_path: str = "data/history/queries.jsonl"):
         """Initialize query history store."""
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        # One instance is shared across threads; appends and rewrites take this lock
+        self._write_lock = threading.Lock()
+        # query_id -> byte offset of its line; built on the first lookup, then
+        # extended by appends and by scanning bytes written elsewhere
+        self._offsets: Optional[Dict[str, int]] = None
+        self._indexed_size = 0
+        # Ids deleted by tombstone lines that have not been compacted away yet
+        self._tombstones: set = set()
+        # Parsed history pages, valid while the file's (st_mtime_ns, st_size) is unchanged
+        self._page_cache_key: Optional[Tuple[int, int]] = None
+        self._page_cache: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        # Append descriptor, opened on the first write and reopened after compaction
+        self._fd: Optional[int] = None
+        atexit.register(self.close)
+    
+    def close(self) -> None:
+        """Close the append descriptor; the next write reopens it."""
+        with self._write_lock:
+            self._close_fd()
+    
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def _append_bytes(self, data: bytes) -> int:
+        """Append raw bytes and return the offset they start at (caller holds _write_lock)."""
+        if self._fd is None:
+            self._fd = os.open(self.storage_path, _APPEND_FLAGS, 0o644)
+        pos = os.lseek(self._fd, 0, os.SEEK_END)
+        _write_all(self._fd, data)
+        return pos
+    
+    def _sync_index(self) -> Dict[str, int]:
+        """Bring the offset index up to the end of the file (caller holds _write_lock)."""
+        size = self.storage_path.stat().st_size if self.storage_path.exists() else 0
+        if self._offsets is None or size < self._indexed_size:
+            self._offsets, self._tombstones, self._indexed_size = {}, set(), 0
+        if size > self._indexed_size:
+            with open(self.storage_path, 'rb') as f:
+                f.seek(self._indexed_size)
+                pos = self._indexed_size
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # partial line still being written; pick it up next time
+                    if line.strip():
+                        try:
+                            entry = _loads(line)
+                        except ValueError:
+                            entry = {}
+                        query_id = entry.get('query_id')
+                        if query_id and entry.get('op') == 'delete':
+                            self._offsets.pop(query_id, None)
+                            self._tombstones.add(query_id)
+                        elif query_id and query_id not in self._tombstones:
+                            self._offsets[query_id] = pos
+                    pos += len(line)
+                self._indexed_size = pos
+        return self._offsets
+    
+    def _append_lines(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries as JSONL lines, recording their offsets (caller holds _write_lock)."""
+        lines = [_dumps_line(entry) for entry in entries]
+        pos = self._append_bytes(b''.join(lines))
+        if self._offsets is not None and pos == self._indexed_size:
+            for entry, line in zip(entries, lines):
+                self._offsets[entry['query_id']] = pos
+                pos += len(line)
+            self._indexed_size = pos
     
     def save_query(self, query: str, result: Dict[str, Any]) -> str:
         """
@@ -29,33 +207,63 @@ class QueryHistory:
         Returns:
             Query ID
         """
-        query_id = str(uuid.uuid4())
+        history_entry = self._build_entry(query, result)
+        query_id = history_entry['query_id']
         
-        history_entry = {
-            'query_id': query_id,
+        try:
+            with self._write_lock:
+                self._append_lines([history_entry])
+            logger.info(f"Saved query to history: {query_id}")
+            return query_id
+        except Exception as e:
+            logger.error(f"Failed to save query history: {e}")
+            raise
+    
+    def save_many(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Save several queries with a single append to the history file.
+        
+        Args:
+            items: (query, result) pairs in the order they were answered
+            
+        Returns:
+            Query IDs, in the same order as items
+        """
+        entries = [self._build_entry(query, result) for query, result in items]
+        if not entries:
+            return []
+        
+        try:
+            with self._write_lock:
+                self._append_lines(entries)
+            logger.info(f"Saved {len(entries)} queries to history")
+            return [entry['query_id'] for entry in entries]
+        except Exception as e:
+            logger.error(f"Failed to save query history batch: {e}")
+            raise
+    
+    @staticmethod
+    def _build_entry(query: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the history record stored for one answered query."""
+        return {
+            'query_id': str(uuid.uuid4()),
             'query': query,
             'answer': result.get('answer', ''),
             'confidence': result.get('confidence', 0),
             'model': result.get('model', 'N/A'),
             'source_count': result.get('source_count', 0),
             'trace_id': result.get('trace_id', ''),
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp_ns': time.time_ns(),
             'evidence_count': len(result.get('evidence', []))
         }
-        
-        try:
-            with open(self.storage_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(history_entry, ensure_ascii=False) + '\n')
-            logger.info(f"Saved query to history: {query_id}")
-            return query_id
-        except Exception as e:
-            logger.error(f"Failed to save query history: {e}")
-            raise
     
     def get_all_queries(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """
         Get all queries from history (most recent first).
         
+        Pages are cached until the file changes; each call gets fresh top-level
+        dicts, but nested values are shared and must not be modified in place.
+        
         Args:
             limit: Number of queries to return
             offset: Number of queries to skip
@@ -65,18 +273,38 @@ class QueryHistory:
         """
         queries = []
         try:
-            if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    all_lines = f.readlines()
-                    # Reverse to get most recent first
-                    for line in reversed(all_lines):
-                        if line.strip():
-                            queries.append(json.loads(line))
+            if self.storage_path.exists() and limit > 0:
+                st = self.storage_path.stat()
+                key = (st.st_mtime_ns, st.st_size)
+                if key != self._page_cache_key:
+                    self._page_cache_key, self._page_cache = key, {}
+                cached = self._page_cache.get((limit, offset))
+                if cached is not None:
+                    return [dict(entry) for entry in cached]
+                with self._write_lock:
+                    deleted = set(self._sync_index_tombstones())
+                # Scan backward from the end so only the requested page is read and parsed
+                with _mapped(self.storage_path) as buf:
+                    lines = (line for line in _iter_lines_reversed(buf) if not line.startswith(_TOMBSTONE_PREFIX))
+                    start, stop = max(offset, 0), max(offset, 0) + limit
+                    if deleted:
+                        live = (e for e in map(_loads, lines) if e.get('query_id') not in deleted)
+                        queries = list(map(_with_timestamp, islice(live, start, stop)))
+                    else:
+                        queries = [_with_timestamp(_loads(line)) for line in islice(lines, start, stop)]
+                if len(self._page_cache) >= 32:
+                    self._page_cache.clear()
+                self._page_cache[(limit, offset)] = queries
+                return [dict(entry) for entry in queries]
         except Exception as e:
             logger.error(f"Failed to retrieve query history: {e}")
         
-        # Apply pagination
-        return queries[offset:offset + limit]
+        return queries
+    
+    def _sync_index_tombstones(self) -> set:
+        """Sync the index and return the deleted ids (caller holds _write_lock)."""
+        self._sync_index()
+        return self._tombstones
     
     def get_query(self, query_id: str) -> Dict[str, Any]:
         """
@@ -89,13 +317,14 @@ class QueryHistory:
             Query entry or None
         """
         try:
-            if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            entry = json.loads(line)
-                            if entry.get('query_id') == query_id:
-                                return entry
+            with self._write_lock:
+                offset = self._sync_index().get(query_id)
+            if offset is not None:
+                with open(self.storage_path, 'rb') as f:
+                    f.seek(offset)
+                    entry = _loads(f.readline())
+                if entry.get('query_id') == query_id:
+                    return _with_timestamp(entry)
         except Exception as e:
             logger.error(f"Failed to retrieve query: {e}")
         
@@ -115,17 +344,22 @@ class QueryHistory:
             if not self.storage_path.exists():
                 return False
             
-            queries = []
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        entry = json.loads(line)
-                        if entry.get('query_id') != query_id:
-                            queries.append(entry)
-            
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                for entry in queries:
-                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            with self._write_lock:
+                if query_id not in self._sync_index():
+                    return True  # nothing to remove
+                
+                # Append a tombstone instead of rewriting the file
+                line = _dumps_line({'op': 'delete', 'query_id': query_id})
+                pos = self._append_bytes(line)
+                self._offsets.pop(query_id, None)
+                self._tombstones.add(query_id)
+                if pos == self._indexed_size:
+                    self._indexed_size = pos + len(line)
+                
+                dead = len(self._tombstones)
+                if (dead >= self.COMPACT_MIN_TOMBSTONES and
+                        dead > self.COMPACT_RATIO * (dead + len(self._offsets))):
+                    self._compact_locked()
             
             logger.info(f"Deleted query from history: {query_id}")
             return True
@@ -133,10 +367,43 @@ class QueryHistory:
             logger.error(f"Failed to delete query: {e}")
             return False
     
+    def compact(self) -> bool:
+        """Rewrite the history file without deleted entries and their tombstones."""
+        try:
+            with self._write_lock:
+                self._compact_locked()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to compact history: {e}")
+            return False
+    
+    def _compact_locked(self) -> None:
+        if not self.storage_path.exists():
+            return
+        deleted = self._sync_index_tombstones()
+        tmp_path = self.storage_path.with_name(self.storage_path.name + '.tmp')
+        # Live lines are copied verbatim; only their ids are parsed
+        with open(self.storage_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            for line in src:
+                if not line.strip() or line.startswith(_TOMBSTONE_PREFIX):
+                    continue
+                if deleted and _loads(line).get('query_id') in deleted:
+                    continue
+                dst.write(line if line.endswith(b'\n') else line + b'\n')
+        # The open descriptor still points at the old file; drop it before the swap
+        self._close_fd()
+        os.replace(tmp_path, self.storage_path)
+        self._offsets = None
+        self._tombstones = set()
+        logger.info(f"Compacted query history ({len(deleted)} deleted entries removed)")
+    
     def clear_all(self) -> bool:
         """Clear all query history."""
         try:
-            self.storage_path.write_text('')
+            with self._write_lock:
+                self.storage_path.write_text('')
+                self._offsets = None
+                self._tombstones = set()
             logger.info("Cleared all query history")
             return True
         except Exception as e:
@@ -155,28 +422,43 @@ class QueryHistory:
         """
         results = []
         search_lower = search_term.lower()
+        # An ASCII term that JSON stores unescaped can be matched against the raw
+        # line first; only lines that may contain it are parsed
+        needle = search_lower.encode('utf-8')
+        prefilter = (search_lower.isascii() and search_lower.isprintable() and
+                     '"' not in search_lower and '\\' not in search_lower)
         
         try:
             if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            entry = json.loads(line)
-                            if (search_lower in entry.get('query', '').lower() or
+                with self._write_lock:
+                    deleted = set(self._sync_index_tombstones())
+                with _mapped(self.storage_path) as buf:
+                    for line in _iter_lines(buf):
+                        if line.startswith(_TOMBSTONE_PREFIX):
+                            continue
+                        # bytes.lower() matches str.lower() only on ASCII lines
+                        if prefilter and line.isascii() and needle not in line.lower():
+                            continue
+                        entry = _loads(line)
+                        if deleted and entry.get('query_id') in deleted:
+                            continue
+                        # The raw match may have hit another field; confirm on query/answer
+                        if (search_lower in entry.get('query', '').lower() or
                                 search_lower in entry.get('answer', '').lower()):
-                                results.append(entry)
+                            results.append(_with_timestamp(entry))
         except Exception as e:
             logger.error(f"Failed to search queries: {e}")
         
-        return list(reversed(results))  # Most recent first
+        results.reverse()  # Most recent first
+        return results
     
     def get_stats(self) -> Dict[str, Any]:
         """Get query history statistics."""
         try:
             total = 0
             if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    total = len(f.readlines())
+                with self._write_lock:
+                    total = len(self._sync_index())
             
             return {
                 'total_queries': total,
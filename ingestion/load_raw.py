@@ -3,11 +3,30 @@
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _read_json(path: Path) -> Any:
+    """Parse a whole JSON file, using orjson on the raw bytes when available."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def load_raw_actors(file_path: str) -> List[Dict[str, Any]]:
     """
     Load threat actor profiles from raw JSON file.
@@ -25,8 +44,7 @@ def load_raw_actors(file_path: str) -> List[Dict[str, Any]]:
         return []
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _read_json(path)
         logger.info(f"Loaded {len(data)} threat actors from {file_path}")
         return data
     except json.JSONDecodeError as e:
@@ -35,3 +53,36 @@ def load_raw_actors(file_path: str) -> List[Dict[str, Any]]:
     except Exception as e:
         logger.error(f"Error loading raw data: {e}")
         raise
+
+
+def iter_raw_actors(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream threat actor profiles from a raw JSON array one at a time.
+    
+    With ijson installed only the current actor is held in memory; without
+    it the file is parsed whole and its items are yielded in order.
+    
+    Args:
+        file_path: Path to the raw JSON file (top-level array)
+        
+    Yields:
+        Threat actor profiles
+    """
+    path = Path(file_path)
+    
+    if not path.exists():
+        logger.warning(f"Raw data file not found: {file_path}")
+        return
+    
+    try:
+        if ijson is not None:
+            with open(path, 'rb') as f:
+                yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from _read_json(path)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error loading raw data: {e}")
+        raise
@@ -6,51 +6,60 @@ from typing import Dict, Any, List, Optional
 logger = logging.getLogger(__name__)
 
 
-def normalize_actor(actor: Dict[str, Any]) -> Dict[str, Any]:
+# Fields that must always be present as lists on a normalized actor
+_LIST_FIELDS = (
+    'aliases',
+    'alias_givers',
+    'ttps',
+    'tactics',
+    'targets',
+    'tools',
+    'campaigns',
+    'operations',
+    'counter_operations',
+    'counter-operations',
+    'observed_sectors',
+    'observed-sectors',
+    'observed_countries',
+    'observed-countries',
+    'origins',
+    'motivations',
+    'information_sources',
+)
+
+# Free-text fields whose surrounding whitespace is trimmed
+_STRIPPED_FIELDS = ('name', 'description')
+
+_MISSING = object()
+
+
+def normalize_actor(actor: Dict[str, Any], in_place: bool = False) -> Dict[str, Any]:
     """
     Normalize optional fields in threat actor profile.
     
     Args:
         actor: Threat actor profile to normalize
+        in_place: Edit the given dict instead of a copy (for callers that own it)
         
     Returns:
         Normalized threat actor profile
     """
-    normalized = actor.copy()
+    normalized = actor if in_place else actor.copy()
+    get = normalized.get
     
-    # Ensure list fields are lists
-    for field in [
-        'aliases',
-        'alias_givers',
-        'ttps',
-        'tactics',
-        'targets',
-        'tools',
-        'campaigns',
-        'operations',
-        'counter_operations',
-        'counter-operations',
-        'observed_sectors',
-        'observed-sectors',
-        'observed_countries',
-        'observed-countries',
-        'origins',
-        'motivations',
-        'information_sources',
-    ]:
-        if field in normalized:
-            if isinstance(normalized[field], str):
-                normalized[field] = [normalized[field]]
-        else:
+    # Ensure list fields are lists (one lookup per field)
+    for field in _LIST_FIELDS:
+        value = get(field, _MISSING)
+        if value is _MISSING:
             normalized[field] = []
+        elif isinstance(value, str):
+            normalized[field] = [value]
     
-    # Normalize name field
-    if 'name' in normalized and normalized['name']:
-        normalized['name'] = normalized['name'].strip()
-    
-    # Normalize description
-    if 'description' in normalized and normalized['description']:
-        normalized['description'] = normalized['description'].strip()
+    # Normalize name and description
+    for field in _STRIPPED_FIELDS:
+        value = get(field)
+        if value:
+            normalized[field] = value.strip()
     
     return normalized
 
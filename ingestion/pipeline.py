@@ -0,0 +1,44 @@
+"""Streaming load, normalize and validate pipeline for threat actor data."""
+
+import logging
+from typing import Dict, Any, Iterator, Optional
+
+from .load_raw import iter_raw_actors
+from .normalize import normalize_actor
+from .validate import compile_schema
+
+logger = logging.getLogger(__name__)
+
+
+def ingest(file_path: str, schema: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Load, normalize and validate actors in a single pass.
+    
+    Each actor is normalized in place as it is parsed and checked against the
+    compiled schema straight away, so no intermediate lists are built.
+    
+    Args:
+        file_path: Path to the raw JSON file (top-level array)
+        schema: Optional JSON schema; when omitted actors are only normalized
+        
+    Yields:
+        Normalized actors that pass validation
+    """
+    check = compile_schema(schema) if schema is not None else None
+    valid_count = 0
+    invalid_count = 0
+    
+    for actor in iter_raw_actors(file_path):
+        normalized = normalize_actor(actor, in_place=True)
+        if check is not None:
+            error = check(normalized)
+            if error is not None:
+                logger.warning(f"Validation error for actor: {error}")
+                invalid_count += 1
+                continue
+        valid_count += 1
+        yield normalized
+    
+    if invalid_count > 0:
+        logger.warning(f"Validation failed for {invalid_count} actors")
+    logger.info(f"Ingested {valid_count} threat actors from {file_path}")
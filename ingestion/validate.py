@@ -2,12 +2,27 @@
 
 import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Any, List
-from jsonschema import validate, ValidationError
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - optional dependency
+    fastjsonschema = None
+
+if fastjsonschema is None:
+    from jsonschema import ValidationError
+    from jsonschema.validators import validator_for
 
 logger = logging.getLogger(__name__)
 
+# Below this many actors, worker start-up costs more than it saves
+PARALLEL_MIN_ACTORS = 2000
+
 
 def load_schema(schema_path: str) -> Dict[str, Any]:
     """Load JSON schema for validation."""
@@ -15,6 +30,54 @@ def load_schema(schema_path: str) -> Dict[str, Any]:
         return json.load(f)
 
 
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], Optional[str]]:
+    """
+    Compile a JSON schema into a reusable actor check.
+    
+    Uses fastjsonschema's generated validator when installed, otherwise a
+    jsonschema validator built once (the schema itself is checked only here).
+    Both behave like jsonschema.validate: defaults are not filled into the
+    actor and "format" is not enforced. Compiled checks are cached per schema.
+    
+    Args:
+        schema: JSON schema for validation
+        
+    Returns:
+        Callable returning None for a valid actor, or the validation error message
+    """
+    return _compile_schema_cached(json.dumps(schema, sort_keys=True))
+
+
+@lru_cache(maxsize=32)
+def _compile_schema_cached(schema_json: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    """Build the check for a serialized schema (see compile_schema)."""
+    schema = json.loads(schema_json)
+    if fastjsonschema is not None:
+        compiled = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+        
+        def check(actor: Dict[str, Any]) -> Optional[str]:
+            try:
+                compiled(actor)
+                return None
+            except fastjsonschema.JsonSchemaException as e:
+                return e.message
+        
+        return check
+    
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    validator = validator_cls(schema)
+    
+    def check(actor: Dict[str, Any]) -> Optional[str]:
+        try:
+            validator.validate(actor)
+            return None
+        except ValidationError as e:
+            return e.message
+    
+    return check
+
+
 def validate_actor(actor: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """
     Validate a single threat actor against schema.
@@ -26,33 +89,64 @@ def validate_actor(actor: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    try:
-        validate(instance=actor, schema=schema)
-        return True
-    except ValidationError as e:
-        logger.warning(f"Validation error for actor: {e.message}")
+    return _check_actor(actor, compile_schema(schema))
+
+
+def _check_actor(actor: Dict[str, Any], check: Callable[[Dict[str, Any]], Optional[str]]) -> bool:
+    """Run a compiled check and log the failure reason."""
+    error = check(actor)
+    if error is not None:
+        logger.warning(f"Validation error for actor: {error}")
         return False
+    return True
+
 
+def _validate_chunk(actors: List[Dict[str, Any]], schema: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+    """Validate one slice of actors with a schema compiled in this process."""
+    check = compile_schema(schema)
+    valid = []
+    invalid_count = 0
+    
+    for actor in actors:
+        if _check_actor(actor, check):
+            valid.append(actor)
+        else:
+            invalid_count += 1
+    
+    return valid, invalid_count
 
-def validate_actors(actors: List[Dict[str, Any]], schema: Dict[str, Any]) -> tuple:
+
+def validate_actors(actors: List[Dict[str, Any]], schema: Dict[str, Any],
+                    max_workers: Optional[int] = None) -> tuple:
     """
     Validate a list of threat actors.
     
+    Large lists are split into one contiguous chunk per worker and validated
+    in separate processes; valid actors keep their input order.
+    
     Args:
         actors: List of threat actor profiles
         schema: JSON schema for validation
+        max_workers: Worker processes (defaults to CPU count; 1 disables parallelism)
         
     Returns:
         Tuple of (valid_actors, invalid_count)
     """
-    valid = []
-    invalid_count = 0
-    
-    for actor in actors:
-        if validate_actor(actor, schema):
-            valid.append(actor)
-        else:
-            invalid_count += 1
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(actors) < PARALLEL_MIN_ACTORS:
+        valid, invalid_count = _validate_chunk(actors, schema)
+    else:
+        chunk_size = -(-len(actors) // workers)
+        chunks = [actors[i:i + chunk_size] for i in range(0, len(actors), chunk_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                results = list(executor.map(_validate_chunk, chunks, repeat(schema)))
+        except Exception as e:
+            logger.error(f"Parallel validation failed, validating serially: {e}")
+            results = [_validate_chunk(actors, schema)]
+        
+        valid = [actor for chunk_valid, _ in results for actor in chunk_valid]
+        invalid_count = sum(count for _, count in results)
     
     if invalid_count > 0:
         logger.warning(f"Validation failed for {invalid_count} actors")
@@ -1,5 +1,6 @@
 """Evidence selection and retrieval with hybrid search."""
 
+import json
 import logging
 import re
 from typing import List, Dict, Any, Tuple, Optional
@@ -59,6 +60,49 @@ class EvidenceRetriever:
         Returns:
             List of relevant chunks with metadata
         """
+        plan = self._plan_query(query)
+        vector_results = self._vector_search(plan['normalized_query'], plan['vector_k'], plan['metadata_filter'])
+        return self._assemble_evidence(plan, vector_results, top_k, similarity_threshold)
+    
+    def retrieve_many(self, queries: List[str], top_k: int = 5,
+                      similarity_threshold: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Retrieve evidence for several queries, sharing embedding and vector-search passes.
+        
+        Queries are embedded with one encoder call per group of queries that
+        share a metadata filter and result depth, and each group is searched
+        with one batched vector-store lookup. Results match retrieve() per query.
+        
+        Args:
+            queries: Query strings
+            top_k: Number of results per query
+            similarity_threshold: Minimum similarity score
+            
+        Returns:
+            One retrieve() result per query, in input order
+        """
+        plans = [self._plan_query(query) for query in queries]
+        
+        groups: Dict[Tuple[str, int], List[int]] = {}
+        for i, plan in enumerate(plans):
+            key = (json.dumps(plan['metadata_filter'], sort_keys=True, default=str), plan['vector_k'])
+            groups.setdefault(key, []).append(i)
+        
+        vector_results: List[List[Tuple[Dict[str, Any], float]]] = [[] for _ in plans]
+        for (_, k), members in groups.items():
+            batch = self._vector_search_batch(
+                [plans[i]['normalized_query'] for i in members], k, plans[members[0]]['metadata_filter']
+            )
+            for i, results in zip(members, batch):
+                vector_results[i] = results
+        
+        return [
+            self._assemble_evidence(plan, results, top_k, similarity_threshold)
+            for plan, results in zip(plans, vector_results)
+        ]
+    
+    def _plan_query(self, query: str) -> Dict[str, Any]:
+        """Parse, normalize and classify a query before any search runs."""
         # Parse query to extract entities and intent
         parsed_query = None
         metadata_filter = None
@@ -85,8 +129,23 @@ class EvidenceRetriever:
         query_type = QueryRouter.classify_query(query)
         retrieval_plan = QueryRouter.get_retrieval_plan(query_type)
         
-        # Get results from both retrievers
-        vector_results = self._vector_search(normalized_query, retrieval_plan['top_k'] * 2, metadata_filter)
+        return {
+            'parsed_query': parsed_query,
+            'metadata_filter': metadata_filter,
+            'normalized_query': normalized_query,
+            'query_type': query_type,
+            'retrieval_plan': retrieval_plan,
+            'vector_k': retrieval_plan['top_k'] * 2,
+        }
+    
+    def _assemble_evidence(self, plan: Dict[str, Any], vector_results: List[Tuple[Dict[str, Any], float]],
+                           top_k: int, similarity_threshold: float) -> Dict[str, Any]:
+        """Merge vector results with BM25, filter and enrich them into a retrieve() result."""
+        parsed_query = plan['parsed_query']
+        metadata_filter = plan['metadata_filter']
+        normalized_query = plan['normalized_query']
+        query_type = plan['query_type']
+        retrieval_plan = plan['retrieval_plan']
         
         # If metadata filter was applied and returned nothing, it means specific actor was requested but not found
         # In this case, do NOT fall back to BM25 (would mix in other actors)
@@ -136,7 +195,7 @@ class EvidenceRetriever:
                     continue
             if score >= similarity_threshold:
                 chunk_with_score = chunk.copy()
-                chunk_with_score['similarity_score'] = score
+                chunk_with_score['similarity_score'] = round(float(score), 4)
                 chunk_with_score['query_type'] = query_type.value
                 if parsed_query:
                     chunk_with_score['matched_actors'] = parsed_query.get('actors', [])
@@ -160,7 +219,7 @@ class EvidenceRetriever:
         if not evidence and combined_results:
             for chunk, score in combined_results[:top_k]:
                 chunk_with_score = chunk.copy()
-                chunk_with_score['similarity_score'] = score
+                chunk_with_score['similarity_score'] = round(float(score), 4)
                 chunk_with_score['query_type'] = query_type.value
                 if parsed_query:
                     chunk_with_score['matched_actors'] = parsed_query.get('actors', [])
@@ -233,7 +292,7 @@ class EvidenceRetriever:
             where['source_system'] = {'$eq': source_system}
 
         query_embedding = self.embedder.embed_text(query)
-        vector_results = self.vector_store.search(query_embedding.tolist(), k=top_k * 3, where=where or None)
+        vector_results = self.vector_store.search(query_embedding, k=top_k * 3, where=where or None)
 
         filtered = []
         for chunk, score in vector_results:
@@ -243,7 +302,7 @@ class EvidenceRetriever:
             if score < similarity_threshold:
                 continue
             chunk_with_score = chunk.copy()
-            chunk_with_score['similarity_score'] = score
+            chunk_with_score['similarity_score'] = round(float(score), 4)
             filtered.append(chunk_with_score)
             if len(filtered) >= top_k:
                 break
@@ -300,12 +359,24 @@ class EvidenceRetriever:
         """Perform vector similarity search."""
         try:
             query_embedding = self.embedder.embed_text(query)
-            results = self.vector_store.search(query_embedding.tolist(), k=k, where=metadata_filter)
+            results = self.vector_store.search(query_embedding, k=k, where=metadata_filter)
             return results
         except Exception as e:
             logger.error(f"Vector search error: {e}")
             return []
     
+    def _vector_search_batch(self, queries: List[str], k: int,
+                             metadata_filter: Optional[Dict] = None) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Embed and vector-search several queries with one encoder call and one store lookup."""
+        if not queries:
+            return []
+        try:
+            query_embeddings = self.embedder.embed_texts(queries)
+            return self.vector_store.search_batch(query_embeddings, k=k, where=metadata_filter)
+        except Exception as e:
+            logger.error(f"Vector search error: {e}")
+            return [[] for _ in queries]
+    
     def _bm25_search(self, query: str, k: int) -> List[Tuple[Dict[str, Any], float]]:
         """Perform BM25 keyword search."""
         if not self.bm25_retriever:
@@ -525,6 +596,41 @@ class EvidenceRetriever:
             result['retrieval_mode'] = 'error_fallback'
             return result
     
+    def retrieve_actor_scoped_many(self, queries: List[str], retrieval_mode: str = 'full_actor') -> List[Dict[str, Any]]:
+        """
+        Run retrieve_actor_scoped() for several queries.
+        
+        Queries that name no actor take the hybrid fallback together through
+        retrieve_many(), so they share one embedding and vector-search pass.
+        
+        Args:
+            queries: Query strings
+            retrieval_mode: 'full_actor' (all chunks) or 'intent_filtered' (only relevant fields)
+            
+        Returns:
+            One retrieve_actor_scoped() result per query, in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        plain = []
+        for i, query in enumerate(queries):
+            has_actor = False
+            if self.query_parser:
+                try:
+                    has_actor = bool(self.query_parser.parse(query).get('actors'))
+                except Exception as e:
+                    logger.warning(f"Query parsing failed in actor_scoped: {e}")
+            if has_actor:
+                results[i] = self.retrieve_actor_scoped(query, retrieval_mode=retrieval_mode)
+            else:
+                plain.append(i)
+        
+        if plain:
+            logger.info(f"No specific actor found for {len(plain)} queries, falling back to batched hybrid retrieval")
+            for i, result in zip(plain, self.retrieve_many([queries[i] for i in plain])):
+                result['retrieval_mode'] = 'hybrid_fallback'
+                results[i] = result
+        return results
+    
     def _filter_chunks_by_intent(self, chunks: List[Dict], intent: str, query: str) -> List[Dict]:
         """
         Filter chunks based on query intent to reduce noise.
@@ -1,7 +1,9 @@
 """Query router for determining retrieval strategy."""
 
 import logging
-from typing import Dict, Any, List
+import re
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,31 @@ class QueryType(Enum):
     GENERAL = "general"
 
 
+# Static per-type retrieval plans, shared read-only by every call
+_PLANS: Mapping[QueryType, Mapping[str, Any]] = MappingProxyType({
+    QueryType.ACTOR_PROFILE: MappingProxyType({
+        'top_k': 5,
+        'weight_fields': MappingProxyType({'description': 1.0, 'aliases': 0.8, 'origins': 0.6}),
+    }),
+    QueryType.TTP_ANALYSIS: MappingProxyType({
+        'top_k': 3,
+        'weight_fields': MappingProxyType({'ttps': 1.0, 'description': 0.5}),
+    }),
+    QueryType.TARGET_ANALYSIS: MappingProxyType({
+        'top_k': 4,
+        'weight_fields': MappingProxyType({'targets': 1.0, 'description': 0.5}),
+    }),
+    QueryType.TIMELINE_ANALYSIS: MappingProxyType({
+        'top_k': 3,
+        'weight_fields': MappingProxyType({'first_seen': 1.0, 'last_seen': 1.0, 'description': 0.3}),
+    }),
+    QueryType.GENERAL: MappingProxyType({
+        'top_k': 5,
+        'weight_fields': MappingProxyType({'description': 1.0}),
+    }),
+})
+
+
 class QueryRouter:
     """Route queries to appropriate retrieval strategy."""
     
@@ -27,6 +54,13 @@ class QueryRouter:
         QueryType.TIMELINE_ANALYSIS: ['timeline', 'first seen', 'last seen', 'activity', 'when', 'date'],
     }
     
+    # One alternation per type, tried in QUERY_KEYWORDS order; plain substring
+    # matching (no word boundaries), so 'attacks' still counts as 'attack'
+    _KEYWORD_PATTERNS = [
+        (query_type, re.compile('|'.join(map(re.escape, keywords))))
+        for query_type, keywords in QUERY_KEYWORDS.items()
+    ]
+    
     @staticmethod
     def classify_query(query: str) -> QueryType:
         """
@@ -40,16 +74,15 @@ class QueryRouter:
         """
         query_lower = query.lower()
         
-        for query_type, keywords in QueryRouter.QUERY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in query_lower:
-                    logger.debug(f"Classified query as {query_type.value}")
-                    return query_type
+        for query_type, pattern in QueryRouter._KEYWORD_PATTERNS:
+            if pattern.search(query_lower):
+                logger.debug(f"Classified query as {query_type.value}")
+                return query_type
         
         return QueryType.GENERAL
     
     @staticmethod
-    def get_retrieval_plan(query_type: QueryType) -> Dict[str, Any]:
+    def get_retrieval_plan(query_type: QueryType) -> Mapping[str, Any]:
         """
         Get retrieval plan for query type.
         
@@ -57,29 +90,6 @@ class QueryRouter:
             query_type: Type of query
             
         Returns:
-            Retrieval plan configuration
+            Retrieval plan configuration (read-only; copy before modifying)
         """
-        plans = {
-            QueryType.ACTOR_PROFILE: {
-                'top_k': 5,
-                'weight_fields': {'description': 1.0, 'aliases': 0.8, 'origins': 0.6},
-            },
-            QueryType.TTP_ANALYSIS: {
-                'top_k': 3,
-                'weight_fields': {'ttps': 1.0, 'description': 0.5},
-            },
-            QueryType.TARGET_ANALYSIS: {
-                'top_k': 4,
-                'weight_fields': {'targets': 1.0, 'description': 0.5},
-            },
-            QueryType.TIMELINE_ANALYSIS: {
-                'top_k': 3,
-                'weight_fields': {'first_seen': 1.0, 'last_seen': 1.0, 'description': 0.3},
-            },
-            QueryType.GENERAL: {
-                'top_k': 5,
-                'weight_fields': {'description': 1.0},
-            },
-        }
-        
-        return plans.get(query_type, plans[QueryType.GENERAL])
+        return _PLANS.get(query_type, _PLANS[QueryType.GENERAL])
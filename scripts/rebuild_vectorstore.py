@@ -76,8 +76,7 @@ def rebuild_vector_store():
     )
     
     all_chunks = []
-    for actor in actors:
-        chunks = chunker.chunk_actor(actor)
+    for chunks in chunker.chunk_actors(actors):
         all_chunks.extend(chunks)
     
     logger.info(f"Created {len(all_chunks)} chunks from {len(actors)} actors")
@@ -118,6 +117,7 @@ def rebuild_vector_store():
     
     # Add chunks
     added_count = vector_store.add_chunks(chunks_with_embeddings)
+    vector_store.save_index()
     logger.info(f"Added {added_count} chunks to new vector store")
     
     # Verify
@@ -2,17 +2,52 @@
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import logging
 import re
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from difflib import SequenceMatcher
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# (epoch second, ISO string) for the last timestamp handed out; one tuple so readers never see a torn pair
+_TS_CACHE = (0, "")
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO string at second resolution, formatted once per second."""
+    global _TS_CACHE
+    sec = int(time.time())
+    cached_sec, cached_str = _TS_CACHE
+    if sec != cached_sec:
+        cached_str = datetime.fromtimestamp(sec).isoformat()
+        _TS_CACHE = (sec, cached_str)
+    return cached_str
+
+
+def _project_evidence(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a retrieved chunk onto the API evidence shape (one metadata lookup).
+
+    Scores arrive pre-rounded from EvidenceRetriever, so they are copied as-is.
+    """
+    metadata = chunk["metadata"]
+    get = metadata.get
+    return {
+        "text": chunk["text"],
+        "score": chunk.get("similarity_score", 0.0),
+        "source": get("source_field", "unknown"),
+        "actor": get("actor_name", "unknown"),
+        "source_system": get("source_system", "unknown"),
+        "source_ids": get("source_ids", []),
+        "links": get("information_sources", []),
+    }
+
 
 class QueryOrchestrator:
     """Coordinate cache lookup, feed-first queries, retrieval, and answer generation."""
@@ -26,6 +61,8 @@ class QueryOrchestrator:
         threat_feed_manager=None,
         cache: Optional[Dict[str, Dict[str, Any]]] = None,
         cache_ttl_seconds: int = 3600,
+        top_k: int = 5,
+        cache_max_entries: int = 1000,
     ):
         self.retriever = retriever
         self.interpreter = interpreter
@@ -34,6 +71,10 @@ class QueryOrchestrator:
         self.threat_feed_manager = threat_feed_manager
         self.cache = cache if cache is not None else {}
         self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = max(1, int(cache_max_entries or 1000))
+        # Insertion order doubles as LRU order; guarded for threaded servers
+        self._cache_lock = threading.Lock()
+        self.top_k = max(1, int(top_k or 5))
 
     def _normalize_cache_query(self, text: str) -> str:
         value = (text or "").strip().lower()
@@ -71,23 +112,55 @@ class QueryOrchestrator:
             return f"ta{ta_match.group(1)}"
         return ""
 
+    def _cache_key(self, query_text: str) -> str:
+        return hashlib.md5(self._normalize_cache_query(query_text).encode()).hexdigest()
+
+    def _cache_touch(self, key: str) -> None:
+        """Mark a cache entry as most recently used."""
+        with self._cache_lock:
+            item = self.cache.pop(key, None)
+            if item is not None:
+                self.cache[key] = item
+
+    def _cache_store(self, key: str, response: Dict[str, Any]) -> None:
+        """Insert a response and evict least recently used entries past the cap."""
+        with self._cache_lock:
+            self.cache.pop(key, None)
+            self.cache[key] = response
+            while len(self.cache) > self.cache_max_entries:
+                del self.cache[next(iter(self.cache))]
+                logger.info("🗑️ Cache cleaned - removed least recently used entry")
+
+    def invalidate_trace(self, trace_id: str) -> int:
+        """Drop cached responses produced under a trace id (e.g. after corrections)."""
+        if not trace_id:
+            return 0
+        with self._cache_lock:
+            stale = [key for key, item in self.cache.items() if item.get("trace_id") == trace_id]
+            for key in stale:
+                del self.cache[key]
+        return len(stale)
+
     def _find_cached_response(self, query_text: str):
         normalized_query = self._normalize_cache_query(query_text)
         actor_hint = self._extract_actor_hint(query_text)
         now = time.time()
 
-        for item in self.cache.values():
-            cache_age = now - item.get("cached_at", 0)
-            if cache_age >= self.cache_ttl_seconds:
-                continue
-            if item.get("normalized_query") == normalized_query:
-                return item, "exact", 1.0
+        # Exact hit: O(1) by normalized-query key
+        key = self._cache_key(query_text)
+        item = self.cache.get(key)
+        if item is not None and now - item.get("cached_at", 0) < self.cache_ttl_seconds:
+            self._cache_touch(key)
+            return item, "exact", 1.0
 
         best_item = None
         best_score = 0.0
         threshold = self._fuzzy_threshold(normalized_query)
 
-        for item in self.cache.values():
+        with self._cache_lock:
+            candidates = list(self.cache.values())
+
+        for item in candidates:
             cache_age = now - item.get("cached_at", 0)
             if cache_age >= self.cache_ttl_seconds:
                 continue
@@ -156,225 +229,348 @@ class QueryOrchestrator:
         return "\n".join(lines)
 
     def process_query(self, query_text: str, use_cache: bool = True, conversation_id: str = None) -> dict:
-        import hashlib as _hashlib
-        from agent.comparison_detector import ComparisonDetector
-
         start_time = time.time()
 
         try:
-            if not query_text.strip():
-                return {"error": "Query cannot be empty"}
-
-            if not self.retriever or not self.interpreter:
-                return {"error": "System not initialized"}
-
-            if self.threat_feed_manager is not None:
-                try:
-                    feed_start = time.time()
-                    feed_result = self.threat_feed_manager.answer_recent_attack_query(query_text, days=90, limit=5)
-                    if feed_result:
-                        news_items = feed_result.get("news_items", [])
-                        actor_name = (feed_result.get("actor_name") or (feed_result.get("primary_actors") or [""])[0]).strip()
-                        if news_items and actor_name:
-                            summary_start = time.time()
-                            feed_result["answer"] = self._summarize_recent_feed_with_llm(query_text, actor_name, news_items)
-                            feed_result["timings"]["generation"] = round(time.time() - summary_start, 4)
-
-                        feed_result["timings"]["retrieval"] = round(time.time() - feed_start, 4)
-                        feed_result["timings"]["total"] = round(time.time() - start_time, 4)
-                        feed_result["timestamp"] = datetime.now().isoformat()
-                        feed_result["trace_id"] = "feed-news-" + _hashlib.md5(query_text.encode()).hexdigest()[:12]
-                        feed_result["processing_time"] = time.time() - start_time
-                        feed_result["from_cache"] = False
-                        return feed_result
-                except Exception as feed_exc:
-                    logger.warning("Threat feed query path failed, falling back to RAG: %s", feed_exc)
-
-            cache_key = _hashlib.md5(self._normalize_cache_query(query_text).encode()).hexdigest()
-            if use_cache:
-                cached_result, match_type, match_score = self._find_cached_response(query_text)
-                if cached_result:
-                    logger.info("⚡ Main cache hit (%s, score=%.3f)", match_type, match_score)
-                    cached_result["from_cache"] = True
-                    cached_result["cache_match_type"] = match_type
-                    cached_result["cache_match_score"] = match_score
-                    cached_result["processing_time"] = time.time() - start_time
-                    return cached_result
-
-            logger.info("Processing query: %s", query_text)
-
-            conversation = None
-            if conversation_id and self.conversation_manager:
-                conversation = self.conversation_manager.load_or_create_conversation(conversation_id)
-                logger.info("📋 Loaded conversation: %s", conversation_id)
-
-            current_actor = conversation.current_actor if conversation else None
-            query_type = ComparisonDetector.get_query_type(query_text, current_actor)
-            logger.info("Query type: %s", query_type)
+            early, state = self._prepare_query(query_text, use_cache, conversation_id, start_time)
+            if early is not None:
+                return early
 
-            attributes = self._extract_attributes_with_mcp(query_text)
-            logger.info("Extracted attributes: %s", attributes)
+            retrieval_start = time.time()
+            retrieval_result = self._retrieve_for_attributes(query_text, state["attributes"])
+            return self._answer_query(state, retrieval_result, time.time() - retrieval_start)
+
+        except Exception as exc:
+            logger.error("Error processing query: %s", exc)
+            return {"error": str(exc)}
+
+    def process_queries(self, queries: List[str], use_cache: bool = True, max_workers: int = 4) -> List[dict]:
+        """
+        Process several independent queries, sharing one retrieval pass.
+
+        Cache/feed lookups and attribute extraction run on a thread pool, as
+        does answer generation, so their Ollama calls overlap. Retrieval for
+        every query still needing it runs once in between, so plain hybrid
+        queries share the embedding and vector-search work.
+
+        Args:
+            queries: Query strings
+            use_cache: Whether to consult the query cache
+            max_workers: Concurrent Ollama-bound queries in flight
+
+        Returns:
+            One process_query() result per query, in input order
+        """
+        if not queries:
+            return []
+
+        def _prepare(query_text):
+            try:
+                return self._prepare_query(query_text, use_cache, None, time.time())
+            except Exception as exc:
+                logger.error("Error processing query: %s", exc)
+                return {"error": str(exc)}, None
+
+        def _answer(args):
+            state, retrieval_result, retrieval_time = args
+            try:
+                return self._answer_query(state, retrieval_result, retrieval_time)
+            except Exception as exc:
+                logger.error("Error processing query: %s", exc)
+                return {"error": str(exc)}
+
+        results: List[Optional[dict]] = [None] * len(queries)
+        workers = max(1, min(max_workers, len(queries)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="threat-ai-batch") as pool:
+            pending = []
+            for i, (early, state) in enumerate(pool.map(_prepare, queries)):
+                if early is not None:
+                    results[i] = early
+                else:
+                    pending.append((i, state))
+            if not pending:
+                return results
 
             retrieval_start = time.time()
-            actor_names = attributes.get('actor_names') if isinstance(attributes, dict) else None
-            if actor_names:
-                retrieval_result = self.retriever.retrieve_actor_scoped(query_text, retrieval_mode="full_actor")
-            elif attributes:
-                retrieval_result = self.retriever.retrieve_with_filters(
-                    query_text,
-                    attributes=attributes,
-                    top_k=5,
+            try:
+                retrievals = self._retrieve_many_for_attributes(
+                    [state["query_text"] for _, state in pending],
+                    [state["attributes"] for _, state in pending],
                 )
-            else:
-                retrieval_result = self.retriever.retrieve_actor_scoped(query_text, retrieval_mode="full_actor")
+            except Exception as exc:
+                logger.error("Error in batch retrieval: %s", exc)
+                for i, _ in pending:
+                    results[i] = {"error": str(exc)}
+                return results
             retrieval_time = time.time() - retrieval_start
-            logger.info("⏱️ Retrieval completed in %.2fs (mode: %s)", retrieval_time, retrieval_result.get("retrieval_mode", "hybrid"))
+            logger.info("⏱️ Batch retrieval for %s queries completed in %.2fs", len(pending), retrieval_time)
 
-            if not retrieval_result.get("evidence") and actor_names:
-                logger.info("Actor-scoped retrieval fallback triggered for actor names: %s", actor_names)
-                retrieval_result = self.retriever.retrieve_actor_scoped(query_text, retrieval_mode="full_actor")
+            answers = pool.map(_answer, [(state, retrieval, retrieval_time) for (_, state), retrieval in zip(pending, retrievals)])
+            for (i, _), answer in zip(pending, answers):
+                results[i] = answer
+        return results
 
-            evidence = retrieval_result.get("evidence", [])
-            response_mode = retrieval_result.get("response_mode", "adaptive")
-            parsed_query = retrieval_result.get("parsed_query") or {}
-            primary_actors = [
-                actor.get("primary_name")
-                for actor in parsed_query.get("actors", [])
-                if actor.get("primary_name")
-            ]
-            if not primary_actors and evidence:
-                seen = set()
-                ordered = []
-                for chunk in evidence:
-                    primary = chunk.get("metadata", {}).get("primary_name")
-                    if primary and primary not in seen:
-                        seen.add(primary)
-                        ordered.append(primary)
-                primary_actors = ordered
-
-            if conversation and primary_actors:
-                for actor_name in primary_actors:
-                    actor_chunks = [e for e in evidence if e.get("metadata", {}).get("primary_name") == actor_name]
-                    if actor_chunks:
-                        conversation.cache_actor_chunks(actor_name, actor_chunks)
-                        if actor_name not in conversation.actors_mentioned:
-                            conversation.actors_mentioned.append(actor_name)
-
-                if primary_actors:
-                    conversation.current_actor = primary_actors[0]
-                    logger.info("💾 Cached %s actor(s) in conversation", len(primary_actors))
-
-            if query_type == "comparison" and ComparisonDetector.is_comparison_query(query_text) and conversation:
-                alias_resolver = self.retriever.alias_resolver if hasattr(self.retriever, "alias_resolver") else None
-                if alias_resolver:
-                    all_actors = ComparisonDetector.extract_all_actors(query_text, alias_resolver)
-                    for actor_info in all_actors:
-                        actor_name = actor_info.get("primary_name")
-                        if actor_name and not conversation.has_actor_cached(actor_name):
-                            actor_retrieval = self.retriever.retrieve_actor_scoped(f"information about {actor_name}", retrieval_mode="full_actor")
-                            actor_chunks = actor_retrieval.get("evidence", [])
-                            if actor_chunks:
-                                conversation.cache_actor_chunks(actor_name, actor_chunks)
-                                if actor_name not in conversation.actors_mentioned:
-                                    conversation.actors_mentioned.append(actor_name)
-                                logger.info("💾 Cached comparison actor: %s", actor_name)
-
-            if not evidence:
-                return {
-                    "query": query_text,
-                    "answer": "No relevant threat intelligence found for this query.",
-                    "evidence": [],
-                    "confidence": 0.0,
-                    "source_count": 0,
-                    "model": "N/A",
-                    "timestamp": datetime.now().isoformat(),
-                    "response_mode": response_mode,
-                    "primary_actors": primary_actors,
-                    "processing_time": time.time() - start_time,
-                    "from_cache": False,
-                    "query_type": query_type,
-                }
-
-            generation_start = time.time()
-            retrieval_mode = retrieval_result.get("retrieval_mode", "hybrid")
-
-            if query_type == "comparison" and conversation:
-                all_cached_chunks = conversation.get_all_cached_chunks()
-                if len(all_cached_chunks) > 1:
-                    logger.info("Generating comparison answer for %s actors", len(all_cached_chunks))
-                    result = self.interpreter.comparison_answer(query_text, all_cached_chunks)
-                    response_mode = "comparison"
-                else:
-                    result = self.interpreter.explain(query_text, evidence, response_mode=response_mode, retrieval_mode=retrieval_mode)
-            else:
-                result = self.interpreter.explain(query_text, evidence, response_mode=response_mode, retrieval_mode=retrieval_mode)
+    def _prepare_query(self, query_text: str, use_cache: bool, conversation_id: Optional[str], start_time: float):
+        """Answer from the threat feed or cache, or gather what retrieval needs.
+
+        Returns:
+            (response, None) when the query is already answered, else
+            (None, state) for _answer_query()
+        """
+        from agent.comparison_detector import ComparisonDetector
 
-            generation_time = time.time() - generation_start
-            logger.info("⏱️ Answer generation completed in %.2fs", generation_time)
+        if not query_text or query_text.isspace():
+            return {"error": "Query cannot be empty"}, None
 
-            audit_start = time.time()
-            trace_id = self.audit.log_query(query_text, result.get("query_type", query_type), evidence)
-            self.audit.log_response(trace_id, result)
-            audit_time = time.time() - audit_start
-            logger.info("⏱️ Audit logging completed in %.2fs", audit_time)
+        if not self.retriever or not self.interpreter:
+            return {"error": "System not initialized"}, None
 
-            total_time = time.time() - start_time
-            logger.info("⏱️ Total query processing time: %.2fs", total_time)
+        if self.threat_feed_manager is not None:
+            try:
+                feed_start = time.time()
+                feed_result = self.threat_feed_manager.answer_recent_attack_query(query_text, days=90, limit=5)
+                if feed_result:
+                    news_items = feed_result.get("news_items", [])
+                    actor_name = (feed_result.get("actor_name") or (feed_result.get("primary_actors") or [""])[0]).strip()
+                    if news_items and actor_name:
+                        summary_start = time.time()
+                        feed_result["answer"] = self._summarize_recent_feed_with_llm(query_text, actor_name, news_items)
+                        feed_result["timings"]["generation"] = round(time.time() - summary_start, 4)
+
+                    feed_result["timings"]["retrieval"] = round(time.time() - feed_start, 4)
+                    feed_result["timings"]["total"] = round(time.time() - start_time, 4)
+                    feed_result["timestamp"] = _now_iso()
+                    feed_result["trace_id"] = "feed-news-" + hashlib.md5(query_text.encode()).hexdigest()[:12]
+                    feed_result["processing_time"] = time.time() - start_time
+                    feed_result["from_cache"] = False
+                    return feed_result, None
+            except Exception as feed_exc:
+                logger.warning("Threat feed query path failed, falling back to RAG: %s", feed_exc)
+
+        cache_key = self._cache_key(query_text)
+        if use_cache:
+            cached_result, match_type, match_score = self._find_cached_response(query_text)
+            if cached_result:
+                logger.info("⚡ Main cache hit (%s, score=%.3f)", match_type, match_score)
+                # Callers mutate responses; never hand out the cached object itself
+                cached_result = copy.deepcopy(cached_result)
+                cached_result["from_cache"] = True
+                cached_result["cache_match_type"] = match_type
+                cached_result["cache_match_score"] = match_score
+                cached_result["processing_time"] = time.time() - start_time
+                cached_result["timestamp"] = _now_iso()
+                return cached_result, None
+
+        logger.info("Processing query: %s", query_text)
+
+        conversation = None
+        if conversation_id and self.conversation_manager:
+            conversation = self.conversation_manager.load_or_create_conversation(conversation_id)
+            logger.info("📋 Loaded conversation: %s", conversation_id)
+
+        current_actor = conversation.current_actor if conversation else None
+        query_type = ComparisonDetector.get_query_type(query_text, current_actor)
+        logger.info("Query type: %s", query_type)
+
+        attributes = self._extract_attributes_with_mcp(query_text)
+        logger.info("Extracted attributes: %s", attributes)
+
+        return None, {
+            "query_text": query_text,
+            "start_time": start_time,
+            "cache_key": cache_key,
+            "conversation": conversation,
+            "query_type": query_type,
+            "attributes": attributes,
+        }
+
+    def _answer_query(self, state: Dict[str, Any], retrieval_result: Dict[str, Any], retrieval_time: float) -> dict:
+        """Generate, audit and cache the answer for a prepared query."""
+        from agent.comparison_detector import ComparisonDetector
 
-            response = {
+        query_text = state["query_text"]
+        start_time = state["start_time"]
+        cache_key = state["cache_key"]
+        conversation = state["conversation"]
+        query_type = state["query_type"]
+        logger.info("⏱️ Retrieval completed in %.2fs (mode: %s)", retrieval_time, retrieval_result.get("retrieval_mode", "hybrid"))
+
+        evidence = retrieval_result.get("evidence", [])
+        response_mode = retrieval_result.get("response_mode", "adaptive")
+        parsed_query = retrieval_result.get("parsed_query") or {}
+        primary_actors = [
+            actor.get("primary_name")
+            for actor in parsed_query.get("actors", [])
+            if actor.get("primary_name")
+        ]
+        if not primary_actors and evidence:
+            seen = set()
+            ordered = []
+            for chunk in evidence:
+                primary = chunk.get("metadata", {}).get("primary_name")
+                if primary and primary not in seen:
+                    seen.add(primary)
+                    ordered.append(primary)
+            primary_actors = ordered
+
+        if conversation and primary_actors:
+            for actor_name in primary_actors:
+                actor_chunks = [e for e in evidence if e.get("metadata", {}).get("primary_name") == actor_name]
+                if actor_chunks:
+                    conversation.cache_actor_chunks(actor_name, actor_chunks)
+                    if actor_name not in conversation.actors_mentioned:
+                        conversation.actors_mentioned.append(actor_name)
+
+            if primary_actors:
+                conversation.current_actor = primary_actors[0]
+                logger.info("💾 Cached %s actor(s) in conversation", len(primary_actors))
+
+        if query_type == "comparison" and ComparisonDetector.is_comparison_query(query_text) and conversation:
+            alias_resolver = self.retriever.alias_resolver if hasattr(self.retriever, "alias_resolver") else None
+            if alias_resolver:
+                all_actors = ComparisonDetector.extract_all_actors(query_text, alias_resolver)
+                for actor_info in all_actors:
+                    actor_name = actor_info.get("primary_name")
+                    if actor_name and not conversation.has_actor_cached(actor_name):
+                        actor_retrieval = self.retriever.retrieve_actor_scoped(f"information about {actor_name}", retrieval_mode="full_actor")
+                        actor_chunks = actor_retrieval.get("evidence", [])
+                        if actor_chunks:
+                            conversation.cache_actor_chunks(actor_name, actor_chunks)
+                            if actor_name not in conversation.actors_mentioned:
+                                conversation.actors_mentioned.append(actor_name)
+                            logger.info("💾 Cached comparison actor: %s", actor_name)
+
+        if not evidence:
+            return {
                 "query": query_text,
-                "answer": result["answer"],
-                "confidence": result["confidence"],
-                "source_count": result["source_count"],
-                "model": result.get("model", "N/A"),
-                "timestamp": datetime.now().isoformat(),
-                "trace_id": trace_id,
+                "answer": "No relevant threat intelligence found for this query.",
+                "evidence": [],
+                "confidence": 0.0,
+                "source_count": 0,
+                "model": "N/A",
+                "timestamp": _now_iso(),
                 "response_mode": response_mode,
-                "query_type": query_type,
                 "primary_actors": primary_actors,
-                "processing_time": total_time,
+                "processing_time": time.time() - start_time,
                 "from_cache": False,
-                "timings": {
-                    "retrieval": retrieval_time,
-                    "generation": generation_time,
-                    "audit": audit_time,
-                    "total": total_time,
-                },
-                "evidence": [
-                    {
-                        "text": e["text"],
-                        "score": round(e.get("similarity_score", 0), 4),
-                        "source": e["metadata"].get("source_field", "unknown"),
-                        "actor": e["metadata"].get("actor_name", "unknown"),
-                        "source_system": e["metadata"].get("source_system", "unknown"),
-                        "source_ids": e["metadata"].get("source_ids", []),
-                        "links": e["metadata"].get("information_sources", []),
-                    }
-                    for e in evidence
-                ],
+                "query_type": query_type,
             }
 
-            if conversation:
-                conversation.add_message("user", query_text)
-                conversation.add_message("assistant", result["answer"])
-                self.conversation_manager.save_conversation(conversation)
-                logger.info("💾 Conversation saved with %s actors", len(conversation.actors_mentioned))
-
-            response["cached_at"] = time.time()
-            response["normalized_query"] = self._normalize_cache_query(query_text)
-            self.cache[cache_key] = response.copy()
+        generation_start = time.time()
+        retrieval_mode = retrieval_result.get("retrieval_mode", "hybrid")
 
-            if len(self.cache) > 1000:
-                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].get("cached_at", 0))
-                del self.cache[oldest_key]
-                logger.info("🗑️ Cache cleaned - removed oldest entry")
-
-            logger.info("✓ Query processed successfully")
-            return response
+        if query_type == "comparison" and conversation:
+            all_cached_chunks = conversation.get_all_cached_chunks()
+            if len(all_cached_chunks) > 1:
+                logger.info("Generating comparison answer for %s actors", len(all_cached_chunks))
+                result = self.interpreter.comparison_answer(query_text, all_cached_chunks)
+                response_mode = "comparison"
+            else:
+                result = self.interpreter.explain(query_text, evidence, response_mode=response_mode, retrieval_mode=retrieval_mode)
+        else:
+            result = self.interpreter.explain(query_text, evidence, response_mode=response_mode, retrieval_mode=retrieval_mode)
+
+        generation_time = time.time() - generation_start
+        logger.info("⏱️ Answer generation completed in %.2fs", generation_time)
+
+        audit_start = time.time()
+        trace_id = self.audit.log_query(query_text, result.get("query_type", query_type), evidence)
+        self.audit.log_response(trace_id, result)
+        audit_time = time.time() - audit_start
+        logger.info("⏱️ Audit logging completed in %.2fs", audit_time)
+
+        total_time = time.time() - start_time
+        logger.info("⏱️ Total query processing time: %.2fs", total_time)
+
+        response = {
+            "query": query_text,
+            "answer": result["answer"],
+            "confidence": result["confidence"],
+            "source_count": result["source_count"],
+            "model": result.get("model", "N/A"),
+            "timestamp": _now_iso(),
+            "trace_id": trace_id,
+            "response_mode": response_mode,
+            "query_type": query_type,
+            "primary_actors": primary_actors,
+            "processing_time": total_time,
+            "from_cache": False,
+            "timings": {
+                "retrieval": retrieval_time,
+                "generation": generation_time,
+                "audit": audit_time,
+                "total": total_time,
+            },
+            "evidence": list(map(_project_evidence, evidence)),
+        }
+
+        if conversation:
+            conversation.add_message("user", query_text)
+            conversation.add_message("assistant", result["answer"])
+            self.conversation_manager.save_conversation(conversation)
+            logger.info("💾 Conversation saved with %s actors", len(conversation.actors_mentioned))
+
+        response["cached_at"] = time.time()
+        response["normalized_query"] = self._normalize_cache_query(query_text)
+        self._cache_store(cache_key, copy.deepcopy(response))
+
+        logger.info("✓ Query processed successfully")
+        return response
+
+    def _retrieve_many_for_attributes(self, queries: List[str], attributes_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run _retrieve_for_attributes() for several queries, batching the plain route."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        plain = []
+        for i, (query_text, attributes) in enumerate(zip(queries, attributes_list)):
+            if attributes:
+                results[i] = self._retrieve_for_attributes(query_text, attributes)
+            else:
+                plain.append(i)
+
+        if plain:
+            batch = self.retriever.retrieve_actor_scoped_many([queries[i] for i in plain], retrieval_mode="full_actor")
+            for i, retrieval_result in zip(plain, batch):
+                results[i] = retrieval_result
+        return results
+
+    def _retrieve_for_attributes(self, query_text: str, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        """Run actor-scoped or filtered retrieval based on extracted attributes."""
+        actor_names = attributes.get('actor_names') if isinstance(attributes, dict) else None
+        if actor_names:
+            retrieval_result = self.retriever.retrieve_actor_scoped(query_text, retrieval_mode="full_actor")
+        elif attributes:
+            retrieval_result = self.retriever.retrieve_with_filters(
+                query_text,
+                attributes=attributes,
+                top_k=self.top_k,
+            )
+        else:
+            retrieval_result = self.retriever.retrieve_actor_scoped(query_text, retrieval_mode="full_actor")
+
+        if not retrieval_result.get("evidence") and actor_names:
+            logger.info("Actor-scoped retrieval fallback triggered for actor names: %s", actor_names)
+            retrieval_result = self.retriever.retrieve_actor_scoped(query_text, retrieval_mode="full_actor")
+        return retrieval_result
+
+    def stream_query(self, query_text: str):
+        """Retrieve evidence and stream the LLM answer as event dicts."""
+        if not query_text or query_text.isspace():
+            yield {"type": "error", "error": "Query cannot be empty"}
+            return
+        if not self.retriever or not self.interpreter:
+            yield {"type": "error", "error": "System not initialized"}
+            return
 
+        try:
+            attributes = self._extract_attributes_with_mcp(query_text)
+            retrieval_result = self._retrieve_for_attributes(query_text, attributes)
+            evidence = retrieval_result.get("evidence", [])
+            response_mode = retrieval_result.get("response_mode", "adaptive")
+            yield from self.interpreter.explain_stream(query_text, evidence, response_mode=response_mode)
+            yield {"type": "done", "timestamp": _now_iso()}
         except Exception as exc:
-            logger.error("Error processing query: %s", exc)
-            return {"error": str(exc)}
+            logger.error("Error streaming query: %s", exc)
+            yield {"type": "error", "error": str(exc)}
 
     def _extract_attributes_with_mcp(self, query_text: str) -> Dict[str, Any]:
         """Extract query attributes using the MCP hybrid prompt."""